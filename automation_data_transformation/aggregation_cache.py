@@ -0,0 +1,102 @@
+"""
+Aggregation Cache
+-----------------
+Memoizes group-by results per metric. Every cached result is one column_metric Series
+indexed by the group keys, stored under (data version, grouping columns, column, metric).
+A query reuses whatever metrics are already cached and computes only the missing ones,
+so adding `max` to an earlier `mean, sum` query scans the data for `max` alone.
+
+Entries of older data versions can never be hit again and are dropped as soon as the data
+changes; the rest are bounded by size with least-recently-used eviction.
+"""
+
+# Standard Libraries
+import os
+import threading
+from collections import OrderedDict
+
+# Third-party Libraries
+import pandas as pd
+
+
+DEFAULT_MAX_BYTES = int(os.environ.get("DATA_TOOLKIT_AGGREGATION_CACHE_MB", 256)) * 2**20
+
+
+class AggregationCache:
+    """Size-bounded LRU cache of per-metric group-by results."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (Series, size in bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(version, grouping_columns, column, metric):
+        return version, tuple(grouping_columns), column, metric
+
+    def get(self, version, grouping_columns, column, metric):
+        """Returns the cached result Series, or None."""
+        key = self._key(version, grouping_columns, column, metric)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)  # Mark as most recently used
+            return entry[0]
+
+    def put(self, version, grouping_columns, column, metric, result):
+        """Stores one result Series and evicts least recently used entries over the budget."""
+        size = int(result.memory_usage(index=True, deep=True))
+        if size > self.max_bytes:
+            return  # Would evict everything else and still not fit
+        key = self._key(version, grouping_columns, column, metric)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, current_version=None):
+        """Drops every entry not computed for current_version (all entries when None)."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] != current_version]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def aggregate(self, version, grouping_columns, aggregation_selections, compute):
+        """Group-by result for aggregation_selections, computing only metrics that are not cached.
+
+        :param compute: compute(missing_selections) -> DataFrame indexed by the group keys
+            with one `column_metric` column per requested metric
+        :return: flattened DataFrame with the group keys as leading columns
+        """
+        results = {}
+        missing = {}
+        for column, metrics in aggregation_selections.items():
+            for metric in metrics:
+                cached = self.get(version, grouping_columns, column, metric)
+                if cached is None:
+                    missing.setdefault(column, []).append(metric)
+                else:
+                    results[(column, metric)] = cached
+
+        if missing:
+            computed = compute(missing)
+            for column, metrics in missing.items():
+                for metric in metrics:
+                    result = computed[f"{column}_{metric}"]
+                    self.put(version, grouping_columns, column, metric, result)
+                    results[(column, metric)] = result
+
+        ordered = [
+            results[(column, metric)].rename(f"{column}_{metric}")
+            for column, metrics in aggregation_selections.items() for metric in metrics
+        ]
+        return pd.concat(ordered, axis=1).reset_index()
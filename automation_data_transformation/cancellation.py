@@ -0,0 +1,12 @@
+"""
+Cancellation
+------------
+The exception raised when the user cancels a long-running background operation.
+
+It lives in its own module without any GUI imports, so code that runs in worker processes
+(the streaming group-by) can raise and pass it without loading tkinter or matplotlib.
+"""
+
+
+class OperationCancelled(Exception):
+    """Raised when the user cancels a long-running background operation."""
@@ -0,0 +1,312 @@
+"""
+Cleansing Helpers
+-----------------
+Chunk-safe building blocks shared by the in-memory and out-of-core cleansing paths, and
+declarative cleansing policies that can be saved and applied to many files without prompts.
+
+Null standardization only touches text columns (object, string and category dtypes) and
+compares each distinct value once instead of running a regex over every cell. Missing-value
+counts are computed once and then updated from what each cleansing step changed.
+"""
+
+# Standard Libraries
+import json
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+
+# Compared case-insensitively after trimming whitespace; blank cells always count as missing
+NULL_TOKENS = ("nan", "na", "n/a", "null", "?")  # Customize as needed
+
+
+def parse_null_tokens(text):
+    """Parses a comma-separated token list typed by the user."""
+    return tuple(token.strip() for token in text.split(",") if token.strip())
+
+
+def is_text_column(series):
+    return (
+        ptypes.is_object_dtype(series)
+        or ptypes.is_string_dtype(series)
+        or isinstance(series.dtype, pd.CategoricalDtype)
+    )
+
+
+def _is_token(values, tokens):
+    """Vectorized token test over an array of distinct values."""
+    wanted = {token.lower() for token in tokens} | {""}
+    normalized = pd.Index(values).astype(str).str.strip().str.lower()
+    return np.asarray(normalized.isin(wanted))
+
+
+def null_token_mask(series, tokens=NULL_TOKENS):
+    """Returns a boolean mask of the cells in a text column that hold a null token."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if not len(categories):
+            return np.zeros(len(series), dtype=bool)
+        codes = series.cat.codes.to_numpy()
+        is_token = _is_token(categories, tokens)
+    else:
+        codes, uniques = pd.factorize(series)  # Missing values get code -1
+        if not len(uniques):
+            return np.zeros(len(series), dtype=bool)
+        is_token = _is_token(uniques, tokens)
+    mask = np.zeros(len(series), dtype=bool)
+    present = codes >= 0
+    mask[present] = is_token[codes[present]]
+    return mask
+
+
+def standardize_nulls(data, tokens=NULL_TOKENS):
+    """Replaces blank strings and null tokens in text columns with real missing values (in place).
+
+    Numeric and datetime columns are left untouched.
+
+    :return: (data, number of newly missing cells per column)
+    """
+    converted = pd.Series(0, index=data.columns, dtype="int64")
+    for position in range(data.shape[1]):
+        series = data.iloc[:, position]
+        if not is_text_column(series):
+            continue
+        mask = null_token_mask(series, tokens)
+        hits = int(mask.sum())
+        if hits == 0:
+            continue
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            data.isetitem(position, series.cat.remove_categories(categories[_is_token(categories, tokens)]))
+        else:
+            data.isetitem(position, series.mask(mask))
+        converted.iloc[position] = hits
+    return data, converted
+
+
+class MissingValueLog:
+    """Per-column missing-value counts, updated step by step instead of recounted.
+
+    The counts are taken once from the data; each cleansing step then reports what it
+    changed (cells converted to missing, columns dropped, columns filled) and the total
+    after every step is recorded for the summary log.
+    """
+
+    def __init__(self, counts):
+        self.counts = counts.astype("int64").copy()
+        self.steps = []
+        self.filled = {}  # Column -> (fill value, cells filled)
+        self.rows_dropped = 0
+        self.converted = pd.Series(dtype="int64")  # Cells standardized to missing, per column
+        self.dropped_columns = []
+
+    @classmethod
+    def from_frame(cls, data):
+        return cls(data.isna().sum())
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def record(self, step):
+        self.steps.append((step, self.total))
+
+    def add(self, converted):
+        """Adds the cells a step turned into missing values (a per-column Series)."""
+        self.counts = self.counts.add(converted, fill_value=0).astype("int64")
+
+    def add_converted(self, converted):
+        """Adds the cells null standardization turned into missing values (a per-column Series)."""
+        self.add(converted)
+        self.converted = self.converted.add(converted, fill_value=0).astype("int64")
+
+    def drop(self, columns):
+        self.counts = self.counts.drop(columns)
+        self.dropped_columns.extend(columns)
+
+    def changed_columns(self):
+        """Columns changed by more than filling: some cells standardized to missing, or dropped."""
+        return self.converted.index[self.converted > 0].tolist() + list(self.dropped_columns)
+
+    def set(self, column, count):
+        self.counts[column] = count
+
+    def missing_columns(self, columns=None):
+        """Columns (optionally limited to `columns`) that still have missing values, in data order."""
+        counts = self.counts if columns is None else self.counts.reindex(columns, fill_value=0)
+        return counts.index[counts > 0].tolist()
+
+    def empty_columns(self, row_count):
+        return self.counts.index[self.counts == row_count].tolist() if row_count else []
+
+    def format(self):
+        return "".join(f"{step}: {total}\n" for step, total in self.steps)
+
+
+# Imputation strategies a policy rule can name
+FILL_STRATEGIES = ("mean", "median", "mode", "constant", "drop", "leave")
+_NUMERIC_ONLY = ("mean", "median")
+
+
+def fill_missing(data, fill_values):
+    """Writes fill_values (column -> value) into the missing cells of data with one fillna.
+
+    Categorical columns get the value added as a category, and nullable integer columns
+    (e.g. after format revisioning) become Float64 when their mean or median is fractional.
+    """
+    data = data.copy(deep=False)
+    for column, value in fill_values.items():
+        series = data[column]
+        if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+            series = series.cat.add_categories(value)
+        elif (ptypes.is_integer_dtype(series) and not isinstance(series.dtype, np.dtype)
+              and isinstance(value, (float, np.floating)) and not float(value).is_integer()):
+            series = series.astype("Float64")
+        else:
+            continue
+        data.isetitem(data.columns.get_loc(column), series)
+    return data.fillna(fill_values) if fill_values else data
+
+
+def rule(strategy, value=None):
+    """Builds one policy rule, e.g. rule("constant", "Unknown")."""
+    if strategy not in FILL_STRATEGIES:
+        raise ValueError(f"Unknown fill strategy '{strategy}'. Choose one of: {', '.join(FILL_STRATEGIES)}")
+    return {"strategy": strategy, "value": value} if strategy == "constant" else {"strategy": strategy}
+
+
+# Choices offered by the interactive policy editor, label -> rule
+NUMERIC_FILL_CHOICES = {
+    "Fill with the mean": rule("mean"),
+    "Fill with the median": rule("median"),
+    "Drop rows with missing values": rule("drop"),
+    "Leave missing": rule("leave"),
+}
+TEXT_FILL_CHOICES = {
+    "Fill with the most frequent value (mode)": rule("mode"),
+    "Fill with 'Unknown'": rule("constant", "Unknown"),
+    "Drop rows with missing values": rule("drop"),
+    "Leave missing": rule("leave"),
+}
+
+
+class CleansingPolicy:
+    """Declarative description of a cleansing run that can be saved as JSON and reapplied.
+
+    Column rules take precedence over dtype rules ("numeric" for number columns, "text" for
+    everything else). Each rule names a strategy from FILL_STRATEGIES; "drop" removes the
+    rows that are missing in that column and "leave" keeps the missing values.
+    """
+
+    def __init__(self, null_tokens=NULL_TOKENS, drop_empty_columns=True, dtype_rules=None, column_rules=None):
+        self.null_tokens = tuple(null_tokens)
+        self.drop_empty_columns = drop_empty_columns
+        self.dtype_rules = dtype_rules if dtype_rules is not None else {"numeric": rule("mean"), "text": rule("mode")}
+        self.column_rules = column_rules if column_rules is not None else {}
+
+    def rule_for(self, column, series):
+        if column in self.column_rules:
+            return self.column_rules[column]
+        kind = "numeric" if ptypes.is_numeric_dtype(series) and not ptypes.is_bool_dtype(series) else "text"
+        return self.dtype_rules.get(kind, rule("leave"))
+
+    def to_dict(self):
+        return {
+            "null_tokens": list(self.null_tokens),
+            "drop_empty_columns": self.drop_empty_columns,
+            "dtype_rules": self.dtype_rules,
+            "column_rules": self.column_rules,
+        }
+
+    @classmethod
+    def from_dict(cls, values):
+        policy = cls(
+            values.get("null_tokens", NULL_TOKENS),
+            values.get("drop_empty_columns", True),
+            values.get("dtype_rules"),
+            values.get("column_rules"),
+        )
+        for fill_rule in list(policy.dtype_rules.values()) + list(policy.column_rules.values()):
+            rule(fill_rule.get("strategy"), fill_rule.get("value"))  # Validates the strategy name
+        return policy
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as policy_file:
+            json.dump(self.to_dict(), policy_file, indent=2, default=str)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as policy_file:
+            return cls.from_dict(json.load(policy_file))
+
+
+def apply_policy(data, policy, missing=None):
+    """Applies a CleansingPolicy to a DataFrame without any prompts.
+
+    Fill values for every column are computed first and written with a single fillna.
+    The caller's frame is never modified: columns are replaced in a shallow copy, so a rule
+    that fails halfway leaves the original data as it was.
+
+    :param missing: MissingValueLog of data that has already been standardized; when None,
+        the counts are taken here and null tokens are standardized first.
+    :return: (cleansed data, MissingValueLog with one entry per step)
+    """
+    data = data.copy(deep=False)
+    if missing is None:
+        missing = MissingValueLog.from_frame(data)
+        missing.record("Initial Missing Values")
+        data, converted = standardize_nulls(data, policy.null_tokens)
+        missing.add_converted(converted)
+        missing.record("After Standardization")
+
+    # Step 1: Drop completely empty columns
+    empty_columns = missing.empty_columns(len(data))
+    if policy.drop_empty_columns and empty_columns:
+        data = data.drop(columns=empty_columns)
+        missing.drop(empty_columns)
+    missing.record("After Dropping Empty Columns")
+
+    # Step 2: Resolve the rule of every column that still has missing values
+    plans = {}
+    for column in missing.missing_columns():
+        fill_rule = policy.rule_for(column, data[column])
+        if fill_rule["strategy"] in _NUMERIC_ONLY and not ptypes.is_numeric_dtype(data[column]):
+            raise ValueError(f"Cannot fill non-numeric column '{column}' with its {fill_rule['strategy']}.")
+        plans[column] = fill_rule
+
+    # Step 3: Drop rows that are missing in a "drop" column, subtracting what they held
+    drop_columns = [column for column, fill_rule in plans.items() if fill_rule["strategy"] == "drop"]
+    if drop_columns:
+        dropped = data[drop_columns].isna().any(axis=1).to_numpy()
+        missing.add(-data[dropped].isna().sum())
+        missing.rows_dropped += int(dropped.sum())
+        data = data[~dropped]
+        missing.record("After Dropping Rows")
+
+    # Step 4: Compute all fill values, then fill in one pass
+    def columns_with(strategy):
+        return [column for column, fill_rule in plans.items() if fill_rule["strategy"] == strategy]
+
+    fill_values = {}
+    fill_values.update(data[columns_with("mean")].mean().to_dict())
+    fill_values.update(data[columns_with("median")].median().to_dict())
+    mode_columns = columns_with("mode")
+    if mode_columns and len(data):
+        fill_values.update(data[mode_columns].mode(dropna=True).iloc[0].to_dict())
+    fill_values.update({column: plans[column].get("value") for column in columns_with("constant")})
+    fill_values = {column: value for column, value in fill_values.items() if not pd.isna(value)}
+
+    data = fill_missing(data, fill_values)
+    missing.filled.update({column: (value, int(missing.counts[column])) for column, value in fill_values.items()})
+
+    # The log keeps the numeric/text split of the interactive cleansing
+    numeric_columns = set(data.select_dtypes(include="number").columns)
+    for column in [column for column in fill_values if column in numeric_columns]:
+        missing.set(column, 0)
+    missing.record("After Filling Numeric Columns")
+    for column in [column for column in fill_values if column not in numeric_columns]:
+        missing.set(column, 0)
+    missing.record("After Filling Categorical Columns")
+    return data, missing
@@ -1,8 +1,11 @@
+import operator
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import seaborn as sns
 import tkinter as tk
 import pandas as pd
 import numpy as np
-from matplotlib import pyplot as plt
+from pandas.api import types as ptypes
 from tkinter import messagebox
 from tkinter import filedialog, messagebox, simpledialog, ttk
 from utils import single_select_from_dropdown
@@ -10,12 +13,126 @@ from utils import multi_select_from_dropdown
 from utils import show_stats_table
 from utils import save_to_file_dialog
 from utils import select_from_dropdown
+from utils import run_with_progress
+from utils import OperationCancelled
+from utils import show_paginated_table
+from utils import show_virtual_table
+from utils import PlotWindow
+from jobs import job_scheduler
+from ingest import read_csv_chunked
+from ingest import format_ingest_progress
+from file_cache import FileCache
+from dtype_utils import compact_dtypes
+from dtype_utils import format_memory_report
+from dtype_utils import widen_numeric
+from dtype_utils import revise_formats
+from cleansing import standardize_nulls
+from cleansing import parse_null_tokens
+from cleansing import MissingValueLog
+from cleansing import NULL_TOKENS
+from cleansing import CleansingPolicy
+from cleansing import apply_policy
+from cleansing import fill_missing
+from cleansing import rule
+from cleansing import NUMERIC_FILL_CHOICES
+from cleansing import TEXT_FILL_CHOICES
+from out_of_core import ChunkedDataset
+from out_of_core import MERGEABLE_METRICS
+from deduplication import ColumnHashIndex
+from deduplication import KEEP_POLICIES
+from deduplication import DuplicateGroupReport
+from row_filter import ColumnFilterIndex
+from export import EXPORT_FILE_TYPES
+from export import frame_chunks
+from export import write_dataset
+from row_filter import compile_filter
+from row_filter import scan_matching_rows
+from fuzzy_dedup import find_near_duplicates
+from fuzzy_dedup import DEFAULT_SIMILARITY
+from fuzzy_dedup import DEFAULT_NUMERIC_TOLERANCE
+from joins import JoinEstimate
+from joins import JOIN_TYPES
+from joins import RELATIONSHIPS
+from joins import DEFAULT_MEMORY_BUDGET
+from joins import key_hashes
+from joins import key_dtypes
+from joins import partitioned_merge
+from joins import shared_columns
+from joins import common_columns
+from joins import disambiguate_columns
+from joins import merge_many
+from union import SOURCE_COLUMN
+from union import UnionSchema
+from union import union_files
+from expressions import compile_expression
+from virtual_columns import VirtualColumn
+from virtual_columns import VirtualColumnSet
+from aggregation_cache import AggregationCache
+from column_statistics import ColumnStatistics
+from plotting import ERROR_BARS
+from plotting import POINT_BUDGET
+from plotting import draw_bars
+from plotting import lttb_downsample
+from plotting import density_extent
+from plotting import density_grid
+from plotting import histogram_counts
+from plotting import draw_density
+
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+MAX_LOAD_WORKERS = min(8, os.cpu_count() or 1)  # Files read concurrently by multi-file operations
  
 class DataOperations:
     def __init__(self):
+        self.data_version = 0
+        self.hash_index = ColumnHashIndex()
+        self.filter_index = ColumnFilterIndex()
+        self.virtual_columns = VirtualColumnSet()
+        self.aggregation_cache = AggregationCache()
+        self.column_statistics = ColumnStatistics()
         self.data = None
+        self.file_cache = FileCache()
         self.root = tk.Tk()
         self.root.withdraw()  # Hide the root window
+        self.plot_window = PlotWindow()
+
+    @property
+    def data(self):
+        """The loaded dataset: a DataFrame, a ChunkedDataset in out-of-core mode, or None."""
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        with job_scheduler().data_lock.write():
+            self._data = value
+            self.mark_data_changed()
+
+    def mark_data_changed(self, columns=None):
+        """Bumps the data version and invalidates cached indexes and aggregation results.
+
+        Assigning self.data does this automatically; call it directly after modifying
+        self.data in place, passing the changed columns when only some of them changed.
+        Both hold the scheduler's data lock, so no background job sees half-updated caches.
+        """
+        with job_scheduler().data_lock.write():
+            self.data_version += 1
+            self.hash_index.invalidate(columns)
+            self.virtual_columns.invalidate(columns)
+            self.aggregation_cache.invalidate(self.data_version)
+            if columns is None:
+                self.column_statistics = ColumnStatistics()
+                self.filter_index.invalidate()
+            else:
+                changed = list(columns) + list(self.virtual_columns.dependents(columns))
+                self.column_statistics.drop(changed)
+                self.filter_index.invalidate(changed)
+            if isinstance(self.data, pd.DataFrame):
+                self.virtual_columns.prune(self.data.columns)
         
 
     def upload_file(self):
@@ -26,54 +143,320 @@ class DataOperations:
         )
         if self.file_path:
             try:
-                if self.file_path.endswith('.csv'):
-                    self.data = pd.read_csv(self.file_path)
-                elif self.file_path.endswith('.xlsx'):
-                    self.data = pd.read_excel(self.file_path)
-                messagebox.showinfo("Success", "File Uploaded Successfully!")
+                load_mode = single_select_from_dropdown(
+                    "Select Load Mode",
+                    "How should the file be loaded?",
+                    ["Standard", "Compact (Smaller Dtypes)", "Streaming (Chunked, Background)", "Streaming + Compact",
+                     "Out-of-Core (Larger than RAM)"]
+                )
+                if not load_mode:
+                    return  # User clicked Cancel
+
+                if load_mode.startswith("Out-of-Core"):
+                    data = self._load_out_of_core(self.file_path)
+                    with job_scheduler().data_lock.write():
+                        self.virtual_columns.clear()  # Derived columns belong to the previous dataset
+                        self.data = data
+                    messagebox.showinfo(
+                        "Success",
+                        f"File Uploaded Successfully in Out-of-Core Mode!\n\n"
+                        f"Rows: {len(self.data):,}\n"
+                        f"Partitions on disk: {len(self.data.partitions):,}"
+                    )
+                    return
+
+                if load_mode.startswith("Streaming"):
+                    data = self._read_file_in_background(self.file_path)
+                else:
+                    file_path = self.file_path
+                    data = run_with_progress(
+                        "Loading File", lambda report, cancel_event: self._read_file(file_path), determinate=False
+                    )
+
+                if "Compact" in load_mode:
+                    data, memory_report = run_with_progress(
+                        "Compacting Dtypes", lambda report, cancel_event: compact_dtypes(data), determinate=False
+                    )
+                with job_scheduler().data_lock.write():
+                    self.virtual_columns.clear()  # Derived columns belong to the previous dataset
+                    self.data = data
+                if "Compact" in load_mode:
+                    messagebox.showinfo(
+                        "Success",
+                        f"File Uploaded Successfully in Compact Mode!\n\n{format_memory_report(memory_report)}"
+                    )
+                else:
+                    messagebox.showinfo("Success", "File Uploaded Successfully!")
+            except OperationCancelled:
+                messagebox.showinfo("File Upload", "File upload canceled by the user.")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load file: {str(e)}")
         else:
             messagebox.showerror("Error", "No File Selected!")
         pass
 
+    def _read_file(self, file_path):
+        """Reads a CSV or XLSX file into a DataFrame, reusing the columnar cache when it is current."""
+        return self.file_cache.load(file_path, self._parse_file)
+
+    def _parse_file(self, file_path):
+        """Parses a CSV or XLSX file from scratch."""
+        if file_path.endswith('.csv'):
+            return pd.read_csv(file_path)
+        elif file_path.endswith('.xlsx'):
+            return pd.read_excel(file_path)
+        raise ValueError("Unsupported file type. Please select a CSV or XLSX file.")
+
+    def _read_file_in_background(self, file_path):
+        """Reads a file on a worker thread behind a progress dialog, in chunks for CSV files."""
+        if file_path.endswith('.csv'):
+            def task(report, cancel_event):
+                def progress(rows_read, bytes_read, total_bytes, eta_seconds):
+                    fraction = bytes_read / total_bytes if total_bytes else None
+                    report(fraction, format_ingest_progress(rows_read, bytes_read, total_bytes, eta_seconds))
+
+                def reader(path):
+                    data = read_csv_chunked(path, progress=progress, cancel_event=cancel_event)
+                    report(1.0, "Writing cache copy...")
+                    return data
+
+                report(0.0, "Checking file cache...")
+                return self.file_cache.load(file_path, reader)
+
+            return run_with_progress("Loading File", task)
+
+        # Excel workbooks cannot be parsed in chunks; read on the worker and allow abandoning
+        def task(report, cancel_event):
+            report(None, "Reading workbook...")
+            return self._read_file(file_path)
+
+        return run_with_progress("Loading File", task, determinate=False, abandon_on_cancel=True)
+
+    def _load_out_of_core(self, file_path):
+        """Partitions a file into an on-disk ChunkedDataset behind a progress dialog."""
+        if file_path.endswith('.csv'):
+            return run_with_progress(
+                "Loading File (Out-of-Core)",
+                lambda report, cancel_event: ChunkedDataset.from_csv(file_path, progress=report, cancel_event=cancel_event)
+            )
+        # Excel workbooks cannot be streamed; parse once and partition the result
+        return run_with_progress(
+            "Loading File (Out-of-Core)",
+            lambda report, cancel_event: ChunkedDataset.from_frame(self._read_file(file_path)),
+            determinate=False
+        )
+
+    def _is_out_of_core(self):
+        """Returns True when self.data is a partitioned on-disk dataset."""
+        return isinstance(self.data, ChunkedDataset)
+
+    def _numeric_columns(self):
+        """Returns the numeric column names of the loaded data in either mode."""
+        if self._is_out_of_core():
+            return pd.Index(self.data.numeric_columns())
+        return self.data.select_dtypes(include='number').columns.append(pd.Index(self.virtual_columns.names))
+
+    def _add_column(self, column_name, compute, inputs):
+        """Adds a column from compute(frame) -> Series or scalar.
+
+        In memory the column is registered as a lazy virtual column over `inputs` and only
+        computed when a consumer needs it; out-of-core it is written one partition at a time.
+        """
+        if self._is_out_of_core():
+            self.data = run_with_progress(
+                "Data Derivation",
+                lambda report, cancel_event: self.data.map_chunks(
+                    lambda chunk: chunk.assign(**{column_name: compute(chunk)}), report, cancel_event
+                )
+            )
+        else:
+            with job_scheduler().data_lock.write():
+                self.virtual_columns.add(VirtualColumn(column_name, compute, inputs))
+                self.mark_data_changed([column_name])
+
+    def _add_scalar_column(self, column_name, column, how, divisor=1):
+        """Adds a column holding one aggregate of `column` (sum, mean or count) on every row.
 
-    def data_deduplication(self, subset_columns = None):
-        """Performs deduplication on the loaded data after user confirmation and previews columns."""
+        In memory it stays a virtual scalar that is recomputed whenever `column` changes.
+        """
+        def aggregate(frame):
+            value = getattr(frame[column], how)()
+            return value / divisor if divisor != 1 else value
+
+        if self._is_out_of_core():
+            value = self._column_total(column, how)
+            value = value / divisor if divisor != 1 else value
+            self._add_column(column_name, lambda frame: value, [column])
+        else:
+            with job_scheduler().data_lock.write():
+                self.virtual_columns.add(VirtualColumn(
+                    column_name, aggregate, [column], scalar=True,
+                    description=f"{how} of {column}" + (f" / {divisor}" if divisor != 1 else "")
+                ))
+                self.mark_data_changed([column_name])
+
+    def _frame(self, columns=None):
+        """Returns the loaded data with virtual columns materialized (only `columns` when given)."""
+        if self._is_out_of_core() or not len(self.virtual_columns):
+            return self.data
+        return self.virtual_columns.materialize(self.data, columns)
+
+    def _column_names(self):
+        """Stored and virtual column names of the loaded data."""
+        if self._is_out_of_core():
+            return list(self.data.columns)
+        return list(self.data.columns) + [name for name in self.virtual_columns.names if name not in self.data.columns]
+
+    def _store_virtual_columns(self, data, title):
+        """Prepares an operation's result to replace the loaded data; returns it.
+
+        Out-of-core datasets have no virtual columns. Row-wise ones are computed partition by
+        partition and stored in the result. Scalar aggregates (and columns built on them)
+        cannot be computed one partition at a time, so they are removed and the user is told.
+        """
+        if not isinstance(data, ChunkedDataset):
+            return data
+        with job_scheduler().data_lock.write():
+            self.virtual_columns.prune(data.columns)
+            stored = self.virtual_columns.partition_safe()
+            removed = [name for name in self.virtual_columns.names if name not in stored]
+        if stored:
+            data = run_with_progress(
+                title,
+                lambda report, cancel_event: data.map_chunks(
+                    lambda chunk: self.virtual_columns.compute(chunk, stored), report, cancel_event,
+                    "Storing derived columns"
+                )
+            )
+        with job_scheduler().data_lock.write():
+            self.virtual_columns.clear()
+        if removed:
+            messagebox.showinfo(
+                title,
+                f"The result is stored out-of-core, where these derived columns cannot be kept: {removed}\n"
+                "They were removed; derive them again on the new data if you still need them."
+            )
+        return data
+
+    def _column_total(self, column, how):
+        """Returns the sum, mean or count of a column in either mode."""
+        if not self._is_out_of_core():
+            return getattr(self.data[column], how)()
+        sums, counts = run_with_progress(
+            "Data Derivation",
+            lambda report, cancel_event: self.data.column_sums([column], report, cancel_event)
+        )
+        if how == 'sum':
+            return sums[column]
+        if how == 'count':
+            return counts[column]
+        return sums[column] / counts[column] if counts[column] else np.nan
+
+    def clear_file_cache(self):
+        """Removes all cached columnar copies of previously loaded files."""
+        try:
+            cache_size = self.file_cache.size()
+            if cache_size == 0:
+                messagebox.showinfo("File Cache", "The file cache is already empty.")
+                return
+
+            confirm_clear = messagebox.askyesno(
+                "Clear File Cache",
+                f"The file cache currently uses {cache_size / 2**20:,.1f} MB.\n\n"
+                "Do you want to clear it?"
+            )
+            if confirm_clear:
+                freed = self.file_cache.clear()
+                messagebox.showinfo("File Cache", f"File cache cleared. Freed {freed / 2**20:,.1f} MB.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to clear file cache: {str(e)}")
+
+
+    def data_deduplication(self, subset_columns = None, keep = None):
+        """Performs deduplication on the loaded data after user confirmation and previews columns.
+
+        :param subset_columns: Columns that identify a duplicate; asked for when None (all columns if none chosen).
+        :param keep: 'first', 'last' or False (drop every copy); asked for when None.
+        """
         if self.data is not None:
             try:
-                # Step 1: Preview the columns of the data
-                
+                # Step 1: Choose exact or near-duplicate matching, the key columns and which copy to keep
+                if subset_columns is None and keep is None:
+                    match_mode = single_select_from_dropdown(
+                        "Select Matching Mode",
+                        "How should duplicate rows be matched?",
+                        ["Exact Duplicates", "Near-Duplicates (Fuzzy)"]
+                    )
+                    if not match_mode:
+                        return  # User clicked Cancel
+                    if match_mode == "Near-Duplicates (Fuzzy)":
+                        self._deduplicate_fuzzy()
+                        return
+
+                if subset_columns is None:
+                    subset_columns = multi_select_from_dropdown(
+                        "Select Deduplication Columns",
+                        "Choose the columns that identify a duplicate (select none to use all columns):",
+                        self.data.columns.tolist()
+                    )
                 column_used = subset_columns if subset_columns else self.data.columns.tolist()
 
-                deduplicated_rows = self.data[self.data.duplicated(subset=column_used)]
+                if keep is None:
+                    keep_choice = single_select_from_dropdown(
+                        "Select Keep Policy",
+                        "Which copy of each duplicate should be kept?",
+                        list(KEEP_POLICIES)
+                    )
+                    if not keep_choice:
+                        return  # User clicked Cancel
+                    keep = KEEP_POLICIES[keep_choice]
+
+                if self._is_out_of_core():
+                    self._deduplicate_out_of_core(column_used, keep)
+                    return
+
+                # Step 2: Find duplicates from the cached per-column hash index in the background
+                data = self.data
 
-                if not deduplicated_rows.empty:
+                def find_duplicates(report, cancel_event):
+                    duplicate_mask = self.hash_index.duplicated(data, column_used, keep=keep)
+                    if not duplicate_mask.any():
+                        return duplicate_mask, None
+                    return duplicate_mask, DuplicateGroupReport(self.hash_index.row_hashes(data, column_used))
 
-                    preview_message = "Preview of Duplicate Rows (with column details):\n"
-                    for index,row in deduplicated_rows.iterrows():
-                        row_details = {col: row[col] for col in column_used}
-                        preview_message += f"\nRow {index + 1}: {row_details}"
-                # preview_message = f"The data contains the following columns:\n{', '.join(self.data.columns)}\n\n"
-                # preview_message += "Would you like to proceed with deduplication?"
+                duplicate_mask, report = run_with_progress("Finding Duplicates", find_duplicates, determinate=False)
+                rows_to_remove = int(duplicate_mask.sum())
+
+                if rows_to_remove == 0:
+                    messagebox.showinfo(
+                        "Data Deduplication",
+                        f"No duplicate rows found on columns: {','.join(map(str, column_used))}"
+                    )
+                    return
 
-                # Step 2: Ask the user for confirmation
-                confirm_deduplication = messagebox.askyesno(
+                # Step 3: Preview duplicate groups page by page and ask the user for confirmation
+                confirm_deduplication = show_paginated_table(
                     "Preview Deduplication",
-                    f"Columns Used for Deduplication: {','.join(column_used)}\n\n{preview_message}"
+                    f"Columns Used for Deduplication: {','.join(map(str, column_used))}\n"
+                    f"Duplicate Groups: {report.group_count:,}   |   Rows to Remove: {rows_to_remove:,}",
+                    report.group_count,
+                    lambda start, stop: report.page(data, column_used, start, stop),
+                    confirm_text="Deduplicate"
                 )
 
                 if not confirm_deduplication:
                     messagebox.showinfo("Data Deduplication", "Operation canceled by the user.")
                     return
 
-                # Step 3: Perform deduplication
-                original_rows = len(self.data)
-                self.data = self.data.drop_duplicates()
+                # Step 4: Perform deduplication on the selected subset
+                original_rows = len(data)
+                self.data = run_with_progress(
+                    "Data Deduplication", lambda report, cancel_event: data[~duplicate_mask], determinate=False
+                )
                 deduplicated_rows = len(self.data)
                 removed_rows = original_rows - deduplicated_rows
 
-                # Step 4: Notify the user of the results
+                # Step 5: Notify the user of the results
                 messagebox.showinfo(
                     "Deduplication Completed",
                     f"Deduplication completed successfully!\n"
@@ -82,7 +465,7 @@ class DataOperations:
                     f"Duplicates Removed: {removed_rows}"
                 )
 
-                # Step 5: Automatically preview the deduplicated file
+                # Step 6: Automatically preview the deduplicated file
                 self.preview_dataset()
 
             except Exception as e:
@@ -92,74 +475,244 @@ class DataOperations:
 
 
 
+    def _deduplicate_fuzzy(self):
+        """Finds and removes near-duplicate rows, keeping the first row of each cluster."""
+        if self._is_out_of_core():
+            messagebox.showerror("Error", "Near-duplicate matching is only available for in-memory datasets.")
+            return
+
+        # Step 1: Choose how candidate rows are blocked together
+        blocking = single_select_from_dropdown(
+            "Select Blocking Method",
+            "Only rows in the same block are compared:",
+            ["Key Columns", "MinHash LSH (Text Similarity)"]
+        )
+        if not blocking:
+            return  # User clicked Cancel
+
+        key_columns, prefix_length, minhash_columns = None, 0, None
+        if blocking == "Key Columns":
+            key_columns = multi_select_from_dropdown(
+                "Select Blocking Columns",
+                "Rows are compared only when these columns match (case-insensitive):",
+                self.data.columns.tolist()
+            )
+            if not key_columns:
+                messagebox.showerror("Error", "No blocking columns selected!")
+                return
+            prefix_length = simpledialog.askinteger(
+                "Blocking Prefix",
+                "Compare only the first N characters of the blocking columns (0 = whole value):",
+                initialvalue=0, minvalue=0
+            )
+            if prefix_length is None:
+                return  # User clicked Cancel
+        else:
+            minhash_columns = multi_select_from_dropdown(
+                "Select Text Columns",
+                "Rows with similar text in these columns are compared:",
+                self.data.columns.tolist()
+            )
+            if not minhash_columns:
+                messagebox.showerror("Error", "No text columns selected!")
+                return
+
+        # Step 2: Choose the columns compared inside each block and the match thresholds
+        compare_columns = multi_select_from_dropdown(
+            "Select Comparison Columns",
+            "Rows are near-duplicates when every one of these columns matches:",
+            self.data.columns.tolist()
+        )
+        if not compare_columns:
+            messagebox.showerror("Error", "No comparison columns selected!")
+            return
+        similarity = simpledialog.askfloat(
+            "Text Similarity",
+            "Minimum similarity for text values (0-1):",
+            initialvalue=DEFAULT_SIMILARITY, minvalue=0.0, maxvalue=1.0
+        )
+        if similarity is None:
+            return
+        numeric_tolerance = simpledialog.askfloat(
+            "Numeric Tolerance",
+            "Maximum relative difference for numeric values (e.g. 0.001 = 0.1%):",
+            initialvalue=DEFAULT_NUMERIC_TOLERANCE, minvalue=0.0
+        )
+        if numeric_tolerance is None:
+            return
+
+        # Step 3: Block, score and cluster in the background
+        data = self.data
+        labels, candidates, matched = run_with_progress(
+            "Finding Near-Duplicates",
+            lambda report, cancel_event: find_near_duplicates(
+                data, compare_columns, key_columns, prefix_length, minhash_columns,
+                similarity, numeric_tolerance, cancel_event
+            ),
+            determinate=False
+        )
+        duplicate_mask = labels != np.arange(len(data))
+        rows_to_remove = int(duplicate_mask.sum())
+        if rows_to_remove == 0:
+            messagebox.showinfo(
+                "Data Deduplication",
+                f"No near-duplicate rows found ({candidates:,} candidate pairs compared)."
+            )
+            return
+
+        # Step 4: Preview the clusters and ask the user for confirmation
+        report = DuplicateGroupReport(labels)
+        confirm_deduplication = show_paginated_table(
+            "Preview Near-Duplicate Removal",
+            f"Columns Compared: {','.join(map(str, compare_columns))}\n"
+            f"Candidate Pairs: {candidates:,}   |   Matched Pairs: {matched:,}\n"
+            f"Clusters: {report.group_count:,}   |   Rows to Remove: {rows_to_remove:,} (first row of each cluster is kept)",
+            report.group_count,
+            lambda start, stop: report.page(data, compare_columns, start, stop),
+            confirm_text="Deduplicate"
+        )
+        if not confirm_deduplication:
+            messagebox.showinfo("Data Deduplication", "Operation canceled by the user.")
+            return
+
+        # Step 5: Keep the first row of every cluster
+        original_rows = len(data)
+        self.data = run_with_progress(
+            "Data Deduplication", lambda report, cancel_event: data[~duplicate_mask], determinate=False
+        )
+        messagebox.showinfo(
+            "Deduplication Completed",
+            f"Near-duplicate removal completed successfully!\n"
+            f"Original Rows: {original_rows}\n"
+            f"Deduplicated Rows: {len(self.data)}\n"
+            f"Near-Duplicates Removed: {rows_to_remove}"
+        )
+        self.preview_dataset()
+
+    def _deduplicate_out_of_core(self, column_used, keep):
+        """Deduplicates a partitioned dataset with bounded memory."""
+        confirm_deduplication = messagebox.askyesno(
+            "Preview Deduplication",
+            f"Columns Used for Deduplication: {','.join(column_used)}\n\n"
+            f"The dataset is stored out-of-core ({len(self.data):,} rows), so duplicates are "
+            "found with an on-disk hash pass instead of an in-memory preview.\n\n"
+            "Do you want to proceed with deduplication?"
+        )
+        if not confirm_deduplication:
+            messagebox.showinfo("Data Deduplication", "Operation canceled by the user.")
+            return
+
+        original_rows = len(self.data)
+        self.data, removed_rows = run_with_progress(
+            "Data Deduplication",
+            lambda report, cancel_event: self.data.drop_duplicates(column_used, keep, report, cancel_event)
+        )
+        messagebox.showinfo(
+            "Deduplication Completed",
+            f"Deduplication completed successfully!\n"
+            f"Original Rows: {original_rows}\n"
+            f"Deduplicated Rows: {len(self.data)}\n"
+            f"Duplicates Removed: {removed_rows}"
+        )
+        self.preview_dataset()
+
+
     def data_cleansing(self):
         """Enhanced Data Cleansing with custom strategies, validation, and logging."""
         if self.data is not None:
             try:
-                # Initial missing values
-                initial_missing = self.data.isnull().sum().sum()
-
-                # Step 1: Standardize null values
-                self.data.replace(
-                    to_replace=[r'^\s*$', 'nan', 'Nan', 'NAn', 'NaN'],  # Customize as needed
-                    value=np.nan,
-                    regex=True,
-                    inplace=True
+                # Step 0: Build a cleansing policy interactively or apply a saved one
+                cleansing_mode = single_select_from_dropdown(
+                    "Select Cleansing Mode",
+                    "How should missing values be handled?",
+                    ["Interactive (Build Policy)", "Apply Saved Policy"]
                 )
-                standardized_missing = self.data.isnull().sum().sum()
+                if not cleansing_mode:
+                    return  # User clicked Cancel
+
+                if cleansing_mode == "Apply Saved Policy":
+                    if self._is_out_of_core():
+                        messagebox.showerror("Error", "Saved cleansing policies can only be applied to in-memory datasets.")
+                        return
+                    policy = self._load_cleansing_policy()
+                    if policy is None:
+                        return
+                    missing = self._apply_cleansing_policy(policy)
+                    messagebox.showinfo("Data Cleansing Summary", missing.format())
+                    self.preview_dataset()
+                    return
+
+                # Step 1: Confirm which text values count as missing
+                null_tokens = self._ask_null_tokens()
+                if null_tokens is None:
+                    return  # User clicked Cancel
 
-                # Step 2: Drop completely empty columns (if enabled)
-                empty_columns = self.data.columns[self.data.isnull().all()]
-                if not empty_columns.empty:
-                    drop_confirm = messagebox.askyesno(
+                if self._is_out_of_core():
+                    self._cleanse_out_of_core(null_tokens)
+                    return
+
+                policy = CleansingPolicy(null_tokens)
+
+                # Step 2: Count the initial missing values once (each step then updates the
+                # counts) and standardize null values (text columns only) in a shallow copy, so
+                # the loaded data stays untouched until the whole policy has been applied
+                loaded = self.data
+
+                def standardize(report, cancel_event):
+                    missing = MissingValueLog.from_frame(loaded)
+                    missing.record("Initial Missing Values")
+                    data, converted = standardize_nulls(loaded.copy(deep=False), null_tokens)
+                    missing.add_converted(converted)
+                    missing.record("After Standardization")
+                    return data, missing
+
+                data, missing = run_with_progress("Data Cleansing", standardize, determinate=False)
+
+                # Step 3: Ask whether completely empty columns should be dropped
+                empty_columns = missing.empty_columns(len(data))
+                if empty_columns:
+                    policy.drop_empty_columns = messagebox.askyesno(
                         "Drop Empty Columns",
-                        f"Found empty columns: {list(empty_columns)}\n\n"
+                        f"Found empty columns: {empty_columns}\n\n"
                         "Do you want to drop them?"
                     )
-                    if drop_confirm:
-                        self.data = self.data.dropna(axis=1, how='all')
-
-                after_drop_columns_missing = self.data.isnull().sum().sum()
-
-                # Step 3: Handle missing values for numeric columns
-                numeric_cols = self.data.select_dtypes(include=['float64', 'int64']).columns
-                for col in numeric_cols:
-                    if self.data[col].isnull().sum() > 0:
-                        fill_value = self.data[col].mean()  # Default to mean
-                        self.data[col].fillna(fill_value, inplace=True)
 
-                after_numeric_fill_missing = self.data.isnull().sum().sum()
+                # Step 4: Ask for one strategy for all numeric columns and one per categorical column
+                numeric_cols = missing.missing_columns(data.select_dtypes(include='number').columns)
+                if numeric_cols:
+                    numeric_choice = single_select_from_dropdown(
+                        "Handle Missing Numeric Values",
+                        f"Numeric columns with missing values: {numeric_cols}\n\n"
+                        "How should their missing values be handled?",
+                        list(NUMERIC_FILL_CHOICES)
+                    )
+                    if not numeric_choice:
+                        return  # User clicked Cancel
+                    policy.dtype_rules["numeric"] = NUMERIC_FILL_CHOICES[numeric_choice]
 
-                # Step 4: Handle missing values for categorical columns
-                categorical_cols = self.data.select_dtypes(include=['object']).columns
+                categorical_cols = missing.missing_columns(data.select_dtypes(include=['object', 'category']).columns)
                 for col in categorical_cols:
-                    if self.data[col].isnull().sum() > 0:
-                        # Ask user for handling strategy
-                        handling_choice = messagebox.askyesno(
-                            "Handle Missing Categorical Values",
-                            f"Column '{col}' has {self.data[col].isnull().sum()} missing values.\n\n"
-                            "Choose Yes to fill with the most frequent value (mode).\n"
-                            "Choose No to fill with 'Unknown'."
-                        )
-                        if handling_choice:  # Fill with mode
-                            mode_value = self.data[col].mode()[0]  # Get the most frequent value
-                            self.data[col].fillna(mode_value, inplace=True)
-                        else:  # Fill with "Unknown"
-                            self.data[col].fillna('Unknown', inplace=True)
-
-                after_categorical_fill_missing = self.data.isnull().sum().sum()
-
-                # Log each step
-                cleansing_log = (
-                    f"Initial Missing Values: {initial_missing}\n"
-                    f"After Standardization: {standardized_missing}\n"
-                    f"After Dropping Empty Columns: {after_drop_columns_missing}\n"
-                    f"After Filling Numeric Columns: {after_numeric_fill_missing}\n"
-                    f"After Filling Categorical Columns: {after_categorical_fill_missing}\n"
-                )
+                    if policy.drop_empty_columns and col in empty_columns:
+                        continue
+                    handling_choice = single_select_from_dropdown(
+                        "Handle Missing Categorical Values",
+                        f"Column '{col}' has {missing.counts[col]} missing values.\n\n"
+                        "How should they be handled?",
+                        list(TEXT_FILL_CHOICES)
+                    )
+                    if not handling_choice:
+                        return  # User clicked Cancel
+                    policy.column_rules[col] = TEXT_FILL_CHOICES[handling_choice]
+
+                # Step 5: Apply the whole policy in one pass
+                missing = self._apply_cleansing_policy(policy, missing, data)
 
                 # Show log
-                messagebox.showinfo("Data Cleansing Summary", cleansing_log)
+                messagebox.showinfo("Data Cleansing Summary", missing.format())
+
+                # Step 6: Offer to save the choices for reuse on other files
+                if messagebox.askyesno("Save Cleansing Policy", "Do you want to save these choices as a reusable cleansing policy?"):
+                    self._save_cleansing_policy(policy)
 
                 # Automatically preview the cleansed dataset
                 self.preview_dataset()
@@ -170,10 +723,215 @@ class DataOperations:
             messagebox.showerror("Error", "No Data Loaded!")
 
 
+    def _apply_cleansing_policy(self, policy, missing=None, data=None):
+        """Applies a cleansing policy to the loaded data and returns its MissingValueLog.
+
+        :param data: the loaded data already standardized by the caller (described by missing)
+
+        The loaded data is only replaced once the policy succeeded. When no rows were
+        dropped, the cached column statistics are updated with the filled cells instead of
+        being recomputed.
+        """
+        source = self.data if data is None else data
+        cleansed, cleansing_log = run_with_progress(
+            "Data Cleansing",
+            lambda report, cancel_event: apply_policy(source, policy, missing),
+            determinate=False
+        )
+        with job_scheduler().data_lock.write():
+            statistics = self.column_statistics
+            self.data = cleansed
+            self._fold_filled_cells(statistics, cleansing_log)
+        return cleansing_log
+
+    def _fold_filled_cells(self, statistics, missing):
+        """Keeps the column statistics of the data before cleansing, updated with the filled cells.
+
+        Columns in which null tokens became missing values, and dropped columns, no longer
+        match their statistics, so those are forgotten rather than updated.
+        """
+        if not missing.rows_dropped:
+            changed = missing.changed_columns()
+            statistics.drop(changed + list(self.virtual_columns.dependents(changed)))
+            statistics.drop(list(self.virtual_columns.dependents(missing.filled)))
+            statistics.fill(missing.filled)
+            self.column_statistics = statistics
+
+    def _load_cleansing_policy(self):
+        """Asks for a saved cleansing policy file; returns None on Cancel."""
+        policy_path = filedialog.askopenfilename(
+            title="Select a Cleansing Policy",
+            filetypes=[("Cleansing Policy", "*.json")]
+        )
+        return CleansingPolicy.load(policy_path) if policy_path else None
+
+    def _save_cleansing_policy(self, policy):
+        policy_path = filedialog.asksaveasfilename(
+            title="Save Cleansing Policy",
+            defaultextension=".json",
+            initialfile="cleansing_policy.json",
+            filetypes=[("Cleansing Policy", "*.json")]
+        )
+        if policy_path:
+            policy.save(policy_path)
+            messagebox.showinfo("Success", f"Cleansing policy saved to {policy_path}")
+
+    def batch_cleansing(self):
+        """Applies a saved cleansing policy to several files and writes a cleansed copy of each, without prompts."""
+        try:
+            policy = self._load_cleansing_policy()
+            if policy is None:
+                return
+            file_paths = filedialog.askopenfilenames(
+                title="Select Files to Cleanse",
+                filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")]
+            )
+            if not file_paths:
+                return
+            output_dir = filedialog.askdirectory(title="Select Output Folder")
+            if not output_dir:
+                return
+
+            def task(report, cancel_event):
+                results = []
+                for position, file_path in enumerate(file_paths):
+                    if cancel_event.is_set():
+                        raise OperationCancelled()
+                    name = os.path.basename(file_path)
+                    report(position / len(file_paths), f"Cleansing {name} ({position + 1}/{len(file_paths)})")
+                    try:
+                        data, missing = apply_policy(self._read_file(file_path), policy)
+                        stem, extension = os.path.splitext(name)
+                        output_path = os.path.join(output_dir, f"{stem}_cleansed{extension}")
+                        write_dataset(frame_chunks(data), output_path, schema_chunks=lambda: [data])
+                        results.append(f"{name}: {missing.steps[0][1]} -> {missing.total} missing values")
+                    except Exception as e:
+                        results.append(f"{name}: FAILED ({str(e)})")
+                report(1.0, "Done")
+                return results
+
+            results = run_with_progress("Batch Cleansing", task)
+            messagebox.showinfo("Batch Cleansing Completed", "\n".join(results))
+        except OperationCancelled:
+            messagebox.showinfo("Batch Cleansing", "Batch cleansing canceled by the user.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Batch Cleansing Failed: {str(e)}")
+
+    def _ask_null_tokens(self):
+        """Asks which text values should be treated as missing; returns None on Cancel."""
+        tokens = simpledialog.askstring(
+            "Null Tokens",
+            "Text values treated as missing (comma-separated, case-insensitive).\n"
+            "Blank cells are always treated as missing:",
+            initialvalue=", ".join(NULL_TOKENS)
+        )
+        return None if tokens is None else parse_null_tokens(tokens)
+
+    def _cleanse_out_of_core(self, null_tokens):
+        """Out-of-core cleansing: the same steps as data_cleansing, one partition at a time."""
+        dataset = self.data
+        missing = MissingValueLog(run_with_progress("Data Cleansing", dataset.missing_counts))
+        missing.record("Initial Missing Values")
+
+        # Step 1: Standardize null values, counting the converted cells on the same pass
+        converted = []
+
+        def standardize_chunk(chunk):
+            chunk, chunk_converted = standardize_nulls(chunk, null_tokens)
+            converted.append(chunk_converted)
+            return chunk
+
+        dataset = run_with_progress(
+            "Data Cleansing",
+            lambda report, cancel_event: dataset.map_chunks(standardize_chunk, report, cancel_event, "Standardizing nulls")
+        )
+        for chunk_converted in converted:
+            missing.add_converted(chunk_converted)
+        missing.record("After Standardization")
+
+        # Step 2: Drop completely empty columns (if enabled)
+        empty_columns = missing.empty_columns(len(dataset))
+        if empty_columns:
+            drop_confirm = messagebox.askyesno(
+                "Drop Empty Columns",
+                f"Found empty columns: {empty_columns}\n\n"
+                "Do you want to drop them?"
+            )
+            if drop_confirm:
+                dataset = run_with_progress(
+                    "Data Cleansing",
+                    lambda report, cancel_event: dataset.map_chunks(
+                        lambda chunk: chunk.drop(columns=empty_columns), report, cancel_event, "Dropping empty columns"
+                    )
+                )
+                missing.drop(empty_columns)
+        missing.record("After Dropping Empty Columns")
+
+        # Step 3: Numeric columns are filled with their global mean
+        fill_values = {}
+        numeric_cols = missing.missing_columns(dataset.numeric_columns())
+        if numeric_cols:
+            sums, counts = run_with_progress(
+                "Data Cleansing",
+                lambda report, cancel_event: dataset.column_sums(numeric_cols, report, cancel_event)
+            )
+            for col in numeric_cols:
+                if counts[col] > 0:
+                    fill_values[col] = sums[col] / counts[col]
+                    missing.filled[col] = (fill_values[col], int(missing.counts[col]))
+                    missing.set(col, 0)
+        missing.record("After Filling Numeric Columns")
+
+        # Step 4: Handle missing values for categorical columns
+        dtypes = dataset.dtypes()
+        categorical_cols = [
+            col for col in missing.missing_columns(dataset.columns)
+            if dtypes[col] == object or isinstance(dtypes[col], pd.CategoricalDtype)
+        ]
+        for col in categorical_cols:
+            handling_choice = messagebox.askyesno(
+                "Handle Missing Categorical Values",
+                f"Column '{col}' has {missing.counts[col]} missing values.\n\n"
+                "Choose Yes to fill with the most frequent value (mode).\n"
+                "Choose No to fill with 'Unknown'."
+            )
+            if handling_choice:
+                value_counts = run_with_progress(
+                    "Data Cleansing",
+                    lambda report, cancel_event: dataset.value_counts(col, report, cancel_event)
+                )
+                if value_counts.empty:
+                    continue
+                fill_values[col] = value_counts.index[0]
+            else:
+                fill_values[col] = 'Unknown'
+            missing.set(col, 0)
+        missing.record("After Filling Categorical Columns")
+
+        if fill_values:
+            dataset = run_with_progress(
+                "Data Cleansing",
+                lambda report, cancel_event: dataset.map_chunks(
+                    lambda chunk: fill_missing(chunk, fill_values), report, cancel_event, "Filling missing values"
+                )
+            )
+        with job_scheduler().data_lock.write():
+            statistics = self.column_statistics
+            self.data = dataset
+            self._fold_filled_cells(statistics, missing)
+
+        messagebox.showinfo("Data Cleansing Summary", missing.format())
+        self.preview_dataset()
+
+
     def format_revisioning(self):
         """Automatic Format Revisioning: Detect and convert numeric columns to int or float."""
         if self.data is not None:
             try:
+                if self._is_out_of_core():
+                    self._format_revision_out_of_core()
+                    return
+
                 # Step 1: Display current data types
                 data_types = self.data.dtypes.to_string()
                 proceed = messagebox.askyesno(
@@ -183,51 +941,301 @@ class DataOperations:
                 if not proceed:
                     return
 
-                # Step 2: Identify numeric columns
-                numeric_cols = self.data.select_dtypes(include=['int64', 'float64']).columns
-                if numeric_cols.empty:
+                # Step 2: Revise numeric columns and numbers stored as text, narrowest exact dtype first
+                data = self.data
+                revised_data, revision_report = run_with_progress(
+                    "Format Revisioning", lambda report, cancel_event: revise_formats(data), determinate=False
+                )
+                if revision_report.empty:
                     messagebox.showinfo("No Numeric Columns", "No numeric columns to revise.")
                     return
 
-                # Step 3: Process each numeric column
-                revised_columns = []
-                for col in numeric_cols:
-                    try:
-                        # Check if all values are whole numbers
-                        if self.data[col].dropna().apply(lambda x: float(x).is_integer()).all():
-                            # Convert to int if all values are integers
-                            self.data[col] = self.data[col].astype(int)
-                            revised_columns.append((col, 'int'))
-                        else:
-                            # Ensure column is float
-                            self.data[col] = self.data[col].astype(float)
-                            revised_columns.append((col, 'float'))
-                    except Exception as col_error:
-                        messagebox.showwarning(
-                            "Conversion Warning",
-                            f"Failed to revise column '{col}': {str(col_error)}"
-                        )
+                changed = revision_report.index[revision_report["before_dtype"] != revision_report["after_dtype"]].tolist()
+                with job_scheduler().data_lock.write():
+                    for col in changed:
+                        self.data[col] = revised_data[col]
+                    self.mark_data_changed(changed)
 
-                # Notify success
-                if revised_columns:
-                    summary = "\n".join([f"{col}: {dtype}" for col, dtype in revised_columns])
-                    messagebox.showinfo(
-                        "Format Revisioning Completed",
-                        f"Revised columns:\n{summary}"
-                    )
-                else:
-                    messagebox.showinfo("Format Revisioning", "No columns revised.")
+                # Notify success with the memory saved per column
+                summary = "\n".join([f"{col}: {kind}" for col, kind in revision_report["kind"].items()])
+                messagebox.showinfo(
+                    "Format Revisioning Completed",
+                    f"Revised columns:\n{summary}\n\n{format_memory_report(revision_report)}"
+                )
             except Exception as e:
                 messagebox.showerror("Error", f"Format Revisioning Failed: {str(e)}")
         else:
             messagebox.showerror("Error", "No Data Loaded!")
 
 
+    def _format_revision_out_of_core(self):
+        """Out-of-core format revisioning: one pass to inspect columns, one pass to convert them."""
+        data_types = self.data.dtypes().to_string()
+        proceed = messagebox.askyesno(
+            "Current Data Types",
+            f"Here are the current data types of your dataset:\n\n{data_types}\n\nDo you want to proceed with Format Revisioning?"
+        )
+        if not proceed:
+            return
+
+        data = self.data
+        revised_data, revision_report = run_with_progress(
+            "Format Revisioning", lambda report, cancel_event: data.revise_formats(report, cancel_event)
+        )
+        if revision_report.empty:
+            messagebox.showinfo("No Numeric Columns", "No numeric columns to revise.")
+            return
+        self.data = revised_data
+
+        # Notify success with the memory saved per column
+        summary = "\n".join([f"{col}: {kind}" for col, kind in revision_report["kind"].items()])
+        messagebox.showinfo(
+            "Format Revisioning Completed",
+            f"Revised columns:\n{summary}\n\n{format_memory_report(revision_report)}"
+        )
+
+    def _merge_out_of_core(self, other_data, merge_choice, join_keys=None):
+        """Streams the partitioned dataset through a merge with the (in-memory) selected file."""
+        if merge_choice == "Concatenate (Side by Side)":
+            other_data.columns = [f"{col}_2" if col in self.data.columns else col for col in other_data.columns]
+            position = {"offset": 0}
+
+            def concat_chunk(chunk):
+                start = position["offset"]
+                position["offset"] += len(chunk)
+                right = other_data.iloc[start:start + len(chunk)].reset_index(drop=True)
+                return pd.concat([chunk.reset_index(drop=True), right], axis=1)
+
+            def concatenate(report, cancel_event):
+                result = self.data.map_chunks(concat_chunk, report, cancel_event, "Concatenating")
+                leftover = other_data.iloc[len(self.data):]
+                if not leftover.empty:
+                    result.append(leftover.reindex(columns=result.columns))
+                return result
+
+            self.data = run_with_progress("Data Merging", concatenate)
+            messagebox.showinfo("Data Merging", "Data concatenated successfully side by side!")
+            return
+
+        join_type = JOIN_TYPES.get(merge_choice)
+        if join_type not in ("inner", "left"):
+            raise ValueError(
+                f"{merge_choice} is not available in out-of-core mode; "
+                "use Inner Merge, Left Join or Concatenate (Side by Side)."
+            )
+        # Each partition is merged against the selected file independently, which is exact for
+        # inner and left joins because every output row comes from exactly one left-hand row.
+        self.data = run_with_progress(
+            "Data Merging",
+            lambda report, cancel_event: self.data.map_chunks(
+                lambda chunk: pd.merge(chunk, other_data, how=join_type, on=join_keys), report, cancel_event, "Merging"
+            )
+        )
+        messagebox.showinfo("Data Merging", f"Data merged successfully with {join_type.title()} join!")
+
+    def _ask_join_keys(self, other_data):
+        """Asks for the join keys and the expected key relationship; returns (None, None) on Cancel."""
+        candidates = shared_columns(self.data, other_data)
+        if not candidates:
+            raise ValueError("The files have no column names in common to join on.")
+        join_keys = multi_select_from_dropdown(
+            "Select Join Keys",
+            "Choose the columns to join on (select none to use every shared column):",
+            candidates
+        )
+        relationship_choice = single_select_from_dropdown(
+            "Validate Join Keys",
+            "Which key relationship do you expect between the files?",
+            list(RELATIONSHIPS)
+        )
+        if not relationship_choice:
+            return None, None
+        return (join_keys or candidates), RELATIONSHIPS[relationship_choice]
+
+    def _join(self, other_data, join_type, join_keys, expected_relationship=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """Joins other_data into self.data after checking the keys and the size of the result.
+
+        Results that fit the memory budget are merged in memory; larger ones are hash-partitioned
+        into an out-of-core dataset. Returns False when the user cancels or the join is refused.
+        """
+        data = self.data
+
+        def estimate_join(report, cancel_event):
+            dtypes = key_dtypes(data, other_data, join_keys)
+            left_hashes = key_hashes(data, join_keys, dtypes)
+            right_hashes = key_hashes(other_data, join_keys, dtypes)
+            return left_hashes, right_hashes, JoinEstimate(data, other_data, join_keys, join_type, left_hashes, right_hashes)
+
+        left_hashes, right_hashes, estimate = run_with_progress("Estimating Join", estimate_join, determinate=False)
+        estimate.validate(expected_relationship)
+
+        strategy = estimate.plan(memory_budget)
+        if strategy == "refuse":
+            messagebox.showerror(
+                "Join Refused",
+                f"{estimate.describe()}\n\n"
+                f"A single key value produces {estimate.largest_key_rows:,} rows, more than the "
+                f"{memory_budget / 2**20:,.0f} MB memory budget allows. Choose more selective join keys."
+            )
+            return False
+
+        if strategy == "partitioned" or estimate.relationship == "many_to_many":
+            strategy_text = (
+                f"The result exceeds the {memory_budget / 2**20:,.0f} MB memory budget and will be built "
+                f"on disk with a partitioned hash join ({estimate.partition_count(memory_budget)} partitions)."
+                if strategy == "partitioned" else "The result fits in memory."
+            )
+            proceed = messagebox.askyesno("Confirm Join", f"{estimate.describe()}\n\n{strategy_text}\n\nProceed?")
+            if not proceed:
+                return False
+
+        if strategy == "partitioned":
+            merged = run_with_progress(
+                "Data Merging",
+                lambda report, cancel_event: partitioned_merge(
+                    data, other_data, join_keys, join_type, estimate.partition_count(memory_budget),
+                    left_hashes, right_hashes, report, cancel_event
+                )
+            )
+            self.data = self._store_virtual_columns(merged, "Data Merging")
+        else:
+            self.data = run_with_progress(
+                "Data Merging",
+                lambda report, cancel_event: pd.merge(data, other_data, how=join_type, on=join_keys),
+                determinate=False
+            )
+        return True
+
+    def _load_files_concurrently(self, file_paths, title):
+        """Reads several files at once on a worker pool; returns the frames in file_paths order."""
+        def task(report, cancel_event):
+            frames = [None] * len(file_paths)
+            with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(file_paths))) as pool:
+                futures = {pool.submit(self._read_file, path): position for position, path in enumerate(file_paths)}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    if cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        raise OperationCancelled()
+                    frames[futures[future]] = future.result()
+                    report(done / len(file_paths), f"Loaded {done} of {len(file_paths)} files")
+            return frames
+
+        return run_with_progress(title, task)
+
+    def _merge_many_files(self):
+        """Joins the loaded data with several files on shared keys in one operation."""
+        if self._is_out_of_core():
+            raise ValueError("Multi-file merges are only available for in-memory datasets.")
+        file_paths = filedialog.askopenfilenames(
+            title="Select Files to Merge",
+            filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")]
+        )
+        if not file_paths:
+            messagebox.showerror("Error", "No File Selected for Merging!")
+            return False
+
+        frames = [self.data] + self._load_files_concurrently(list(file_paths), "Loading Files")
+        names = [os.path.splitext(os.path.basename(getattr(self, 'file_path', '') or 'loaded'))[0]]
+        names += [os.path.splitext(os.path.basename(path))[0] for path in file_paths]
+
+        candidates = common_columns(frames)
+        if not candidates:
+            raise ValueError("The files have no column names in common to join on.")
+        join_keys = multi_select_from_dropdown(
+            "Select Join Keys",
+            "Choose the columns to join on (select none to use every shared column):",
+            candidates
+        ) or candidates
+        merge_choice = single_select_from_dropdown(
+            "Merge Options",
+            "Choose the type of join (Left Join keeps every row of the loaded data):",
+            ["Inner Merge", "Outer Merge", "Left Join"]
+        )
+        if not merge_choice:
+            return False
+
+        frames = disambiguate_columns(frames, names, join_keys)
+        self.data = run_with_progress(
+            "Data Merging",
+            lambda report, cancel_event: merge_many(frames, join_keys, JOIN_TYPES[merge_choice], progress=report),
+            determinate=False
+        )
+        messagebox.showinfo(
+            "Data Merging",
+            f"Merged {len(frames)} datasets on {', '.join(map(str, join_keys))} with {merge_choice}!\n"
+            f"Result: {len(self.data):,} rows x {len(self.data.columns):,} columns"
+        )
+        return True
+
+    def _append_files(self):
+        """Appends the rows of several files below the loaded data, aligning columns by name."""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Files to Append",
+            filetypes=[("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")]
+        )
+        if not file_paths:
+            messagebox.showerror("Error", "No File Selected for Merging!")
+            return False
+        file_paths = list(file_paths)
+
+        add_source = messagebox.askyesno(
+            "Source Column",
+            f"Add a '{SOURCE_COLUMN}' column recording which file each row came from?"
+        )
+        schema = UnionSchema(file_paths, base=self.data, source_column=SOURCE_COLUMN if add_source else None)
+        was_out_of_core = self._is_out_of_core()
+        out_of_core = was_out_of_core or schema.estimated_bytes > DEFAULT_MEMORY_BUDGET
+
+        data = self.data
+        base_name = os.path.basename(getattr(self, 'file_path', '') or 'loaded')
+
+        # Statistics of the loaded rows are kept and updated with the appended rows as they stream in
+        statistics = self.column_statistics.copy()
+        statistics.drop([
+            column for column in statistics.moments.index
+            if column not in schema.dtypes or not ptypes.is_numeric_dtype(schema.dtypes[column])
+        ])
+        appended = run_with_progress(
+            "Appending Files",
+            lambda report, cancel_event: union_files(
+                file_paths, schema, data, base_name, out_of_core, progress=report, cancel_event=cancel_event,
+                on_appended=statistics.append
+            )
+        )
+        appended = self._store_virtual_columns(appended, "Appending Files")
+        with job_scheduler().data_lock.write():
+            self.data = appended
+            self.column_statistics = statistics
+        messagebox.showinfo(
+            "Data Merging",
+            f"Appended {len(file_paths)} file(s) to the loaded data!\n"
+            f"Result: {len(self.data):,} rows x {len(self.data.columns):,} columns"
+            + ("\nThe result exceeds the memory budget and is stored out-of-core." if out_of_core and not was_out_of_core else "")
+        )
+        return True
+
     def data_merging(self):
         """Handles merging of the loaded data with another dataset selected by the user."""
     
         if self.data is not None:
             try:
+                # Step 1: Merge with a single file or with several files at once
+                merge_mode = single_select_from_dropdown(
+                    "Select Merge Mode",
+                    "What do you want to merge into the loaded data?",
+                    ["One File", "Multiple Files (N-Way Join)", "Append Files (Union)"]
+                )
+                if not merge_mode:
+                    return  # User clicked Cancel
+                if merge_mode == "Append Files (Union)":
+                    if self._append_files():
+                        self.preview_dataset()
+                    return
+                if merge_mode == "Multiple Files (N-Way Join)":
+                    if self._merge_many_files():
+                        self.preview_dataset()
+                    return
 
                 # Load the second file for merging
                 file_to_merge = filedialog.askopenfilename(
@@ -239,10 +1247,9 @@ class DataOperations:
                     return
 
                 try:
-                    if file_to_merge.endswith('.csv'):
-                        other_data = pd.read_csv(file_to_merge)
-                    elif file_to_merge.endswith('.xlsx'):
-                        other_data = pd.read_excel(file_to_merge)
+                    other_data = run_with_progress(
+                        "Loading File", lambda report, cancel_event: self._read_file(file_to_merge), determinate=False
+                    )
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to load file: {str(e)}")
                     return
@@ -257,31 +1264,33 @@ class DataOperations:
                 )
                 if not merge_choice:
                     return  # User clicked Back
-                
-                if merge_choice == "Concatenate (Side by Side)":
+
+                join_keys, expected_relationship = None, None
+                if merge_choice in JOIN_TYPES:
+                    join_keys, expected_relationship = self._ask_join_keys(other_data)
+                    if join_keys is None:
+                        return  # User clicked Cancel
+
+                if self._is_out_of_core():
+                    self._merge_out_of_core(other_data, merge_choice, join_keys)
+                elif merge_choice == "Concatenate (Side by Side)":
                     # Perform concatenation
                     # Ensure unique column names before concatenation
                     other_data.columns = [f"{col}_2" if col in self.data.columns else col for col in other_data.columns]
-                    self.data = pd.concat([self.data, other_data], axis=1, ignore_index=False)
+                    data = self.data
+                    self.data = run_with_progress(
+                        "Data Merging",
+                        lambda report, cancel_event: pd.concat([data, other_data], axis=1, ignore_index=False),
+                        determinate=False
+                    )
                     messagebox.showinfo(
                         "Data Merging",
                         "Data concatenated successfully side by side!"
                     )            
                 else:
-                    # Select Inner or Outer merge
-                    join_type = None
-                    if merge_choice == "Inner Merge":
-                        join_type = "inner"
-                    elif merge_choice == "Outer Merge":
-                        join_type = "outer"
-                    elif merge_choice == "Right Join":
-                        join_type = "right"
-                    elif merge_choice == "Left Join":
-                        join_type = "left"
-                     # Perform the merge
-                    merged_data = pd.merge(self.data, other_data, how=join_type)
-                    self.data = merged_data
-        
+                    join_type = JOIN_TYPES[merge_choice]
+                    if not self._join(other_data, join_type, join_keys, expected_relationship):
+                        return
                     messagebox.showinfo(
                         "Data Merging",
                         f"Data merged successfully with {join_type.title()} join!"
@@ -294,12 +1303,40 @@ class DataOperations:
             messagebox.showerror("Error", "No Data Loaded!")
         pass
 
+    def _derive_expression(self, numeric_cols):
+        """Adds a column computed from a formula over numeric columns; returns False on Cancel."""
+        column_list = ", ".join(f"`{col}`" for col in numeric_cols)
+        formula = simpledialog.askstring(
+            "Expression (Formula)",
+            "Enter a formula over the numeric columns, with column names in backticks.\n"
+            "Allowed: + - * / % **, comparisons, and/or/not, 'a if condition else b',\n"
+            f"where(), abs(), sqrt(), log(), exp() and other math functions.\n\n"
+            f"Example: 235.21 / `city-mpg`\n\nColumns: {column_list}"
+        )
+        if not formula:
+            return False
+        expression = compile_expression(formula, numeric_cols)  # Validates before anything is computed
+
+        derived_column_name = simpledialog.askstring(
+            "Derived Column Name",
+            "Enter a name for the new column:",
+            initialvalue=f"Derived_{formula.strip()}"[:60]
+        )
+        if not derived_column_name:
+            return False
+        self._add_column(derived_column_name, expression.evaluate, expression.input_columns)
+        messagebox.showinfo(
+            "Data Derivation",
+            f"A new derived column '{derived_column_name}' has been added."
+        )
+        return True
+
     def data_derivation(self):
         """Performs data derivation or custom aggregation based on user selection."""
         if self.data is not None:
             try:
                 # Step 1: Select numeric columns for derivation
-                numeric_cols = self.data.select_dtypes(include=['int64', 'float64']).columns
+                numeric_cols = self._numeric_columns()
                 if numeric_cols.empty:
                     messagebox.showerror("Error", "No numeric columns available for derivation.")
                     return
@@ -308,13 +1345,17 @@ class DataOperations:
                 derivation_type = select_from_dropdown(
                     "Select Derivation Type",
                     "Choose the type of derivation to perform:",
-                    ["Binary Operation (Two Columns)", "Custom Aggregation (Single Column)"]
+                    ["Binary Operation (Two Columns)", "Custom Aggregation (Single Column)", "Expression (Formula)"]
                 )
                 if not derivation_type:
                     return  # User clicked Back
 
+                if derivation_type == "Expression (Formula)":
+                    if not self._derive_expression(numeric_cols):
+                        return
+
                 # If Binary Operation
-                if derivation_type == "Binary Operation (Two Columns)":
+                elif derivation_type == "Binary Operation (Two Columns)":
                     column1 = select_from_dropdown(
                         "Select First Numeric Column",
                         "Choose the first numeric column for derivation:",
@@ -348,8 +1389,12 @@ class DataOperations:
                     # Perform the derivation
                     derived_column_name = f"Derived_{column1}_{derivation_operation}_{column2}"
                     try:
-                        self.data[derived_column_name] = eval(
-                            f"self.data[column1] {derivation_operation} self.data[column2]"
+                        # Widen compact dtypes first so int8/int16 arithmetic cannot overflow
+                        binary_operator = BINARY_OPERATORS[derivation_operation]
+                        self._add_column(
+                            derived_column_name,
+                            lambda frame: binary_operator(widen_numeric(frame[column1]), widen_numeric(frame[column2])),
+                            [column1, column2]
                         )
                         messagebox.showinfo(
                             "Data Derivation",
@@ -383,7 +1428,7 @@ class DataOperations:
                         # Perform the chosen aggregation
                         if aggregation_type == "Sum and Divide by 2":
                             derived_column_name = f"Derived_{column}_SumDiv2"
-                            self.data[derived_column_name] = self.data[column].sum() / 2
+                            self._add_scalar_column(derived_column_name, column, 'sum', divisor=2)
 
                         elif aggregation_type == "Operation with a Number":
                             # Select operation
@@ -406,15 +1451,20 @@ class DataOperations:
 
                             # Apply operation
                             derived_column_name = f"Derived_{column}_{operation}{number}"
-                            self.data[derived_column_name] = eval(f"self.data[column] {operation} number")
+                            binary_operator = BINARY_OPERATORS[operation]
+                            self._add_column(
+                                derived_column_name,
+                                lambda frame: binary_operator(widen_numeric(frame[column]), number),
+                                [column]
+                            )
 
                         elif aggregation_type == "Mean":
                             derived_column_name = f"Derived_{column}_Mean"
-                            self.data[derived_column_name] = self.data[column].mean()
+                            self._add_scalar_column(derived_column_name, column, 'mean')
 
                         elif aggregation_type == "Count":
                             derived_column_name = f"Derived_{column}_Count"
-                            self.data[derived_column_name] = self.data[column].count()
+                            self._add_scalar_column(derived_column_name, column, 'count')
 
                         # Notify user of success
                         messagebox.showinfo(
@@ -458,19 +1508,16 @@ class DataOperations:
                 selected_columns = multi_select_from_dropdown(
                     "Select Columns to Extract",
                     "Choose one or more columns to extract:",
-                    self.data.columns.tolist()
+                    self._column_names()
                 )
                 if not selected_columns:
                     messagebox.showwarning("Data Aggregation", "No columns selected.")
                     return
 
-                # Extract selected columns
-                extracted_data = self.data[selected_columns]
-
                 # Save extracted columns as a new dataset
-                save_path = save_to_file_dialog("Save Extracted Data", "extracted_data.csv")
+                save_path = save_to_file_dialog("Save Extracted Data", "extracted_data.csv", EXPORT_FILE_TYPES)
                 if save_path:
-                    extracted_data.to_csv(save_path, index=False)
+                    self._save("Save Extracted Data", save_path, columns=selected_columns)
                     messagebox.showinfo("Data Aggregation", "Columns extracted and saved successfully!")
 
             # Option 2: Group By and Aggregate
@@ -479,14 +1526,14 @@ class DataOperations:
                 grouping_columns = multi_select_from_dropdown(
                     "Select Grouping Columns",
                     "Choose one or more columns to group by:",
-                    self.data.columns.tolist()
+                    self._column_names()
                 )
                 if not grouping_columns:
                     messagebox.showwarning("Data Aggregation", "No grouping columns selected.")
                     return
 
                 # Step 3: Select numeric columns for aggregation
-                numeric_cols = self.data.select_dtypes(include=['int64', 'float64']).columns.tolist()
+                numeric_cols = self._numeric_columns().tolist()
                 if not numeric_cols:
                     messagebox.showerror("Error", "No numeric columns available for aggregation.")
                     return
@@ -501,12 +1548,13 @@ class DataOperations:
                     return
 
                 # Step 4: Define aggregation metrics for each numeric column
+                metric_options = MERGEABLE_METRICS
                 aggregation_selections = {}
                 for col in selected_numeric_cols:
                     metrics = multi_select_from_dropdown(
                         f"Select Aggregation Metrics for {col}",
                         f"Choose one or more metrics for {col}:",
-                        ['mean', 'sum', 'count', 'max', 'min', 'median', 'std']
+                        metric_options
                     )
                     if metrics:
                         aggregation_selections[col] = metrics
@@ -515,41 +1563,88 @@ class DataOperations:
                     messagebox.showerror("Error", "No aggregation metrics selected.")
                     return
 
-                # Step 5: Perform Group-By Aggregation
-                aggregated_data = self.data.groupby(grouping_columns).agg(aggregation_selections)
-
-                # Clean column names: Flatten MultiIndex
-                aggregated_data.columns = ['_'.join(col).strip() for col in aggregated_data.columns.values]
-                aggregated_data.reset_index(inplace=True)
+                # Step 5: Perform Group-By Aggregation in the background, reusing cached metrics of this data version
+                aggregated_data = run_with_progress(
+                    "Data Aggregation",
+                    lambda report, cancel_event: self.aggregation_cache.aggregate(
+                        self.data_version, grouping_columns, aggregation_selections,
+                        lambda missing: self._group_aggregate(grouping_columns, missing, report, cancel_event)
+                    ),
+                    determinate=self._is_out_of_core()
+                )
 
                 # Save the aggregated dataset
-                save_path = save_to_file_dialog("Save Aggregated Data", "aggregated_data.csv")
+                save_path = save_to_file_dialog("Save Aggregated Data", "aggregated_data.csv", EXPORT_FILE_TYPES)
                 if save_path:
-                    aggregated_data.to_csv(save_path, index=False)
+                    self._save("Save Aggregated Data", save_path, data=aggregated_data)
                     messagebox.showinfo("Data Aggregation", "Data aggregated and saved successfully!")
 
+        except OperationCancelled:
+            messagebox.showinfo("Data Aggregation", "Data aggregation was canceled.")
         except Exception as e:
             messagebox.showerror("Error", f"Data Aggregation Failed: {str(e)}")
 
     
 
+    def _group_aggregate(self, grouping_columns, aggregation_selections, progress=None, cancel_event=None):
+        """Computes a group-by aggregation, indexed by the group keys with flattened column_metric columns.
+
+        Out-of-core datasets show a progress dialog unless progress is given, i.e. the caller
+        already runs on a worker thread.
+        """
+        if self._is_out_of_core():
+            if progress is None:
+                aggregated_data = run_with_progress(
+                    "Data Aggregation",
+                    lambda report, cancel_event: self.data.groupby_agg(
+                        grouping_columns, aggregation_selections, progress=report, cancel_event=cancel_event
+                    )
+                )
+            else:
+                aggregated_data = self.data.groupby_agg(
+                    grouping_columns, aggregation_selections, progress=progress, cancel_event=cancel_event
+                )
+            return aggregated_data.set_index(grouping_columns)
+
+        # observed=True keeps categorical group keys from expanding to every category combination
+        source = self._frame(grouping_columns + list(aggregation_selections))
+        aggregated_data = source.groupby(grouping_columns, observed=True).agg(aggregation_selections)
+
+        # Clean column names: Flatten MultiIndex
+        aggregated_data.columns = ['_'.join(col).strip() for col in aggregated_data.columns.values]
+        return aggregated_data
+
     def descriptive_statistics(self):
         """Enhanced Descriptive Statistics displayed in a table."""
         if self.data is not None:
             try:
-                # Generate basic statistics
-                stats = self.data.describe()
-
-                # Calculate additional metrics
-                skewness = self.data.skew(numeric_only=True)
-                # kurtosis = self.data.kurtosis(numeric_only=True)
-
-                # Combine skewness and kurtosis with descriptive stats
-                stats.loc['skewness'] = skewness
-                # stats.loc['kurtosis'] = kurtosis
-
-                # Display the statistics in a table
-                show_stats_table(stats)
+                # Statistics come from cached per-column accumulators; only columns without them are scanned
+                out_of_core = self._is_out_of_core()
+
+                def compute(report, cancel_event):
+                    chunks = None
+                    if out_of_core:
+                        data = self.data
+                        dtypes = data.dtypes()
+                        columns = data.numeric_columns()
+                        chunks = lambda scan: data.iter_chunks(scan, report, cancel_event, "Computing statistics")
+                    else:
+                        # Virtual derived columns are included
+                        data = self._frame()
+                        dtypes = data.dtypes
+                        columns = data.select_dtypes(include='number').columns.tolist()
+                    categorical_columns = [
+                        col for col, dtype in dtypes.items()
+                        if ptypes.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype)
+                    ]
+                    statistics = self.column_statistics
+                    statistics.update_from(data, columns, categorical_columns, chunks)  # One pass for both tables
+                    return statistics.table(data, columns, chunks), statistics.categorical_table(data, categorical_columns, chunks)
+
+                stats, categorical = run_with_progress("Descriptive Statistics", compute, determinate=out_of_core)
+
+                # Display the statistics (with skewness, kurtosis and the categorical profile) in a table
+                show_stats_table(stats, categorical)
             except Exception as e:
                 messagebox.showerror("Error", f"Statistics Generation Failed: {str(e)}")
         else:
@@ -574,7 +1669,7 @@ class DataOperations:
                 x_axis_column = select_from_dropdown(
                     "Select X-axis Column",
                     "Choose a column for the X-axis:",
-                    self.data.columns
+                    self._column_names()
                 )
                 if not x_axis_column:
                     return  # User clicked Back
@@ -585,87 +1680,238 @@ class DataOperations:
                     y_axis_column = select_from_dropdown(
                         "Select Y-axis Column",
                         "Choose a column for the Y-axis:",
-                        self.data.columns
+                        self._column_names()
                     )
                     if not y_axis_column:
                         return  # User clicked Back
 
-                # Step 4: Generate the Visualization
-                plt.figure(figsize=(8, 6))
+                error_bars = None
                 if vis_type == "bar":
-                    sns.barplot(x=self.data[x_axis_column], y=self.data[y_axis_column])
-                elif vis_type == "scatter":
-                    sns.scatterplot(x=self.data[x_axis_column], y=self.data[y_axis_column])
-                elif vis_type == "histogram":
-                    sns.histplot(self.data[x_axis_column])
-                elif vis_type == "pie":
-                    # Pie chart requires the use of a single column
-                    # Selecting the values for the pie chart
-                    pie_values = self.data[x_axis_column].value_counts()
-                    plt.pie(pie_values, labels=pie_values.index, autopct='%1.1f%%', startangle=90)
-                    plt.axis('equal')  # Equal aspect ratio ensures the pie chart is circular
-                else:
-                    messagebox.showerror("Error", "Invalid Visualization Type!")
-                    return
+                    error_choice = select_from_dropdown(
+                        "Select Error Bars",
+                        "Choose the error bars to draw on each bar:",
+                        list(ERROR_BARS)
+                    )
+                    if not error_choice:
+                        return  # User clicked Back
+                    error_bars = ERROR_BARS.get(error_choice)
+
+                # Step 4: Prepare the chart data on a worker thread; only drawing runs on the Tk thread
+                draw = run_with_progress(
+                    "Data Visualization",
+                    lambda report, cancel_event: self._prepare_chart(
+                        vis_type, x_axis_column, y_axis_column, error_bars, report, cancel_event
+                    ),
+                    determinate=self._is_out_of_core()
+                )
 
-                plt.title(f"{vis_type.capitalize()} Visualization")
-                plt.show()
+                # Step 5: Draw into the embedded chart window, which is reused between plots
+                self.plot_window.show(f"{vis_type.capitalize()} Visualization", draw)
 
+            except OperationCancelled:
+                messagebox.showinfo("Canceled", "Data visualization was canceled.")
             except Exception as e:
                 messagebox.showerror("Error", f"Data Visualization Failed: {str(e)}")
         else:
             messagebox.showerror("Error", "No Data Loaded!")
 
+    def _prepare_chart(self, vis_type, x, y, error_bars, report, cancel_event):
+        """Computes everything a chart needs off the Tk thread; returns draw(ax) -> title note.
+
+        Bar and scatter charts scale with the categories and point budget, not the rows; the
+        other charts of out-of-core datasets are drawn from a uniform random sample of rows.
+        """
+        if vis_type == "bar":
+            # Means per category from a (memoized) group-by instead of bootstrapping every row
+            summary = self.aggregation_cache.aggregate(
+                self.data_version, [x], {y: ['mean', 'count', 'std']},
+                lambda missing: self._group_aggregate([x], missing, report, cancel_event)
+            )
+            return lambda ax: draw_bars(ax, summary, x, y, error_bars)
+        if vis_type == "scatter":
+            return self._prepare_scatter(x, y, report, cancel_event)
+
+        plot_data = self._frame([x])
+        if self._is_out_of_core():
+            plot_data = self.data.sample(columns=[x])
+        note = f"random sample of {len(plot_data):,} of {len(self.data):,} rows" if len(plot_data) < len(self.data) else ""
+
+        if vis_type == "histogram":
+            if ptypes.is_numeric_dtype(plot_data[x]) and not ptypes.is_bool_dtype(plot_data[x]):
+                counts, edges = histogram_counts(plot_data[x])
+
+                def draw_histogram(ax):
+                    ax.stairs(counts, edges, fill=True, alpha=0.75)
+                    ax.set_xlabel(x)
+                    ax.set_ylabel("Count")
+                    return note
+                return draw_histogram
+
+            def draw_categories(ax):
+                sns.histplot(plot_data[x], ax=ax)
+                return note
+            return draw_categories
+
+        if vis_type == "pie":
+            # Pie chart requires the use of a single column
+            # Selecting the values for the pie chart
+            pie_values = plot_data[x].value_counts()
+            pie_values = pie_values[pie_values > 0]  # Unused categories of compact columns
+
+            def draw_pie(ax):
+                ax.pie(pie_values, labels=pie_values.index, autopct='%1.1f%%', startangle=90)
+                ax.axis('equal')  # Equal aspect ratio ensures the pie chart is circular
+                return note
+            return draw_pie
+
+        raise ValueError("Invalid Visualization Type!")
+
+    def _prepare_scatter(self, x, y, report, cancel_event):
+        """Prepares a scatter plot whose drawing cost is bounded by POINT_BUDGET.
+
+        Up to the budget every point is drawn. Beyond it, sorted x values are downsampled with
+        LTTB and anything else is drawn as a density grid over all rows (a random sample when
+        a column is not numeric).
+        """
+        rows = len(self.data)
+        numeric = all(col in self._numeric_columns() for col in (x, y))
+        out_of_core = self._is_out_of_core()
+
+        if rows <= POINT_BUDGET or not numeric:
+            if out_of_core:
+                plot_data = self.data.sample(POINT_BUDGET, columns=[x, y])
+            else:
+                plot_data = self._frame([x, y])
+                if len(plot_data) > POINT_BUDGET:
+                    plot_data = plot_data.sample(POINT_BUDGET, random_state=0)
+            note = "" if len(plot_data) == rows else f"random sample of {len(plot_data):,} of {rows:,} rows"
+
+            def draw_points(ax):
+                sns.scatterplot(x=plot_data[x], y=plot_data[y], ax=ax)
+                return note
+            return draw_points
+
+        if not out_of_core:
+            plot_data = self._frame([x, y])
+            if plot_data[x].is_monotonic_increasing:
+                points = plot_data.iloc[lttb_downsample(plot_data[x], plot_data[y])]
+
+                def draw_line(ax):
+                    ax.plot(points[x], points[y], marker=".", markersize=3, linewidth=0.5)
+                    ax.set_xlabel(x)
+                    ax.set_ylabel(y)
+                    return f"LTTB downsampled to {len(points):,} of {rows:,} points"
+                return draw_line
+
+        def chunks(label):
+            if out_of_core:
+                return self.data.iter_chunks([x, y], report, cancel_event, label)
+            return [plot_data]
+
+        # Ranges come from the cached column statistics when they are known
+        known = self.column_statistics.moments
+        if x in known.index and y in known.index:
+            extent = [known.loc[x, "min"], known.loc[x, "max"], known.loc[y, "min"], known.loc[y, "max"]]
+        else:
+            extent = density_extent(chunks("Scanning ranges"), x, y)
+        counts, x_edges, y_edges = density_grid(chunks("Binning"), x, y, extent)
+
+        def draw_grid(ax):
+            draw_density(ax, counts, x_edges, y_edges, x, y)
+            return f"density of {rows:,} rows"
+        return draw_grid
 
     def preview_dataset(self):
-        """Preview the loaded dataset in a scrollable table."""
+        """Preview the loaded dataset in a scrollable table.
+
+        Only the visible rows (plus a small buffer) are fetched and shown, so opening a preview
+        costs the same for any number of rows. The window keeps showing (and filtering) the
+        data as it was when it opened, even after a later operation replaces it.
+        """
         if self.data is not None:
-            preview_window = tk.Toplevel(self.root)
-            preview_window.title("Dataset Preview")
-            preview_window.geometry("850x500")
-            preview_window.resizable(True, True)
-
-            # Create a Frame to hold the Treeview and scrollbars
-            frame = tk.Frame(preview_window)
-            frame.pack(fill=tk.BOTH, expand=True)
-
-            # Create a Treeview widget for displaying the dataset
-            tree = ttk.Treeview(frame, columns=list(self.data.columns), show="headings")
-            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-            # Add column headers
-            for column in self.data.columns:
-                tree.heading(column, text=column)
-                tree.column(column, width=100, anchor="center")
-
-            # Add rows to the Treeview
-            for index, row in self.data.iterrows():
-                tree.insert("", "end", values=row.tolist())
-
-            # Add a vertical scrollbar
-            v_scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-            v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            tree.configure(yscrollcommand=v_scrollbar.set)
-
-            # Add a horizontal scrollbar
-            h_scrollbar = ttk.Scrollbar(preview_window, orient="horizontal", command=tree.xview)
-            h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-            tree.configure(xscrollcommand=h_scrollbar.set)
+            # Snapshot of the data, its virtual columns and its version for the window's lifetime
+            data = self.data
+            version = self.data_version
+            virtual_columns = self.virtual_columns.copy()
+            column_names = self._column_names()
+            filter_index = ColumnFilterIndex()
+
+            preview_title = f"Dataset Preview ({len(data):,} rows)"
+            if isinstance(data, ChunkedDataset):
+                preview_title = f"Dataset Preview ({len(data):,} rows, out-of-core)"
+                fetch_rows = data.take
+            elif len(virtual_columns):
+                fetch_rows = lambda positions: virtual_columns.window(data, positions)
+            else:
+                fetch_rows = lambda positions: data.iloc[positions]
+
+            show_virtual_table(
+                preview_title, column_names, len(data), fetch_rows, parent=self.root,
+                filter_rows=lambda text: self._filter_rows(text, data, version, virtual_columns, column_names, filter_index)
+            )
 
         else:
             messagebox.showerror("Error", "No data loaded to preview!")
         pass
 
+    def _filter_rows(self, text, data, version, virtual_columns, column_names, filter_index):
+        """Positions of the rows of a preview's data matching its filter, or None after showing the error.
+
+        In memory the filter is answered from a per-column filter index (built on a worker
+        thread the first time a column is filtered): the shared one while the preview still
+        shows the current data version, else the preview's own filter_index. Out-of-core
+        datasets are scanned chunk by chunk.
+        """
+        def matching_rows(report, cancel_event):
+            if isinstance(data, ChunkedDataset):
+                return scan_matching_rows(data.iter_chunks(compiled.columns, report, cancel_event, "Filtering"), compiled)
+            index = self.filter_index if self.data_version == version else filter_index
+            frame = virtual_columns.materialize(data, compiled.columns) if len(virtual_columns) else data
+            return index.matching_rows(frame, compiled)
+
+        try:
+            compiled = compile_filter(text, column_names)
+            return run_with_progress("Filtering", matching_rows, determinate=isinstance(data, ChunkedDataset))
+        except OperationCancelled:
+            return None
+        except Exception as e:
+            messagebox.showerror("Error", f"Filter Failed: {str(e)}")
+            return None
+
+    def _save(self, title, save_path, data=None, columns=None):
+        """Writes the loaded data (only `columns` when given), or another frame, to save_path.
+
+        The file is written chunk by chunk on a worker thread behind a progress dialog, in the
+        format of its extension, and only replaces save_path once it is complete.
+        """
+        if data is None and self._is_out_of_core():
+            return run_with_progress(
+                title, lambda report, cancel_event: self.data.save(save_path, columns, report, cancel_event)
+            )
+        def save(report, cancel_event):
+            frame = data
+            if frame is None:
+                frame = self._frame(columns)
+                if columns is not None:
+                    frame = frame[columns]
+            return write_dataset(
+                frame_chunks(frame), save_path, len(frame), report, cancel_event, schema_chunks=lambda: [frame]
+            )
+
+        return run_with_progress(title, save)
+
     def save_data(self):
         if self.data is not None:
             save_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("CSV Files", "*.csv")]
+                filetypes=EXPORT_FILE_TYPES
             )
             if save_path:
                 try:
-                    self.data.to_csv(save_path, index=False)
+                    self._save("Save Data", save_path)
                     messagebox.showinfo("Success", "Data Saved Successfully!")
+                except OperationCancelled:
+                    messagebox.showinfo("Save Data", "Saving was canceled; no file was written.")
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to save file: {str(e)}")
         else:
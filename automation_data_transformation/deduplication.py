@@ -0,0 +1,144 @@
+"""
+Deduplication Helpers
+---------------------
+A per-column 64-bit hash index that answers "which rows are duplicates on columns X, Y"
+by combining cached column hashes instead of re-comparing full rows on every call.
+"""
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+
+KEEP_POLICIES = {
+    "Keep First": "first",
+    "Keep Last": "last",
+    "Keep None (Drop All Copies)": False,
+}
+
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)  # 64-bit FNV prime
+
+
+class ColumnHashIndex:
+    """Caches one uint64 hash array per column of a DataFrame.
+
+    Hashes are built lazily the first time a column is used and reused until the column is
+    invalidated, so repeated deduplication passes over different key sets only pay for
+    combining the cached arrays; the resulting duplicate masks are cached per key set too.
+    Rows with equal hashes are only candidates: they are compared by value before being
+    reported as duplicates, which is cheap because candidates are usually a small subset.
+    """
+
+    def __init__(self):
+        self._hashes = {}
+        self._masks = {}  # (ordered key columns, keep) -> duplicate mask
+        self._rows = None
+
+    def invalidate(self, columns=None):
+        """Drops cached hashes for the given columns, or for every column when columns is None."""
+        if columns is None:
+            self._hashes.clear()
+            self._masks.clear()
+            self._rows = None
+        else:
+            for column in columns:
+                self._hashes.pop(column, None)
+            self._masks = {key: mask for key, mask in self._masks.items() if not set(key[0]) & set(columns)}
+
+    def column_hashes(self, data, column):
+        """Returns the cached hash array of one column, building it if needed."""
+        if self._rows != len(data):
+            self.invalidate()  # Row count changed; every cached array is stale
+            self._rows = len(data)
+        hashes = self._hashes.get(column)
+        if hashes is None:
+            hashes = pd.util.hash_pandas_object(data[column], index=False).to_numpy()
+            self._hashes[column] = hashes
+        return hashes
+
+    @staticmethod
+    def _ordered(data, columns):
+        # Combine in column order so that X,Y and Y,X share the same key
+        wanted = set(columns)
+        return tuple(column for column in data.columns if column in wanted)
+
+    def row_hashes(self, data, columns):
+        """Combines the cached column hashes of `columns` into one hash per row."""
+        ordered = self._ordered(data, columns)
+        combined = np.zeros(len(data), dtype=np.uint64)
+        for column in ordered:
+            combined = (combined * _HASH_MULTIPLIER) ^ self.column_hashes(data, column)
+        return combined
+
+    def duplicated(self, data, columns, keep="first"):
+        """Boolean mask of duplicate rows on `columns`, like DataFrame.duplicated(subset, keep)."""
+        key = (self._ordered(data, columns), keep)
+        mask = self._masks.get(key) if self._rows == len(data) else None
+        if mask is None:
+            # Every true duplicate shares its hash with the other copies; verify the candidates by value
+            candidates = np.flatnonzero(pd.Series(self.row_hashes(data, columns)).duplicated(keep=False).to_numpy())
+            mask = np.zeros(len(data), dtype=bool)
+            if len(candidates):
+                mask[candidates] = data.iloc[candidates][list(key[0])].duplicated(keep=keep).to_numpy()
+            self._masks[key] = mask
+        return pd.Series(mask, index=data.index)
+
+
+class DuplicateGroupReport:
+    """Vectorized summary of duplicate groups built from per-row hashes.
+
+    Rows sharing a hash form a group; only groups with more than one row are reported.
+    Groups are numbered in order of first appearance. Building the report is a few O(n)
+    NumPy passes, and fetching any page of groups afterwards costs only the page size.
+    """
+
+    def __init__(self, row_hashes, sample_size=5):
+        self.sample_size = sample_size
+        codes, _ = pd.factorize(row_hashes)
+        sizes = np.bincount(codes) if len(codes) else np.zeros(0, dtype=np.int64)
+        # factorize numbers groups by first appearance, so first-occurrence positions line up with codes
+        first_positions = np.flatnonzero(~pd.Series(codes).duplicated().to_numpy())
+
+        duplicate_codes = np.flatnonzero(sizes > 1)
+        self.group_sizes = sizes[duplicate_codes]
+        self.first_positions = first_positions[duplicate_codes]
+
+        # Positions of every row that belongs to a duplicate group, ordered group by group
+        member_positions = np.flatnonzero(sizes[codes] > 1) if len(codes) else np.zeros(0, dtype=np.int64)
+        order = np.argsort(codes[member_positions], kind="stable")
+        self._member_positions = member_positions[order]
+        self._group_offsets = np.concatenate([[0], np.cumsum(self.group_sizes)])
+
+    @property
+    def group_count(self):
+        return len(self.group_sizes)
+
+    @property
+    def duplicate_rows(self):
+        """Rows beyond the first one in every group."""
+        return int(self.group_sizes.sum() - self.group_count)
+
+    def page(self, data, columns, start, stop):
+        """Returns groups [start, stop) as a DataFrame with their key values and a capped row sample."""
+        stop = min(stop, self.group_count)
+        rows = []
+        for group in range(start, stop):
+            offset = self._group_offsets[group]
+            sample = self._member_positions[offset:offset + min(self.group_sizes[group], self.sample_size)]
+            sample_labels = ", ".join(_row_label(label) for label in data.index[sample])
+            if self.group_sizes[group] > self.sample_size:
+                sample_labels += ", ..."
+            rows.append({
+                "Group": group + 1,
+                "Size": int(self.group_sizes[group]),
+                "First Row": _row_label(data.index[self.first_positions[group]]),
+                "Sample Rows": sample_labels,
+            })
+        page = pd.DataFrame(rows, columns=["Group", "Size", "First Row", "Sample Rows"])
+        key_values = data.iloc[self.first_positions[start:stop]][list(columns)].reset_index(drop=True)
+        return pd.concat([page, key_values.astype(str)], axis=1)
+
+
+def _row_label(label):
+    """Formats an index label as the 1-based row number shown in the previews."""
+    return str(label + 1) if isinstance(label, (int, np.integer)) else str(label)
@@ -0,0 +1,241 @@
+"""
+Dtype Utilities
+---------------
+Helpers for shrinking the memory footprint of loaded datasets: downcasting numeric columns
+to the smallest dtype that holds their values exactly and converting low-cardinality text
+columns to pandas categoricals, plus before/after memory reporting.
+
+Format revisioning also lives here: whole-number float columns become the smallest
+(nullable, when they have gaps) integer dtype, and numbers stored as text are parsed.
+"""
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+
+DEFAULT_CATEGORY_RATIO = 0.5  # Convert text columns whose distinct/total ratio is at most this
+NUMERIC_TEXT_SAMPLE = 1000  # Text columns are only fully parsed when this many leading values parse
+_INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def column_memory(data):
+    """Returns the deep memory usage of every column in bytes (index excluded)."""
+    return data.memory_usage(deep=True, index=False)
+
+
+def downcast_numeric(series):
+    """Returns series in the smallest numeric dtype that represents every value exactly."""
+    if ptypes.is_bool_dtype(series) or not ptypes.is_numeric_dtype(series):
+        return series
+    if ptypes.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast="integer")
+    if ptypes.is_float_dtype(series) and series.dtype != np.float32:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        # Only keep float32 when the round trip is lossless
+        if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+    return series
+
+
+def should_categorize(series, max_ratio=DEFAULT_CATEGORY_RATIO):
+    """Returns True for text columns with few enough distinct values to benefit from category."""
+    if isinstance(series.dtype, pd.CategoricalDtype) or len(series) == 0:
+        return False
+    if not (ptypes.is_object_dtype(series) or ptypes.is_string_dtype(series)):
+        return False
+    return series.nunique(dropna=True) <= max_ratio * len(series)
+
+
+def compact_dtypes(data, category_ratio=DEFAULT_CATEGORY_RATIO):
+    """Downcasts numeric columns and categorizes low-cardinality text columns.
+
+    :return: (compacted DataFrame, report DataFrame) where the report lists every column with
+             its dtype and memory usage before and after compaction.
+    """
+    before_memory = column_memory(data)
+    before_dtypes = data.dtypes.astype(str)
+
+    compacted = {}
+    for column in data.columns:
+        series = data[column]
+        if should_categorize(series, category_ratio):
+            compacted[column] = series.astype("category")
+        else:
+            compacted[column] = downcast_numeric(series)
+    result = pd.DataFrame(compacted, index=data.index, columns=data.columns)
+
+    after_memory = column_memory(result)
+    report = pd.DataFrame({
+        "before_dtype": before_dtypes,
+        "after_dtype": result.dtypes.astype(str),
+        "before_bytes": before_memory,
+        "after_bytes": after_memory,
+    })
+    return result, report
+
+
+def integer_dtype_for(minimum, maximum, nullable=False):
+    """Returns the smallest signed integer dtype (e.g. int8, or Int8 when nullable) holding [minimum, maximum]."""
+    for integer_type in _INTEGER_TYPES:
+        info = np.iinfo(integer_type)
+        if info.min <= minimum and maximum <= info.max:
+            name = np.dtype(integer_type).name
+            return name.capitalize() if nullable else name
+    return None
+
+
+def whole_number_summary(values):
+    """Inspects a float buffer with vectorized checks.
+
+    :return: (all present values are whole numbers, any value missing, min, max)
+    """
+    present = ~np.isnan(values)
+    has_missing = not present.all()
+    values = values[present] if has_missing else values
+    if len(values) == 0:
+        return False, has_missing, None, None
+    whole = bool(np.isfinite(values).all() and (np.mod(values, 1) == 0).all())
+    return whole, has_missing, values.min(), values.max()
+
+
+def parse_numeric_text(series, sample_size=NUMERIC_TEXT_SAMPLE):
+    """Returns series parsed as float64 when every non-missing value is a number stored as text, else None.
+
+    A leading sample is parsed first so ordinary text columns are rejected cheaply.
+    """
+    if not (ptypes.is_object_dtype(series) or ptypes.is_string_dtype(series)):
+        return None
+    present = series.dropna()
+    if present.empty:
+        return None
+    if pd.to_numeric(present.iloc[:sample_size].astype(str).str.strip(), errors="coerce").isna().any():
+        return None
+    parsed = pd.to_numeric(present.astype(str).str.strip(), errors="coerce")
+    if parsed.isna().any():
+        return None
+    return parsed.astype("float64").reindex(series.index)
+
+
+def revise_numeric(series):
+    """Returns (revised series, 'int' or 'float'), converting to the narrowest exact dtype.
+
+    Integer columns are downcast; float columns holding only whole numbers become integers,
+    nullable (Int8..Int64) when they contain missing values; other floats are kept as float,
+    narrowed to float32 only when that is lossless.
+    """
+    if ptypes.is_integer_dtype(series):
+        if isinstance(series.dtype, np.dtype):
+            return pd.to_numeric(series, downcast="integer"), 'int'
+        present = series.dropna()
+        if present.empty:
+            return series, 'int'
+        return series.astype(integer_dtype_for(present.min(), present.max(), nullable=True)), 'int'
+
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    whole, has_missing, minimum, maximum = whole_number_summary(values)
+    target = integer_dtype_for(minimum, maximum, has_missing) if whole else None
+    if target is not None:
+        if has_missing:
+            return pd.Series(pd.array(values, dtype="Float64"), index=series.index, name=series.name).astype(target), 'int'
+        return pd.Series(values.astype(target), index=series.index, name=series.name), 'int'
+    if not ptypes.is_float_dtype(series) or not isinstance(series.dtype, np.dtype):
+        series = pd.Series(values, index=series.index, name=series.name)
+    return downcast_numeric(series), 'float'
+
+
+def revise_formats(data, parse_text=True):
+    """Revises every numeric column (and, when parse_text is set, numbers stored as text).
+
+    :return: (revised DataFrame, report DataFrame in the compact_dtypes format plus a 'kind'
+             column naming the target type of every revised column)
+    """
+    before_memory = column_memory(data)
+    before_dtypes = data.dtypes.astype(str)
+
+    revised = data.copy(deep=False)
+    kinds = {}
+    for position, column in enumerate(data.columns):
+        series = data.iloc[:, position]
+        if ptypes.is_bool_dtype(series):
+            continue
+        if not ptypes.is_numeric_dtype(series):
+            series = parse_numeric_text(series) if parse_text else None
+            if series is None:
+                continue
+        revised_series, kinds[column] = revise_numeric(series)
+        revised.isetitem(position, revised_series)
+
+    report = pd.DataFrame({
+        "before_dtype": before_dtypes,
+        "after_dtype": revised.dtypes.astype(str),
+        "before_bytes": before_memory,
+        "after_bytes": column_memory(revised),
+        "kind": pd.Series(kinds, dtype=object),
+    }).loc[list(kinds)]
+    return revised, report
+
+
+def format_memory_report(report, max_rows=20):
+    """Formats a compact_dtypes report as text for a dialog, largest savings first."""
+    total_before = report["before_bytes"].sum()
+    total_after = report["after_bytes"].sum()
+    saved = total_before - total_after
+    ratio = total_before / total_after if total_after else 1.0
+
+    lines = [
+        f"Memory Before: {total_before / 2**20:,.2f} MB",
+        f"Memory After: {total_after / 2**20:,.2f} MB",
+        f"Saved: {saved / 2**20:,.2f} MB ({ratio:.1f}x smaller)",
+        "",
+    ]
+    changed = report[report["before_dtype"] != report["after_dtype"]]
+    changed = changed.assign(saved=changed["before_bytes"] - changed["after_bytes"]).sort_values("saved", ascending=False)
+    for column, row in changed.head(max_rows).iterrows():
+        lines.append(
+            f"{column}: {row['before_dtype']} -> {row['after_dtype']} "
+            f"({row['before_bytes'] / 1024:,.1f} KB -> {row['after_bytes'] / 1024:,.1f} KB)"
+        )
+    if len(changed) > max_rows:
+        lines.append(f"... and {len(changed) - max_rows} more columns")
+    if changed.empty:
+        lines.append("No columns could be made smaller.")
+    return "\n".join(lines)
+
+
+def widen_numeric(series):
+    """Returns a numeric series as int64/float64 so arithmetic on compact dtypes cannot overflow."""
+    if ptypes.is_bool_dtype(series):
+        return series
+    if ptypes.is_integer_dtype(series):
+        # Nullable Int* columns keep their missing values as Int64
+        return series.astype("int64" if isinstance(series.dtype, np.dtype) else "Int64")
+    if ptypes.is_float_dtype(series):
+        return series.astype("float64")
+    return series
+
+
+def conform_dtypes(data, dtypes):
+    """Casts the columns of data to dtypes (a column -> dtype mapping), e.g. a partition to a widened schema.
+
+    Columns widened to object hold their non-missing values as text, so a 1 read as int64
+    in one partition and a "1" read as text in another stay the same value.
+    """
+    converted = {}
+    for column in data.columns:
+        target = dtypes.get(column)
+        series = data[column]
+        if target is None or series.dtype == target:
+            continue
+        if ptypes.is_object_dtype(target):
+            converted[column] = series.astype(object).where(series.isna(), series.astype(str))
+        else:
+            converted[column] = series.astype(target)
+    if not converted:
+        return data
+    data = data.copy(deep=False)
+    for column, values in converted.items():
+        data[column] = values
+    return data
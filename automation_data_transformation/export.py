@@ -0,0 +1,217 @@
+"""
+Dataset Export
+--------------
+Writes a dataset chunk by chunk to CSV (plain, gzip- or zstd-compressed), Parquet,
+Feather or Excel, so exporting never needs more memory than one chunk and can report
+progress and be canceled between chunks.
+
+Every export is atomic: the output is written to a temporary file next to the target and
+renamed over it only after the last chunk was written and flushed, so a crash or a
+cancel never leaves a half-written file behind (an existing file stays untouched).
+
+The format follows the file extension; Parquet, Feather and zstd need pyarrow. Parquet and
+Feather files have one schema for all chunks, so it is worked out before the first chunk
+is written: the chunks' schemas are unified with type promotion (int64 and float64 give
+float64, a column that is empty in one chunk takes the type of the others).
+"""
+
+# Standard Libraries
+import gzip
+import os
+import tempfile
+
+# Third-party Libraries
+import numpy as np
+
+from cancellation import OperationCancelled
+from file_cache import PARQUET_AVAILABLE
+
+if PARQUET_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+EXPORT_CHUNK_ROWS = 100_000  # In-memory frames are written in slices of this many rows
+EXCEL_MAX_ROWS = 1_048_575  # Worksheet rows below the header
+EXPORT_FILE_TYPES = [
+    ("CSV Files", "*.csv"),
+    ("CSV Files, gzip-compressed", "*.csv.gz"),
+    ("CSV Files, zstd-compressed", "*.csv.zst"),
+    ("Parquet Files", "*.parquet"),
+    ("Feather Files", "*.feather"),
+    ("Excel Files", "*.xlsx"),
+]
+
+_UMASK = os.umask(0)  # Read once so exported files get the permissions of a normally created file
+os.umask(_UMASK)
+
+
+def export_format(save_path):
+    """Returns the export format of a path from its extension ("csv" when unknown)."""
+    name = save_path.lower()
+    for suffix, file_format in ((".csv.gz", "csv.gz"), (".gz", "csv.gz"), (".csv.zst", "csv.zst"), (".zst", "csv.zst"),
+                                (".parquet", "parquet"), (".feather", "feather"), (".arrow", "feather"),
+                                (".xlsx", "xlsx")):
+        if name.endswith(suffix):
+            return file_format
+    return "csv"
+
+
+def frame_chunks(data, rows=EXPORT_CHUNK_ROWS):
+    """Splits an in-memory DataFrame into consecutive slices (views, not copies)."""
+    for start in range(0, len(data), rows):
+        yield data.iloc[start:start + rows]
+    if not len(data):
+        yield data
+
+
+class _CsvWriter:
+    def __init__(self, path, compression):
+        if compression == "gzip":
+            self.handle = gzip.open(path, "wb", compresslevel=6)
+        elif compression == "zstd":
+            self.handle = pa.CompressedOutputStream(path, "zstd")
+        else:
+            self.handle = open(path, "wb")
+        self.header = True
+
+    def write(self, chunk):
+        self.handle.write(chunk.to_csv(index=False, header=self.header).encode("utf-8"))
+        self.header = False
+
+    def close(self):
+        self.handle.close()
+
+    abort = close
+
+
+def arrow_schema(chunks):
+    """Arrow schema able to hold every chunk: the chunk schemas unified with type promotion."""
+    schema = None
+    for chunk in chunks:
+        chunk_schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+        schema = chunk_schema if schema is None else pa.unify_schemas(
+            [schema, chunk_schema], promote_options="permissive"
+        )
+    return schema
+
+
+class _ArrowWriter:
+    """Parquet or Feather (Arrow IPC) writer; without a schema the first chunk fixes it."""
+
+    def __init__(self, path, file_format, schema=None):
+        self.path = path
+        self.file_format = file_format
+        self.writer = None
+        self.schema = schema
+
+    def write(self, chunk):
+        if self.writer is None:
+            table = pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+            self.schema = table.schema
+            if self.file_format == "parquet":
+                self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+            else:
+                options = pa.ipc.IpcWriteOptions(compression="lz4")
+                self.writer = pa.ipc.new_file(self.path, self.schema, options=options)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    abort = close
+
+
+class _ExcelWriter:
+    """Streams rows into a write-only openpyxl workbook (rows are not kept as cell objects)."""
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Sheet1")
+        self.rows = 0
+        self.header = True
+
+    def write(self, chunk):
+        if self.header:
+            self.sheet.append([str(column) for column in chunk.columns])
+            self.header = False
+        self.rows += len(chunk)
+        if self.rows > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel worksheets hold at most {EXCEL_MAX_ROWS:,} rows; choose CSV, Parquet or Feather.")
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False):
+            self.sheet.append([value.item() if isinstance(value, np.generic) else value for value in row])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+    def abort(self):
+        pass  # Nothing is written before close()
+
+
+def _open_writer(path, file_format, schema=None):
+    if file_format in ("parquet", "feather", "csv.zst") and not PARQUET_AVAILABLE:
+        raise ValueError(f"Saving as {file_format} requires pyarrow (pip install pyarrow).")
+    if file_format == "csv.gz":
+        return _CsvWriter(path, "gzip")
+    if file_format == "csv.zst":
+        return _CsvWriter(path, "zstd")
+    if file_format in ("parquet", "feather"):
+        return _ArrowWriter(path, file_format, schema)
+    if file_format == "xlsx":
+        return _ExcelWriter(path)
+    return _CsvWriter(path, None)
+
+
+def write_dataset(chunks, save_path, total_rows=None, progress=None, cancel_event=None, schema_chunks=None):
+    """Writes a stream of DataFrame chunks to save_path atomically, in the format of its extension.
+
+    :param total_rows: rows in all chunks together, used for progress fractions
+    :param progress: progress(fraction, status_text) called after every chunk
+    :param schema_chunks: callable returning frames that together show every column's values
+        (e.g. the whole frame, or the chunks again); Parquet and Feather take their schema
+        from them instead of from the first chunk
+    """
+    save_path = os.path.abspath(save_path)
+    file_format = export_format(save_path)
+    handle, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(save_path), prefix=f".{os.path.basename(save_path)}.", suffix=".tmp"
+    )
+    os.close(handle)
+    try:
+        schema = None
+        if file_format in ("parquet", "feather") and PARQUET_AVAILABLE and schema_chunks is not None:
+            if progress is not None:
+                progress(None, "Saving: checking column types")
+            schema = arrow_schema(schema_chunks())
+        writer = _open_writer(temporary_path, file_format, schema)
+        written = 0
+        try:
+            for chunk in chunks:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled("Save canceled by the user.")
+                writer.write(chunk)
+                written += len(chunk)
+                if progress is not None:
+                    fraction = min(written / total_rows, 1.0) if total_rows else None
+                    progress(fraction, f"Saving: {written:,} rows written")
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+
+        # Make the data durable before the rename publishes it, with the permissions of a new file
+        with open(temporary_path, "rb+") as written_file:
+            os.fsync(written_file.fileno())
+        os.chmod(temporary_path, 0o666 & ~_UMASK)
+        os.replace(temporary_path, save_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return written
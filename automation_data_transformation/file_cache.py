@@ -0,0 +1,157 @@
+"""
+Columnar File Cache
+-------------------
+Transparent on-disk cache for uploaded CSV/XLSX files. The first time a file is parsed a
+columnar copy (Parquet when pyarrow is installed, pickle otherwise) is written to the cache
+directory; later loads of the same path with the same size and modification time read the
+copy instead of re-parsing the source. The cache is bounded in size with LRU eviction.
+"""
+
+# Standard Libraries
+import hashlib
+import os
+import threading
+
+# Third-party Libraries
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (only needed for Parquet support)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "DATA_TOOLKIT_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "data_transformation_toolkit")
+)
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+
+def write_frame(data, path):
+    """Writes a DataFrame to a Parquet (.parquet) or pickle (.pkl) file."""
+    if path.endswith(".parquet"):
+        data.to_parquet(path)
+    else:
+        data.to_pickle(path)
+
+
+def read_frame(path):
+    """Reads a DataFrame written by write_frame."""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+class FileCache:
+    """Size-bounded LRU cache of parsed files, keyed by absolute path, size and mtime."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _entry_prefix(self, file_path):
+        """Prefix shared by every cached version of the same source path."""
+        return hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+
+    def _entry_stem(self, file_path):
+        """Cache file name stem; changes whenever the source file's size or mtime changes."""
+        stat = os.stat(file_path)
+        version = hashlib.sha1(f"{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")).hexdigest()[:16]
+        return f"{self._entry_prefix(file_path)}_{version}"
+
+    def _entries(self):
+        """Lists cached files as (path, size, last_access) tuples."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith("."):
+                continue  # Temp file of a write in progress
+            if name.endswith((".parquet", ".pkl")) and os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, file_path):
+        """Returns the cached DataFrame for file_path, or None when there is no valid entry."""
+        stem = self._entry_stem(file_path)
+        with self._lock:
+            for extension in (".parquet", ".pkl"):
+                path = os.path.join(self.cache_dir, stem + extension)
+                if os.path.isfile(path):
+                    try:
+                        data = read_frame(path)
+                    except Exception:
+                        os.remove(path)  # Corrupt entry; fall back to parsing the source
+                        return None
+                    os.utime(path)  # Mark as most recently used
+                    return data
+        return None
+
+    def put(self, file_path, data):
+        """Stores a parsed DataFrame for file_path and evicts least recently used entries."""
+        stem = self._entry_stem(file_path)
+        prefix = self._entry_prefix(file_path)
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # Drop stale versions of the same source file
+            for path, _, _ in self._entries():
+                if os.path.basename(path).startswith(prefix + "_"):
+                    os.remove(path)
+
+            path = self._store(stem, data)
+            if path is not None:
+                self._evict()
+
+    def _store(self, stem, data):
+        """Writes data to a temp file and renames it into place so readers never see partial entries."""
+        extensions = [".parquet", ".pkl"] if PARQUET_AVAILABLE else [".pkl"]
+        for extension in extensions:
+            path = os.path.join(self.cache_dir, stem + extension)
+            temp_path = os.path.join(self.cache_dir, f".{stem}.tmp{extension}")
+            try:
+                write_frame(data, temp_path)
+                os.replace(temp_path, path)
+                return path
+            except Exception:
+                # e.g. mixed-type object columns that Parquet cannot represent; try the next format
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return None
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        while entries and total > self.max_bytes:
+            path, size, _ = entries.pop(0)
+            os.remove(path)
+            total -= size
+
+    def load(self, file_path, reader):
+        """Returns the cached copy of file_path, or parses it with reader(file_path) and caches it."""
+        data = self.get(file_path)
+        if data is None:
+            data = reader(file_path)
+            try:
+                self.put(file_path, data)
+            except OSError:
+                pass  # Caching is best effort; never fail a load because the cache is unwritable
+        return data
+
+    def size(self):
+        """Returns the total size of the cache in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Removes every cached entry and returns the number of bytes freed."""
+        with self._lock:
+            freed = 0
+            for path, size, _ in self._entries():
+                os.remove(path)
+                freed += size
+            return freed
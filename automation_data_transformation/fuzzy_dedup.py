@@ -0,0 +1,239 @@
+"""
+Fuzzy Deduplication
+-------------------
+Near-duplicate detection for rows that differ only by spelling (``alfa-romero`` vs
+``alfa-romeo``) or by floating point noise.
+
+Rows are first grouped into candidate blocks, either by normalized key columns or by
+MinHash/LSH signatures of their text, and pairs are only scored inside each block. Scoring
+uses string similarity for text columns and a relative tolerance for numeric columns.
+Matched pairs are then merged into clusters, so A~B and B~C put A, B and C in one group.
+"""
+
+# Standard Libraries
+import difflib
+import zlib
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from cancellation import OperationCancelled
+
+
+DEFAULT_SIMILARITY = 0.85  # Minimum string similarity ratio (0-1) for text columns
+DEFAULT_NUMERIC_TOLERANCE = 0.001  # Maximum relative difference for numeric columns
+MAX_BLOCK_SIZE = 500  # Larger blocks are compared with a sorted sliding window instead of all pairs
+WINDOW_SIZE = 50
+MINHASH_PERMUTATIONS = 32
+MINHASH_BANDS = 8  # 8 bands of 4 rows: pairs with Jaccard similarity above ~0.6 usually collide
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise OperationCancelled("Fuzzy deduplication canceled by the user.")
+
+
+def normalize_text(series, prefix_length=0):
+    """Lower-cases and trims values (optionally keeping only a prefix) for blocking."""
+    text = series.astype(str).str.strip().str.lower()
+    if prefix_length:
+        text = text.str[:prefix_length]
+    return text
+
+
+def key_blocks(data, key_columns, prefix_length=0):
+    """Returns one block id per row from normalized key columns."""
+    keys = pd.DataFrame({column: normalize_text(data[column], prefix_length) for column in key_columns})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def minhash_signatures(texts, permutations=MINHASH_PERMUTATIONS, shingle_size=SHINGLE_SIZE, seed=1,
+                       batch_rows=20_000, cancel_event=None):
+    """Computes MinHash signatures (rows x permutations) of character shingles.
+
+    Rows are processed in batches so the (permutations x shingles) work array stays bounded.
+    """
+    random_state = np.random.default_rng(seed)
+    a = random_state.integers(1, 1 << 31, size=permutations, dtype=np.uint64)
+    b = random_state.integers(0, 1 << 31, size=permutations, dtype=np.uint64)
+    signatures = np.empty((len(texts), permutations), dtype=np.uint64)
+
+    for batch_start in range(0, len(texts), batch_rows):
+        _check_cancelled(cancel_event)
+        shingle_hashes = []
+        owners = []
+        for row, text in enumerate(texts[batch_start:batch_start + batch_rows]):
+            padded = f" {text} "
+            shingles = {padded[i:i + shingle_size] for i in range(max(len(padded) - shingle_size + 1, 1))}
+            shingle_hashes.extend(zlib.crc32(shingle.encode("utf-8")) for shingle in shingles)
+            owners.extend([row] * len(shingles))
+        shingle_hashes = np.asarray(shingle_hashes, dtype=np.uint64)
+        owners = np.asarray(owners, dtype=np.int64)
+
+        # Universal hashing (a*x + b) mod p for every permutation; operands stay below 2^63
+        permuted = (a[:, None] * shingle_hashes[None, :] + b[:, None]) % np.uint64(_MERSENNE_PRIME)
+
+        # Every row has at least one shingle and owners are sorted, so reduceat gives per-row minima
+        starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+        signatures[batch_start:batch_start + len(starts)] = np.minimum.reduceat(permuted, starts, axis=1).T
+    return signatures
+
+
+def lsh_band_blocks(signatures, bands=MINHASH_BANDS):
+    """Splits signatures into bands and returns one block id array per band."""
+    rows_per_band = signatures.shape[1] // bands
+    band_blocks = []
+    for band in range(bands):
+        band_values = pd.DataFrame(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        band_blocks.append(pd.util.hash_pandas_object(band_values, index=False).to_numpy() + np.uint64(band))
+    return band_blocks
+
+
+def _unique_pairs(left, right, size):
+    """Orders each (left, right) pair and removes repeats, via one int64 key per pair."""
+    keys = np.unique(np.minimum(left, right).astype(np.int64) * size + np.maximum(left, right))
+    return keys // size, keys % size
+
+
+def candidate_pairs(block_ids, sort_keys=None, max_block_size=MAX_BLOCK_SIZE, window_size=WINDOW_SIZE,
+                    cancel_event=None):
+    """Returns (left, right) row positions of candidate pairs that share a block.
+
+    Blocks up to max_block_size rows are compared all-pairs; larger blocks are sorted by
+    sort_keys and each row is only compared with its next window_size neighbours.
+    """
+    codes, _ = pd.factorize(block_ids)
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    boundaries = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1], True])
+
+    lefts, rights = [], []
+    for block, (start, stop) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        size = stop - start
+        if size < 2:
+            continue
+        if block % 1000 == 0:
+            _check_cancelled(cancel_event)
+        members = order[start:stop]
+        if size <= max_block_size:
+            i, j = np.triu_indices(size, 1)
+        else:
+            if sort_keys is not None:
+                members = members[np.argsort(sort_keys[members], kind="stable")]
+            offsets = np.arange(1, window_size + 1)
+            i = np.repeat(np.arange(size), window_size)
+            j = i + np.tile(offsets, size)
+            valid = j < size
+            i, j = i[valid], j[valid]
+        lefts.append(members[i])
+        rights.append(members[j])
+
+    if not lefts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # Order each pair and drop pairs found in more than one block
+    return _unique_pairs(np.concatenate(lefts), np.concatenate(rights), len(block_ids))
+
+
+def _string_matches(series, left, right, threshold, cancel_event=None):
+    """Exact matches are found on factorized codes; difflib only scores each distinct unequal pair once."""
+    text = series.astype(str).str.lower().where(series.notna())
+    codes, uniques = pd.factorize(text)  # Missing values get code -1
+    left_codes = codes[left]
+    right_codes = codes[right]
+    matches = left_codes == right_codes  # Includes missing == missing
+
+    to_score = ~matches & (left_codes >= 0) & (right_codes >= 0)
+    if to_score.any():
+        size = len(uniques)
+        pair_keys = (np.minimum(left_codes, right_codes).astype(np.int64) * size
+                     + np.maximum(left_codes, right_codes))[to_score]
+        distinct_keys, inverse = np.unique(pair_keys, return_inverse=True)
+        ratios = np.empty(len(distinct_keys))
+        for position, key in enumerate(distinct_keys):
+            if position % 10_000 == 0:
+                _check_cancelled(cancel_event)
+            ratios[position] = difflib.SequenceMatcher(None, uniques[key // size], uniques[key % size]).ratio()
+        matches[to_score] = ratios[inverse.ravel()] >= threshold
+    return matches
+
+
+def _numeric_matches(values, left, right, tolerance):
+    left_values = values[left].astype(float)
+    right_values = values[right].astype(float)
+    return np.isclose(left_values, right_values, rtol=tolerance, atol=0.0, equal_nan=True)
+
+
+def score_pairs(data, left, right, compare_columns, similarity=DEFAULT_SIMILARITY,
+                numeric_tolerance=DEFAULT_NUMERIC_TOLERANCE, cancel_event=None):
+    """Returns a boolean mask of candidate pairs that match on every comparison column."""
+    matches = np.ones(len(left), dtype=bool)
+    for column in compare_columns:
+        if not matches.any():
+            break
+        _check_cancelled(cancel_event)
+        candidates = np.flatnonzero(matches)
+        series = data[column]
+        if ptypes.is_numeric_dtype(series) and not ptypes.is_bool_dtype(series):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            column_matches = _numeric_matches(values, left[candidates], right[candidates], numeric_tolerance)
+        else:
+            column_matches = _string_matches(series, left[candidates], right[candidates], similarity, cancel_event)
+        matches[candidates] = column_matches
+    return matches
+
+
+def cluster_labels(row_count, left, right):
+    """Merges matched pairs into clusters; returns the smallest row position of each row's cluster."""
+    labels = np.arange(row_count)
+    if len(left) == 0:
+        return labels
+    while True:
+        lowest = np.minimum(labels[left], labels[right])
+        updated = labels.copy()
+        np.minimum.at(updated, left, lowest)
+        np.minimum.at(updated, right, lowest)
+        updated = updated[updated]  # Pointer jumping shortens chains
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def find_near_duplicates(data, compare_columns, key_columns=None, prefix_length=0, minhash_columns=None,
+                         similarity=DEFAULT_SIMILARITY, numeric_tolerance=DEFAULT_NUMERIC_TOLERANCE,
+                         cancel_event=None):
+    """Finds near-duplicate clusters.
+
+    Blocking uses key_columns (normalized, optionally truncated to prefix_length characters)
+    or, when minhash_columns is given, MinHash/LSH signatures of those columns' text. Each
+    stage polls cancel_event and stops with OperationCancelled once it is set.
+
+    :return: (cluster label per row, number of candidate pairs scored, number of matched pairs)
+    """
+    if len(data) < 2:
+        return np.arange(len(data)), 0, 0
+    if minhash_columns:
+        texts = data[list(minhash_columns)].astype(str).agg(" ".join, axis=1).str.lower().to_numpy()
+        signatures = minhash_signatures(texts, cancel_event=cancel_event)
+        sort_keys = texts
+        pair_sets = [
+            candidate_pairs(block, sort_keys, cancel_event=cancel_event) for block in lsh_band_blocks(signatures)
+        ]
+        # The same pair usually collides in several bands; score it once
+        left, right = _unique_pairs(
+            np.concatenate([pair[0] for pair in pair_sets]),
+            np.concatenate([pair[1] for pair in pair_sets]),
+            len(data)
+        )
+    else:
+        blocks = key_blocks(data, key_columns, prefix_length)
+        sort_keys = data[list(compare_columns)].astype(str).agg(" ".join, axis=1).str.lower().to_numpy()
+        left, right = candidate_pairs(blocks, sort_keys, cancel_event=cancel_event)
+
+    matched = score_pairs(data, left, right, compare_columns, similarity, numeric_tolerance, cancel_event)
+    _check_cancelled(cancel_event)
+    labels = cluster_labels(len(data), left[matched], right[matched])
+    return labels, len(left), int(matched.sum())
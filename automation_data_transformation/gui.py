@@ -1,11 +1,13 @@
 
 import customtkinter as ctk
 from data_operations import DataOperations
+from jobs import job_scheduler
 
 
 class DataTransformationApp:
     def __init__(self, root):
         self.root = root
+        self.jobs = job_scheduler(root)
         self.data_ops = DataOperations()
         self.setup_root()
         self.setup_header()
@@ -58,19 +60,26 @@ class DataTransformationApp:
         self.create_button(button_frame, "Format Revisioning", self.data_ops.format_revisioning, row=4, column=0)
         self.create_button(button_frame, "Merging / Joining", self.data_ops.data_merging,row=5, column=0)
         self.create_button(button_frame, "Data Derivation", self.data_ops.data_derivation, row=2, column=1)
-        self.create_button(button_frame, "Data Aggregation", self.data_ops.data_aggregation, row=3, column=1)
-        self.create_button(button_frame, "Descriptive Statistics", self.data_ops.descriptive_statistics, row=4, column=1)
-        self.create_button(button_frame, "Data Visualization", self.data_ops.data_visualization, row=5, column=1)
+        self.create_button(button_frame, "Data Aggregation", self.data_ops.data_aggregation, row=3, column=1, read_only=True)
+        self.create_button(button_frame, "Descriptive Statistics", self.data_ops.descriptive_statistics, row=4, column=1, read_only=True)
+        self.create_button(button_frame, "Data Visualization", self.data_ops.data_visualization, row=5, column=1, read_only=True)
 
-        self.create_button(button_frame, "Preview Dataset", self.data_ops.preview_dataset, row=1, column=1, color="#FF9800")
-        self.create_button(button_frame, "Save Data", self.data_ops.save_data, row=6, column=1, color="#FF5722")
+        self.create_button(button_frame, "Preview Dataset", self.data_ops.preview_dataset, row=1, column=1, color="#FF9800", read_only=True)
+        self.create_button(button_frame, "Save Data", self.data_ops.save_data, row=6, column=1, color="#FF5722", read_only=True)
+        self.create_button(button_frame, "Clear File Cache", self.data_ops.clear_file_cache, row=6, column=0, color="#6C757D", read_only=True)
+        self.create_button(button_frame, "Batch Cleansing (Saved Policy)", self.data_ops.batch_cleansing, row=7, column=0, columnspan=2, read_only=True)
 
-    def create_button(self, frame, text, command, row, column, color="#007ACC"):
-        """Helper to create styled buttons and place them in a grid layout."""
+    def create_button(self, frame, text, command, row, column, color="#007ACC", columnspan=1, read_only=False):
+        """Helper to create styled buttons and place them in a grid layout.
+
+        Every button runs its command as a scheduled operation: commands that modify the
+        loaded data wait for the active operations to finish, read-only ones (read_only=True)
+        may be started while another read-only one waits for its background job.
+        """
         button = ctk.CTkButton(
             frame,
             text=text,
-            command=command,
+            command=self.jobs.operation(text, command, mutates=not read_only),
             width=300,
             height=50,
             corner_radius=8,
@@ -79,7 +88,7 @@ class DataTransformationApp:
             text_color="white",
             font=ctk.CTkFont(size=14, weight="bold")
         )
-        button.grid(row=row, column=column, pady=10, padx=10, sticky="nsew")
+        button.grid(row=row, column=column, columnspan=columnspan, pady=10, padx=10, sticky="nsew")
 
         # Ensure buttons expand nicely
         frame.grid_rowconfigure(row, weight=1)
@@ -0,0 +1,189 @@
+"""
+Chunked File Ingest
+-------------------
+Streams CSV files into a single DataFrame chunk by chunk so that large exports can be
+loaded on a worker thread with progress reporting and cancellation.
+
+Rows are copied from each parsed chunk straight into preallocated per-column buffers,
+so peak memory stays at one chunk plus the final frame instead of holding every chunk
+and then a concatenated copy of all of them. Nullable (Int*, Float*, boolean) columns are
+buffered as values plus a missing-value mask and categorical columns as codes, so they
+keep their dtype instead of turning into object columns.
+"""
+
+# Standard Libraries
+import os
+import time
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+from cancellation import OperationCancelled
+
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def count_data_rows(file_path, block_size=1 << 20):
+    """Counts the data rows of a CSV file (header excluded) with a fast binary newline scan.
+
+    Quoted fields containing newlines make this an over-estimate, which is fine because it
+    is only used to size buffers and to estimate progress.
+    """
+    newlines = 0
+    last_byte = b""
+    with open(file_path, "rb") as handle:
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            newlines += block.count(b"\n")
+            last_byte = block[-1:]
+    if last_byte and last_byte != b"\n":
+        newlines += 1  # Last line has no trailing newline
+    return max(newlines - 1, 0)
+
+
+_MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _buffered(series):
+    """Returns the NumPy values a column is buffered as, and its missing-value mask for nullable columns."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int32), None
+    if isinstance(series.array, _MASKED_ARRAYS):
+        values = series.array.to_numpy(dtype=dtype.numpy_dtype, na_value=dtype.numpy_dtype.type(0))
+        return values, series.isna().to_numpy()
+    return series.to_numpy(), None  # Other extension dtypes are buffered as objects and rebuilt at the end
+
+
+def _merged_dtype(current, incoming):
+    """Returns a dtype able to hold values of both dtypes (numeric promotion, else object)."""
+    if current == incoming:
+        return current
+    if current.kind in "iuf" and incoming.kind in "iuf":
+        return np.result_type(current, incoming)
+    return np.dtype(object)
+
+
+class _ColumnBuffers:
+    """Preallocated, growable NumPy buffers holding the rows read so far, one per column."""
+
+    def __init__(self, capacity):
+        self.capacity = max(int(capacity), 1)
+        self.rows = 0
+        self.columns = None
+        self.buffers = {}
+        self.masks = {}  # Column -> missing-value mask of a nullable column
+        self.dtypes = {}  # Column -> dtype of the finished column
+
+    def append(self, chunk):
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        needed = self.rows + len(chunk)
+        if needed > self.capacity:
+            self._grow(max(needed, int(self.capacity * 1.5)))
+
+        for position, column in enumerate(self.columns):
+            series = chunk.iloc[:, position]
+            dtype = self.dtypes.setdefault(column, series.dtype)
+            if series.dtype != dtype and not (isinstance(dtype, np.dtype) and isinstance(series.dtype, np.dtype)):
+                self._to_object(column)  # Differing extension dtypes are kept as objects
+                series = series.astype(object)
+            values, mask = _buffered(series)
+            buffer = self.buffers.get(column)
+            if buffer is None:
+                buffer = np.empty(self.capacity, dtype=values.dtype)
+                self.buffers[column] = buffer
+                if mask is not None:
+                    self.masks[column] = np.empty(self.capacity, dtype=bool)
+            elif buffer.dtype != values.dtype:
+                target = _merged_dtype(buffer.dtype, values.dtype)
+                if target != buffer.dtype:
+                    buffer = buffer.astype(target)
+                    self.buffers[column] = buffer
+                    self.dtypes[column] = target
+                values = values.astype(target)
+            buffer[self.rows:needed] = values
+            if mask is not None:
+                self.masks[column][self.rows:needed] = mask
+        self.rows = needed
+
+    def _to_object(self, column):
+        """Converts the rows buffered so far for a column to an object buffer."""
+        buffer = np.empty(self.capacity, dtype=object)
+        buffer[:self.rows] = np.asarray(self._finished(column), dtype=object)
+        self.buffers[column] = buffer
+        self.masks.pop(column, None)
+        self.dtypes[column] = np.dtype(object)
+
+    def _grow(self, capacity):
+        for buffers in (self.buffers, self.masks):
+            for column, buffer in buffers.items():
+                grown = np.empty(capacity, dtype=buffer.dtype)
+                grown[:self.rows] = buffer[:self.rows]
+                buffers[column] = grown
+        self.capacity = capacity
+
+    def _finished(self, column, copy=False):
+        """The buffered rows of one column as an array of the column's dtype."""
+        values = self.buffers[column][:self.rows]
+        values = values.copy() if copy else values
+        dtype = self.dtypes[column]
+        if isinstance(dtype, np.dtype):
+            return values
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(values, dtype=dtype)
+        if column in self.masks:
+            mask = self.masks[column][:self.rows]
+            return dtype.construct_array_type()(values, mask.copy() if copy else mask)
+        return pd.array(values, dtype=dtype)
+
+    def to_frame(self):
+        """Builds the final DataFrame on top of the buffers without copying them."""
+        if self.columns is None:
+            return pd.DataFrame()
+        trim = self.capacity - self.rows > self.capacity // 10
+        data = {column: self._finished(column, copy=trim) for column in self.columns}
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+
+def read_csv_chunked(file_path, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None, cancel_event=None, **read_kwargs):
+    """Reads a CSV file chunk by chunk into one DataFrame.
+
+    :param progress: Optional callable ``progress(rows_read, bytes_read, total_bytes, eta_seconds)``
+                     invoked after every chunk. ``eta_seconds`` is None until it can be estimated.
+    :param cancel_event: Optional ``threading.Event``; when set, the read stops with OperationCancelled.
+    """
+    total_bytes = os.path.getsize(file_path)
+    buffers = _ColumnBuffers(count_data_rows(file_path))
+    started = time.monotonic()
+
+    with open(file_path, "rb") as handle:
+        with pd.read_csv(handle, chunksize=chunk_rows, **read_kwargs) as reader:
+            for chunk in reader:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelled("File upload canceled by the user.")
+
+                buffers.append(chunk)
+                del chunk  # Release the parsed chunk before the next one is read
+
+                if progress is not None:
+                    bytes_read = min(handle.tell(), total_bytes)
+                    elapsed = time.monotonic() - started
+                    eta = None
+                    if bytes_read and elapsed > 0:
+                        eta = elapsed * (total_bytes - bytes_read) / bytes_read
+                    progress(buffers.rows, bytes_read, total_bytes, eta)
+
+    return buffers.to_frame()
+
+
+def format_ingest_progress(rows_read, bytes_read, total_bytes, eta_seconds):
+    """Formats an ingest progress update as a short status line."""
+    status = f"Rows read: {rows_read:,}   |   {bytes_read / 2**20:,.1f} / {total_bytes / 2**20:,.1f} MB"
+    if eta_seconds is not None:
+        status += f"   |   ETA: {int(eta_seconds) // 60}m {int(eta_seconds) % 60:02d}s"
+    return status
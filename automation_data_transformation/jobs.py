@@ -0,0 +1,317 @@
+"""
+Background Jobs
+---------------
+Runs the toolkit's long-running work on a thread pool while the Tk event loop keeps running.
+
+* A job runs task(report, cancel_event) on a worker thread. Progress reports, results and
+  errors are handed back through a queue that the Tk thread polls, so widgets and dialogs
+  are only ever touched from the Tk thread.
+* The Background Jobs window lists every running job with its progress, status, elapsed
+  time and a Cancel button, plus the operations waiting for their turn.
+* Button operations show their dialogs on the Tk thread and hand each heavy step (reading,
+  hashing, merging, grouping, cleansing) to a job; the result is applied to the loaded data
+  back on the Tk thread.
+* The data lock is a reader/writer lock. Jobs that work on the loaded data hold it for
+  reading, any number at a time; the Tk thread holds it for writing only for the short
+  step that applies a result, so no job sees the data and its caches half-updated. Only
+  the Tk thread writes, so its own reads need no lock and never wait for a job.
+* Button operations are serialized: an operation that modifies the data waits until no
+  other operation is active and holds back new ones until it is done. A read-only operation
+  (previews, statistics, charts, saving) may be started while another one waits for its job,
+  but each waits in a nested Tk event loop, so the one started last must finish before an
+  earlier one can carry on.
+
+Jobs use threads rather than processes: they work on the in-memory DataFrame, which would
+otherwise be copied to another process for every job (the streaming group-by already fans
+out to a process pool by itself).
+"""
+
+# Standard Libraries
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from tkinter import ttk
+
+
+JOB_WORKERS = int(os.environ.get("DATA_TOOLKIT_JOB_WORKERS", 4))
+POLL_MILLISECONDS = 100
+
+
+class Job:
+    """State of one background job, as shown in the Background Jobs window."""
+
+    def __init__(self, title, determinate=True, abandon_on_cancel=False):
+        self.title = title
+        self.determinate = determinate
+        self.abandon_on_cancel = abandon_on_cancel
+        self.fraction = 0.0
+        self.status = "Waiting for other jobs..."
+        self.started = time.monotonic()
+        self.cancel_event = threading.Event()
+        self.on_done = None
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+
+class DataLock:
+    """Reader/writer lock for the loaded data and its caches.
+
+    read() is shared between threads; write() waits for the active readers, keeps new ones
+    out until it is released, and may be re-entered by the thread that holds it (which may
+    also read). A thread holding read() must not ask for write().
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = None
+        self._depth = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writer not in (None, threading.get_ident()):
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        thread = threading.get_ident()
+        with self._condition:
+            if self._writer != thread:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._writer = thread
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._depth -= 1
+                if not self._depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class JobScheduler:
+    """Runs jobs on a thread pool and serializes the operations started from the main window."""
+
+    def __init__(self, root, workers=JOB_WORKERS):
+        self.root = root
+        self.data_lock = DataLock()
+        self.jobs = []  # Running jobs (Tk thread only)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._updates = queue.Queue()
+        self._polling = False
+        self._pending = deque()  # Operations waiting for their turn: (name, func, mutates)
+        self._active = 0
+        self._exclusive = False
+        self._window = None
+        self._rows = {}
+        self._layout = None
+
+    # ------------------------------------------------------------------ jobs
+
+    def submit(self, title, task, on_done, determinate=True, abandon_on_cancel=False):
+        """Starts task(report, cancel_event) on a worker thread.
+
+        on_done(kind, value) is called on the Tk thread with ("done", result), ("error",
+        exception) or ("cancelled", None). The task holds the data lock for reading; jobs
+        that can be abandoned on cancel must not touch the loaded data, so they do not take it.
+        """
+        job = Job(title, determinate, abandon_on_cancel)
+        job.on_done = on_done
+
+        def report(fraction, status_text):
+            self._updates.put((job, "progress", (fraction, status_text)))
+
+        def work():
+            try:
+                if abandon_on_cancel:
+                    report(None, "Starting...")
+                    result = task(report, job.cancel_event)
+                else:
+                    with self.data_lock.read():
+                        report(None, "Starting...")
+                        result = task(report, job.cancel_event)
+                self._updates.put((job, "done", result))
+            except BaseException as error:
+                self._updates.put((job, "error", error))
+
+        self.jobs.append(job)
+        self._executor.submit(work)
+        self._refresh()
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MILLISECONDS, self._poll)
+        return job
+
+    def run(self, title, task, determinate=True, abandon_on_cancel=False):
+        """Runs a job and waits for it while the Tk event loop keeps running.
+
+        :return: {"done": result}, {"error": exception} or {"cancelled": None}
+        """
+        outcome = {}
+        finished = tk.BooleanVar(master=self.root, value=False)
+
+        def on_done(kind, value):
+            outcome[kind] = value
+            finished.set(True)
+
+        self.submit(title, task, on_done, determinate, abandon_on_cancel)
+        self.root.wait_variable(finished)
+        return outcome
+
+    def cancel(self, job):
+        """Asks a job to stop; jobs that cannot poll for it are abandoned right away."""
+        job.cancel_event.set()
+        job.status = "Canceling..."
+        if job.abandon_on_cancel and job in self.jobs:
+            self.jobs.remove(job)  # The worker's eventual result is discarded
+            job.on_done("cancelled", None)
+        self._refresh()
+
+    def _poll(self):
+        try:
+            while True:
+                job, kind, value = self._updates.get_nowait()
+                if kind == "progress":
+                    fraction, status_text = value
+                    if fraction is not None:
+                        job.fraction = fraction
+                    if status_text and not job.cancel_event.is_set():
+                        job.status = status_text
+                elif job in self.jobs:
+                    self.jobs.remove(job)
+                    job.on_done(kind, value)
+        except queue.Empty:
+            pass
+        self._refresh()
+        if self.jobs:
+            self.root.after(POLL_MILLISECONDS, self._poll)
+        else:
+            self._polling = False
+
+    # ------------------------------------------------------------------ operations
+
+    def operation(self, name, func, mutates=True):
+        """Returns a button command that runs func() on the Tk thread when its turn comes.
+
+        func is expected to run its heavy steps as jobs (see run). Operations that modify the
+        data (mutates=True) run only when no other operation is active; read-only operations
+        start as soon as no modifying operation is active or queued before them. An operation
+        started while another waits for a job runs inside that job's nested event loop, so the
+        earlier operation resumes only after the later one has returned.
+        """
+        def start():
+            self._pending.append((name, func, mutates))
+            self._start_pending()
+        return start
+
+    def _start_pending(self):
+        while self._pending:
+            name, func, mutates = self._pending[0]
+            if self._exclusive or (mutates and self._active):
+                break  # Runs once the active operations are done
+            self._pending.popleft()
+            self._active += 1
+            self._exclusive = mutates
+            self._refresh()
+            try:
+                func()
+            finally:
+                self._active -= 1
+                if mutates:
+                    self._exclusive = False
+        self._refresh()
+
+    def _remove_pending(self, entry):
+        if entry in self._pending:
+            self._pending.remove(entry)
+        self._refresh()
+
+    # ------------------------------------------------------------------ window
+
+    def _refresh(self):
+        """Shows every running job and queued operation; hides the window when there are none."""
+        if not self.jobs and not self._pending:
+            if self._window is not None and self._window.winfo_exists():
+                self._window.withdraw()
+            return
+        if self._window is None or not self._window.winfo_exists():
+            self._window = tk.Toplevel(self.root)
+            self._window.title("Background Jobs")
+            self._window.resizable(False, False)
+            self._window.protocol("WM_DELETE_WINDOW", self._window.withdraw)
+            self._layout = None
+        elif self._window.state() == "withdrawn":
+            self._window.deiconify()
+
+        layout = (tuple(map(id, self.jobs)), tuple(map(id, self._pending)))
+        if layout != self._layout:
+            self._layout = layout
+            for child in self._window.winfo_children():
+                child.destroy()
+            self._rows = {job: self._job_row(job) for job in self.jobs}
+            for entry in self._pending:
+                self._pending_row(entry)
+
+        for job, (progress_bar, status_label, elapsed_label, cancel_button) in self._rows.items():
+            if job.determinate:
+                progress_bar["value"] = job.fraction
+            status_label.config(text=job.status)
+            elapsed_label.config(text=f"Elapsed: {int(job.elapsed)}s")
+            if job.cancel_event.is_set():
+                cancel_button.config(state=tk.DISABLED)
+
+    def _job_row(self, job):
+        row = tk.Frame(self._window, bd=1, relief="groove")
+        row.pack(fill="x", padx=10, pady=5)
+        tk.Label(row, text=job.title, font=("Arial", 11, "bold"), anchor="w").pack(fill="x", padx=10, pady=(5, 0))
+        status_label = tk.Label(row, font=("Arial", 10), width=60, anchor="w")
+        status_label.pack(fill="x", padx=10)
+        progress_bar = ttk.Progressbar(
+            row, length=420, mode="determinate" if job.determinate else "indeterminate", maximum=1.0
+        )
+        progress_bar.pack(padx=10, pady=2)
+        if not job.determinate:
+            progress_bar.start(15)
+        footer = tk.Frame(row)
+        footer.pack(fill="x", padx=10, pady=(0, 5))
+        elapsed_label = tk.Label(footer, font=("Arial", 9), fg="#6C757D")
+        elapsed_label.pack(side="left")
+        cancel_button = tk.Button(footer, text="Cancel", width=12, command=lambda: self.cancel(job))
+        cancel_button.pack(side="right")
+        return progress_bar, status_label, elapsed_label, cancel_button
+
+    def _pending_row(self, entry):
+        row = tk.Frame(self._window, bd=1, relief="groove")
+        row.pack(fill="x", padx=10, pady=5)
+        tk.Label(row, text=f"{entry[0]} (queued until the current operation finishes)", anchor="w").pack(
+            side="left", padx=10, pady=5
+        )
+        tk.Button(row, text="Remove", width=12, command=lambda: self._remove_pending(entry)).pack(side="right", padx=10)
+
+
+_scheduler = None
+
+
+def job_scheduler(root=None):
+    """Returns the application's scheduler, creating it for root (default: the Tk root) on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler(root or tk._default_root)
+    return _scheduler
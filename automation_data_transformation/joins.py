@@ -0,0 +1,249 @@
+"""
+Join Planning
+-------------
+Key-aware joins with a pre-join analysis. Before two frames are merged, the key
+cardinalities on both sides give the exact output row count, the relationship between
+the tables (one-to-one ... many-to-many) and an estimate of the result's memory.
+
+Joins whose estimate fits the memory budget run as a normal pd.merge. Larger ones run as a
+partitioned hash join: both inputs are split into buckets by key hash, each bucket pair is
+merged on its own and written to an on-disk ChunkedDataset, so peak memory is bounded by
+one bucket's output. A join is refused up front when a single key alone would produce more
+output than the budget, since no partitioning can split it.
+
+merge_many joins any number of frames on shared keys in one operation.
+"""
+
+# Standard Libraries
+import os
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.core.dtypes.cast import find_common_type
+
+from out_of_core import ChunkedDataset, _step
+
+
+DEFAULT_MEMORY_BUDGET = int(os.environ.get("DATA_TOOLKIT_MEMORY_BUDGET_MB", 2048)) * 2**20
+JOIN_TYPES = {"Inner Merge": "inner", "Outer Merge": "outer", "Left Join": "left", "Right Join": "right"}
+RELATIONSHIPS = {
+    "Don't Validate": None,
+    "One-to-One": "one_to_one",
+    "One-to-Many": "one_to_many",
+    "Many-to-One": "many_to_one",
+    "Many-to-Many": "many_to_many",
+}
+_PERMITTED = {  # Relationships each validation level accepts
+    "one_to_one": {"one_to_one"},
+    "one_to_many": {"one_to_one", "one_to_many"},
+    "many_to_one": {"one_to_one", "many_to_one"},
+    "many_to_many": {"one_to_one", "one_to_many", "many_to_one", "many_to_many"},
+}
+
+
+def shared_columns(left, right):
+    """Columns present in both frames, in the left frame's order."""
+    right_columns = set(right.columns)
+    return [column for column in left.columns if column in right_columns]
+
+
+def key_dtypes(left, right, on):
+    """Common dtype of every key column of both frames.
+
+    Hashes depend on the dtype (int64 1 and float64 1.0 hash differently) while pd.merge
+    matches them, so both sides are hashed in the same dtype.
+    """
+    return {column: find_common_type([left[column].dtype, right[column].dtype]) for column in on}
+
+
+def key_hashes(data, on, dtypes=None):
+    """One uint64 hash per row of the key columns (missing keys hash equal, as pd.merge matches them).
+
+    :param dtypes: key column -> dtype to hash in (from key_dtypes), so both sides of a join agree
+    """
+    keys = data[list(on)]
+    mismatched = {column: dtype for column, dtype in (dtypes or {}).items() if keys[column].dtype != dtype}
+    if mismatched:
+        keys = keys.astype(mismatched)
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def _bytes_per_row(data, columns=None):
+    if len(data) == 0:
+        return 0.0
+    frame = data if columns is None else data[columns]
+    return frame.memory_usage(deep=True, index=False).sum() / len(data)
+
+
+class JoinEstimate:
+    """Exact output size and key relationship of a join, computed from key counts only."""
+
+    def __init__(self, left, right, on, how, left_hashes=None, right_hashes=None):
+        self.on = list(on)
+        self.how = how
+        self.left_rows = len(left)
+        self.right_rows = len(right)
+
+        if left_hashes is None or right_hashes is None:
+            dtypes = key_dtypes(left, right, on)
+            left_hashes = key_hashes(left, on, dtypes) if left_hashes is None else left_hashes
+            right_hashes = key_hashes(right, on, dtypes) if right_hashes is None else right_hashes
+        left_counts = pd.Series(left_hashes).value_counts()
+        right_counts = pd.Series(right_hashes).value_counts()
+        matched_left, matched_right = left_counts.align(right_counts, join="inner")
+        pair_counts = matched_left.to_numpy(dtype=np.int64) * matched_right.to_numpy(dtype=np.int64)
+
+        matched_rows = int(pair_counts.sum())
+        left_unmatched = self.left_rows - int(matched_left.sum())
+        right_unmatched = self.right_rows - int(matched_right.sum())
+        self.output_rows = {
+            "inner": matched_rows,
+            "left": matched_rows + left_unmatched,
+            "right": matched_rows + right_unmatched,
+            "outer": matched_rows + left_unmatched + right_unmatched,
+        }[how]
+        self.largest_key_rows = int(pair_counts.max()) if len(pair_counts) else 0
+
+        left_unique = left_counts.empty or left_counts.max() == 1
+        right_unique = right_counts.empty or right_counts.max() == 1
+        self.relationship = {
+            (True, True): "one_to_one",
+            (True, False): "one_to_many",
+            (False, True): "many_to_one",
+            (False, False): "many_to_many",
+        }[(left_unique, right_unique)]
+
+        right_values = [column for column in right.columns if column not in set(on)]
+        self.bytes_per_row = _bytes_per_row(left) + _bytes_per_row(right, right_values)
+        self.output_bytes = int(self.output_rows * self.bytes_per_row)
+
+    def validate(self, expected):
+        """Raises ValueError when the keys do not have the expected relationship (None skips the check)."""
+        if expected is not None and self.relationship not in _PERMITTED[expected]:
+            raise ValueError(
+                f"Join keys {self.on} are {self.relationship.replace('_', '-')}, "
+                f"but {expected.replace('_', '-')} was expected."
+            )
+
+    def plan(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """Returns 'in_memory', 'partitioned' or 'refuse' for the given budget in bytes."""
+        if self.output_bytes <= memory_budget:
+            return "in_memory"
+        if self.largest_key_rows * self.bytes_per_row > memory_budget:
+            return "refuse"
+        return "partitioned"
+
+    def partition_count(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """Bucket count that keeps each bucket's output to about a quarter of the budget."""
+        return max(2, int(np.ceil(4 * self.output_bytes / max(memory_budget, 1))))
+
+    def describe(self):
+        return (
+            f"Join Keys: {', '.join(map(str, self.on))}\n"
+            f"Relationship: {self.relationship.replace('_', '-')}\n"
+            f"Left Rows: {self.left_rows:,}   |   Right Rows: {self.right_rows:,}\n"
+            f"Estimated Output Rows: {self.output_rows:,}\n"
+            f"Estimated Output Memory: {self.output_bytes / 2**20:,.1f} MB"
+        )
+
+
+def partitioned_merge(left, right, on, how, partitions, left_hashes=None, right_hashes=None,
+                      progress=None, cancel_event=None):
+    """Hash-partitioned join written bucket by bucket to a ChunkedDataset.
+
+    Every key lands in exactly one bucket on both sides, so merging bucket pairs
+    independently gives the same rows as one pd.merge (grouped by bucket rather than in
+    left-hand order).
+    """
+    if left_hashes is None or right_hashes is None:
+        dtypes = key_dtypes(left, right, on)
+        left_hashes = key_hashes(left, on, dtypes) if left_hashes is None else left_hashes
+        right_hashes = key_hashes(right, on, dtypes) if right_hashes is None else right_hashes
+    left_buckets = (left_hashes % np.uint64(partitions)).astype(np.int64)
+    right_buckets = (right_hashes % np.uint64(partitions)).astype(np.int64)
+    left_order = np.argsort(left_buckets, kind="stable")
+    right_order = np.argsort(right_buckets, kind="stable")
+    left_bounds = np.searchsorted(left_buckets[left_order], np.arange(partitions + 1))
+    right_bounds = np.searchsorted(right_buckets[right_order], np.arange(partitions + 1))
+
+    result = ChunkedDataset()
+    empty = None
+    for bucket in range(partitions):
+        left_part = left.iloc[left_order[left_bounds[bucket]:left_bounds[bucket + 1]]]
+        right_part = right.iloc[right_order[right_bounds[bucket]:right_bounds[bucket + 1]]]
+        merged = pd.merge(left_part, right_part, how=how, on=list(on))
+        if len(merged):
+            result.append(merged)
+        elif empty is None:
+            empty = merged
+        _step(progress, cancel_event, bucket + 1, partitions, "Joining")
+    if not result.partitions:
+        result.append(empty)
+    return result
+
+
+def common_columns(frames):
+    """Columns present in every frame, in the first frame's order."""
+    common = set(frames[0].columns).intersection(*[set(frame.columns) for frame in frames[1:]])
+    return [column for column in frames[0].columns if column in common]
+
+
+def disambiguate_columns(frames, names, on):
+    """Suffixes non-key columns that appear in more than one frame with that frame's name.
+
+    Frames are relabelled on shallow copies, so no column data is copied.
+    """
+    keys = set(on)
+    seen = {}
+    for frame in frames:
+        for column in frame.columns:
+            if column not in keys:
+                seen[column] = seen.get(column, 0) + 1
+    relabelled = []
+    for frame, name in zip(frames, names):
+        frame = frame.copy(deep=False)
+        frame.columns = [f"{column}_{name}" if column not in keys and seen[column] > 1 else column for column in frame.columns]
+        relabelled.append(frame)
+    return relabelled
+
+
+def merge_many(frames, on, how="inner", memory_budget=DEFAULT_MEMORY_BUDGET, keep_first=False, progress=None):
+    """Joins any number of frames on shared keys in one operation.
+
+    When the keys are unique in every frame, all frames are aligned on a key index with a
+    single pd.concat(axis=1), which allocates the result once. Otherwise frames are merged
+    pairwise, smallest first, so intermediate results stay as small as possible; each
+    intermediate replaces the previous one, and every step is checked against the budget.
+    With keep_first (used for left joins) the first frame stays on the left and only the
+    rest are ordered by size.
+    """
+    on = list(on)
+    if how not in ("inner", "outer", "left"):
+        raise ValueError("Multi-file merges support inner, outer and left joins.")
+    first, rest = (frames[:1], frames[1:]) if keep_first or how == "left" else ([], frames)
+    ordered = first + sorted(rest, key=len)
+
+    unique_keys = all(not frame.duplicated(subset=on).any() for frame in ordered)
+    if unique_keys:
+        if progress is not None:
+            progress(None, f"Aligning {len(ordered)} files on {', '.join(map(str, on))}...")
+        indexed = [frame.set_index(on) for frame in ordered]
+        if how == "left":
+            indexed = [indexed[0]] + [frame.reindex(indexed[0].index) for frame in indexed[1:]]
+            how = "outer"
+        return pd.concat(indexed, axis=1, join=how).reset_index()
+
+    result = ordered[0]
+    for step, frame in enumerate(ordered[1:], start=1):
+        estimate = JoinEstimate(result, frame, on, how)
+        if estimate.plan(memory_budget) != "in_memory":
+            raise ValueError(
+                f"Step {step} of the multi-file merge would produce {estimate.output_rows:,} rows "
+                f"(~{estimate.output_bytes / 2**20:,.0f} MB), over the memory budget. "
+                "Merge these files one at a time so large joins can run partitioned on disk."
+            )
+        if progress is not None:
+            progress(step / (len(ordered) - 1), f"Merging file {step + 1} of {len(ordered)}...")
+        result = pd.merge(result, frame, how=how, on=on)
+    return result
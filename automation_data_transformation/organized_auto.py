@@ -16,6 +16,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+# Local Modules
+from deduplication import ColumnHashIndex, DuplicateGroupReport
+from utils import show_paginated_table
+
 
 class DataTransformationApp:
 
@@ -192,20 +196,20 @@ class DataTransformationApp:
                 # Determine the subset of columns for deduplication
                 columns_used = subset_columnss if subset_columnss else self.data.columns.tolist()
 
-                # Preview duplicate rows
-                duplicate_rows = self.data[self.data.duplicated(subset=columns_used)]
-                if not duplicate_rows.empty:
-                    # Formatting the preview to show each duplicate row with column names and values
-                    preview_message = "Preview of Duplicate Rows (with column details):\n"
-                    for index, row in duplicate_rows.iterrows():
-                        row_details = {col: row[col] for col in columns_used}
-                        preview_message += f"\nRow {index + 1}: {row_details}"
-
-                    # Show the preview in a message box
-                    messagebox.showinfo(
+                # Preview duplicate groups page by page (vectorized summary instead of one row per line)
+                report = DuplicateGroupReport(ColumnHashIndex().row_hashes(self.data, columns_used))
+                if report.group_count:
+                    proceed = show_paginated_table(
                         "Preview Duplicates",
-                        f"Columns Used for Deduplication: {', '.join(columns_used)}\n\n{preview_message}"
+                        f"Columns Used for Deduplication: {', '.join(columns_used)}\n"
+                        f"Duplicate Groups: {report.group_count:,}   |   Duplicate Rows: {report.duplicate_rows:,}",
+                        report.group_count,
+                        lambda start, stop: report.page(self.data, columns_used, start, stop),
+                        confirm_text="Deduplicate"
                     )
+                    if not proceed:
+                        messagebox.showinfo("Data Deduplication", "Operation canceled by the user.")
+                        return
 
                 # Perform deduplication
                 original_count = len(self.data)
@@ -0,0 +1,440 @@
+"""
+Out-of-Core Datasets
+--------------------
+A ChunkedDataset keeps a dataset on disk as a directory of partition files (Parquet when
+pyarrow is installed, pickle otherwise) and runs every operation one partition at a time,
+so memory use is bounded by the partition size rather than by the size of the dataset.
+
+Operations that transform rows return a new ChunkedDataset; operations that summarize the
+data (statistics, group-by, missing-value counts) return small in-memory pandas objects.
+Every long-running method accepts an optional ``progress(fraction, status_text)`` callable
+and a ``cancel_event`` so it can run behind utils.run_with_progress.
+
+Partitions may be written with different dtypes for the same column (CSV chunks infer
+their own types, e.g. int64 in one chunk and float64 in the next because of a missing
+value). The dataset keeps one schema widened over all partitions and casts every
+partition to it when it is read, so all partitions see the same values the same way.
+"""
+
+# Standard Libraries
+import os
+import shutil
+import tempfile
+import weakref
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+from pandas.core.dtypes.cast import find_common_type
+
+from cancellation import OperationCancelled
+from column_statistics import ColumnStatistics
+from dtype_utils import column_memory, conform_dtypes, integer_dtype_for, parse_numeric_text, whole_number_summary
+from export import write_dataset
+from file_cache import PARQUET_AVAILABLE, read_frame, write_frame
+from streaming_groupby import AGGREGATION_WORKERS, MERGEABLE_METRICS, streaming_groupby
+
+
+DEFAULT_PARTITION_ROWS = 250_000
+HASH_BUCKETS = 64  # Deduplication spills row hashes into this many on-disk buckets
+SECOND_HASH_KEY = "ooc-dedup-key-02"  # 16 characters; pandas' default key gives the first 64 bits
+SAMPLE_ROWS = 200_000  # Rows drawn for visualization
+
+
+def _step(progress, cancel_event, done, total, label):
+    """Reports progress for one processed partition and honours cancellation."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise OperationCancelled("Operation canceled by the user.")
+    if progress is not None:
+        progress(done / total if total else 1.0, f"{label}: partition {done:,} of {total:,}")
+
+
+class ChunkedDataset:
+    """A partitioned on-disk dataset processed chunk by chunk with bounded memory."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or tempfile.mkdtemp(prefix="ooc_dataset_")
+        self.partitions = []
+        self.partition_rows = []
+        self._columns = []
+        self._dtypes = pd.Series(dtype=object)  # Schema widened over every partition
+        self._recent = None  # (path, DataFrame) of the partition last read by take()
+        # Remove the partition files once the dataset is no longer referenced
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    # ------------------------------------------------------------------ construction
+
+    def append(self, chunk):
+        """Writes one chunk as a new partition."""
+        if not self.partitions:
+            self._columns = list(chunk.columns)
+            self._dtypes = chunk.dtypes.copy()
+        else:
+            self._dtypes = pd.Series(
+                {column: find_common_type([dtype, chunk.dtypes.get(column, dtype)])
+                 for column, dtype in self._dtypes.items()},
+                dtype=object
+            )
+        stem = os.path.join(self.directory, f"part-{len(self.partitions):06d}")
+        chunk = chunk.reset_index(drop=True)
+        path = None
+        if PARQUET_AVAILABLE:
+            try:
+                path = stem + ".parquet"
+                write_frame(chunk, path)
+            except Exception:
+                path = None  # Mixed-type object columns; fall back to pickle
+        if path is None:
+            path = stem + ".pkl"
+            write_frame(chunk, path)
+        self.partitions.append(path)
+        self.partition_rows.append(len(chunk))
+
+    @classmethod
+    def from_csv(cls, file_path, partition_rows=DEFAULT_PARTITION_ROWS, progress=None, cancel_event=None):
+        """Streams a CSV file into partitions without ever holding the whole file in memory."""
+        dataset = cls()
+        total_bytes = os.path.getsize(file_path) or 1
+        with open(file_path, "rb") as handle:
+            with pd.read_csv(handle, chunksize=partition_rows) as reader:
+                for chunk in reader:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise OperationCancelled("File upload canceled by the user.")
+                    dataset.append(chunk)
+                    if progress is not None:
+                        progress(
+                            min(handle.tell() / total_bytes, 1.0),
+                            f"Partitioned {len(dataset):,} rows into {len(dataset.partitions):,} partitions"
+                        )
+        return dataset
+
+    @classmethod
+    def from_frame(cls, data, partition_rows=DEFAULT_PARTITION_ROWS):
+        """Splits an in-memory DataFrame into partitions."""
+        dataset = cls()
+        for start in range(0, max(len(data), 1), partition_rows):
+            dataset.append(data.iloc[start:start + partition_rows])
+        return dataset
+
+    def _conform(self, chunk):
+        """Casts a partition read from disk to the dataset's widened schema."""
+        return conform_dtypes(chunk, self._dtypes)
+
+    def _derive(self):
+        """Creates an empty dataset to receive the output of a row-wise transformation."""
+        return ChunkedDataset()
+
+    # ------------------------------------------------------------------ access
+
+    def __len__(self):
+        return int(sum(self.partition_rows))
+
+    @property
+    def columns(self):
+        return pd.Index(self._columns)
+
+    @property
+    def shape(self):
+        return (len(self), len(self.columns))
+
+    def iter_chunks(self, columns=None, progress=None, cancel_event=None, label="Processing"):
+        """Yields each partition as a DataFrame (optionally only some columns)."""
+        total = len(self.partitions)
+        for number, path in enumerate(self.partitions, start=1):
+            chunk = read_frame(path)
+            yield self._conform(chunk if columns is None else chunk[list(columns)])
+            _step(progress, cancel_event, number, total, label)
+
+    def head(self, rows=1000):
+        """Returns the first rows of the dataset as a DataFrame."""
+        pieces = []
+        remaining = rows
+        for chunk in self.iter_chunks():
+            pieces.append(chunk.head(remaining))
+            remaining -= len(pieces[-1])
+            if remaining <= 0:
+                break
+        return pd.concat(pieces, ignore_index=True) if pieces else pd.DataFrame(columns=self.columns)
+
+    def take(self, positions, columns=None):
+        """Returns the rows at the given (ascending) positions, reading only the partitions that hold them.
+
+        The most recently read partition is kept, so neighbouring windows (e.g. a scrolling
+        preview) are served without reading it again.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        offsets = np.cumsum([0] + list(self.partition_rows))
+        numbers = np.searchsorted(offsets, positions, side="right") - 1
+        pieces = []
+        for number in np.unique(numbers):
+            path = self.partitions[number]
+            if self._recent is None or self._recent[0] != path:
+                self._recent = (path, read_frame(path))
+            chunk = self._recent[1].iloc[positions[numbers == number] - offsets[number]]
+            pieces.append(self._conform(chunk if columns is None else chunk[list(columns)]))
+        if not pieces:
+            return pd.DataFrame(columns=columns if columns is not None else self.columns)
+        result = pd.concat(pieces)
+        result.index = pd.Index(positions)
+        return result
+
+    def sample(self, rows=SAMPLE_ROWS, columns=None, seed=0):
+        """Draws a uniform random sample of at most `rows` rows, proportionally from every partition."""
+        total = len(self)
+        if total == 0:
+            return pd.DataFrame(columns=columns if columns is not None else self.columns)
+        fraction = min(1.0, rows / total)
+        random_state = np.random.default_rng(seed)
+        pieces = []
+        for chunk in self.iter_chunks(columns):
+            if fraction >= 1.0:
+                pieces.append(chunk)
+            else:
+                pieces.append(chunk[random_state.random(len(chunk)) < fraction])
+        return pd.concat(pieces, ignore_index=True)
+
+    def dtypes(self):
+        """Returns the dtypes of the dataset, widened over every partition."""
+        return self._dtypes.copy()
+
+    def numeric_columns(self):
+        """Returns the numeric (non-boolean) columns of the widened schema."""
+        return [
+            column for column, dtype in self._dtypes.items()
+            if ptypes.is_numeric_dtype(dtype) and not ptypes.is_bool_dtype(dtype)
+        ]
+
+    # ------------------------------------------------------------------ row-wise transformations
+
+    def map_chunks(self, func, progress=None, cancel_event=None, label="Transforming"):
+        """Applies func(chunk) -> DataFrame to every partition and returns a new dataset."""
+        result = self._derive()
+        for chunk in self.iter_chunks(progress=progress, cancel_event=cancel_event, label=label):
+            result.append(func(chunk))
+        return result
+
+    def drop_duplicates(self, subset=None, keep='first', progress=None, cancel_event=None):
+        """Removes duplicate rows with bounded memory using an external hash partitioning pass.
+
+        Pass 1 hashes every row and spills (hash, row number) pairs into on-disk buckets by
+        hash prefix; pass 2 resolves duplicates bucket by bucket into an on-disk keep mask;
+        pass 3 filters the partitions with the mask.
+
+        Rows are compared by hash only (the rows themselves are not read back), so each row
+        is hashed twice with different keys into a 128-bit hash: two different rows are then
+        taken for duplicates with a probability of about n² / 2^129, far below the chance of
+        a disk error even for billions of rows.
+
+        :return: (deduplicated dataset, number of rows removed)
+        """
+        subset = list(subset) if subset else list(self.columns)
+        total_rows = len(self)
+        work_dir = tempfile.mkdtemp(prefix="ooc_dedup_", dir=self.directory)
+        try:
+            # Pass 1: hash rows into buckets
+            bucket_files = [open(os.path.join(work_dir, f"bucket-{b:03d}.bin"), "wb") for b in range(HASH_BUCKETS)]
+            pair_dtype = np.dtype([("hash", np.uint64), ("hash2", np.uint64), ("row", np.int64)])
+            offset = 0
+            try:
+                for chunk in self.iter_chunks(subset, progress, cancel_event, "Hashing rows"):
+                    pairs = np.empty(len(chunk), dtype=pair_dtype)
+                    pairs["hash"] = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                    pairs["hash2"] = pd.util.hash_pandas_object(chunk, index=False, hash_key=SECOND_HASH_KEY).to_numpy()
+                    pairs["row"] = np.arange(offset, offset + len(chunk))
+                    offset += len(chunk)
+                    buckets = (pairs["hash"] >> np.uint64(58)).astype(np.int64) % HASH_BUCKETS
+                    for bucket in np.unique(buckets):
+                        pairs[buckets == bucket].tofile(bucket_files[bucket])
+            finally:
+                for handle in bucket_files:
+                    handle.close()
+
+            # Pass 2: resolve duplicates per bucket into an on-disk keep mask
+            keep_mask = np.lib.format.open_memmap(
+                os.path.join(work_dir, "keep.npy"), mode="w+", dtype=np.bool_, shape=(max(total_rows, 1),)
+            )
+            keep_mask[:] = True
+            for bucket in range(HASH_BUCKETS):
+                pairs = np.fromfile(os.path.join(work_dir, f"bucket-{bucket:03d}.bin"), dtype=pair_dtype)
+                if len(pairs) < 2:
+                    continue
+                pairs = pairs[np.lexsort((pairs["row"], pairs["hash2"], pairs["hash"]))]
+                same_as_previous = np.zeros(len(pairs), dtype=bool)
+                same_as_previous[1:] = (pairs["hash"][1:] == pairs["hash"][:-1]) & (pairs["hash2"][1:] == pairs["hash2"][:-1])
+                same_as_next = np.zeros(len(pairs), dtype=bool)
+                same_as_next[:-1] = same_as_previous[1:]
+                if keep == 'first':
+                    drop = same_as_previous
+                elif keep == 'last':
+                    drop = same_as_next
+                else:  # keep=False drops every member of a duplicate group
+                    drop = same_as_previous | same_as_next
+                keep_mask[pairs["row"][drop]] = False
+            keep_mask.flush()
+
+            # Pass 3: filter partitions
+            result = self._derive()
+            offset = 0
+            for chunk in self.iter_chunks(None, progress, cancel_event, "Removing duplicates"):
+                result.append(chunk[keep_mask[offset:offset + len(chunk)]])
+                offset += len(chunk)
+            del keep_mask
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return result, total_rows - len(result)
+
+    # ------------------------------------------------------------------ summaries
+
+    def missing_counts(self, progress=None, cancel_event=None):
+        """Returns the number of missing values per column."""
+        counts = pd.Series(0, index=self.columns, dtype="int64")
+        for chunk in self.iter_chunks(progress=progress, cancel_event=cancel_event, label="Counting missing values"):
+            counts = counts.add(chunk.isnull().sum(), fill_value=0).astype("int64")
+        return counts
+
+    def column_sums(self, columns, progress=None, cancel_event=None):
+        """Returns (sum, non-null count) per column, for computing global means."""
+        sums = pd.Series(0.0, index=columns)
+        counts = pd.Series(0, index=columns, dtype="int64")
+        for chunk in self.iter_chunks(columns, progress, cancel_event, "Summing columns"):
+            sums += chunk.sum(numeric_only=True).reindex(columns, fill_value=0.0)
+            counts += chunk.count().reindex(columns, fill_value=0)
+        return sums, counts
+
+    def value_counts(self, column, progress=None, cancel_event=None):
+        """Returns exact value counts of one column, merged across partitions."""
+        counts = None
+        for chunk in self.iter_chunks([column], progress, cancel_event, f"Counting values of {column}"):
+            chunk_counts = chunk[column].value_counts()
+            counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+        if counts is None:
+            return pd.Series(dtype="int64")
+        return counts.astype("int64").sort_values(ascending=False)
+
+    def numeric_profile(self, columns, progress=None, cancel_event=None, text_columns=()):
+        """Returns per column whether every value is a whole number, whether any is missing, the min/max and its bytes.
+
+        text_columns are parsed as numbers stored as text; a column holding any value that
+        is not a number gets 'numeric' False (numeric columns are always True).
+        The result is indexed by column with 'numeric', 'whole', 'has_missing', 'min', 'max'
+        and 'bytes' columns.
+        """
+        columns = list(columns) + [column for column in text_columns if column not in columns]
+        text_columns = set(text_columns)
+        profile = {column: [True, True, False, None, None, 0] for column in columns}
+        for chunk in self.iter_chunks(columns, progress, cancel_event, "Inspecting numeric columns"):
+            memory = column_memory(chunk)
+            for column in columns:
+                merged = profile[column]
+                merged[5] += int(memory[column])
+                if not merged[0]:
+                    continue
+                if column in text_columns:
+                    parsed = parse_numeric_text(chunk[column])
+                    if parsed is None and chunk[column].notna().any():
+                        merged[0] = False  # Not every value is a number
+                        continue
+                    values = np.full(len(chunk), np.nan) if parsed is None else parsed.to_numpy()
+                else:
+                    values = chunk[column].to_numpy(dtype="float64", na_value=np.nan)
+                whole, has_missing, minimum, maximum = whole_number_summary(values)
+                merged[1] = merged[1] and (whole or minimum is None)
+                merged[2] = merged[2] or has_missing
+                if minimum is not None:
+                    merged[3] = minimum if merged[3] is None else min(merged[3], minimum)
+                    merged[4] = maximum if merged[4] is None else max(merged[4], maximum)
+        result = pd.DataFrame.from_dict(
+            profile, orient="index", columns=["numeric", "whole", "has_missing", "min", "max", "bytes"]
+        )
+        result.loc[result["min"].isna(), "whole"] = False  # Columns with no values at all stay float
+        result.loc[result["min"].isna() & result.index.isin(list(text_columns)), "numeric"] = False
+        return result
+
+    def revise_formats(self, progress=None, cancel_event=None):
+        """Out-of-core format revisioning: one pass to inspect columns, one pass to convert them.
+
+        Like dtype_utils.revise_formats, numeric columns and numbers stored as text get the
+        narrowest exact dtype, chosen from the global range so every partition agrees.
+
+        :return: (revised dataset, report in the revise_formats format with per-column bytes)
+        """
+        dtypes_before = self.dtypes()
+        text_columns = [column for column, dtype in dtypes_before.items() if not ptypes.is_numeric_dtype(dtype)]
+        profile = self.numeric_profile(self.numeric_columns(), progress, cancel_event, text_columns)
+        profile = profile[profile["numeric"]]
+
+        target_types = {}
+        for column, row in profile.iterrows():
+            integer_type = integer_dtype_for(row["min"], row["max"], row["has_missing"]) if row["whole"] else None
+            target_types[column] = integer_type or "float64"
+        if not target_types:
+            return self, pd.DataFrame(columns=["before_dtype", "after_dtype", "before_bytes", "after_bytes", "kind"])
+
+        after_bytes = pd.Series(0, index=list(target_types), dtype="int64")
+
+        def convert(chunk):
+            for column in target_types:
+                if column in text_columns:
+                    parsed = parse_numeric_text(chunk[column])
+                    chunk[column] = pd.Series(np.nan, index=chunk.index) if parsed is None else parsed
+            chunk = chunk.astype(target_types)
+            after_bytes[:] += column_memory(chunk[list(target_types)]).to_numpy()
+            return chunk
+
+        revised = self.map_chunks(convert, progress, cancel_event, "Converting columns")
+        report = pd.DataFrame({
+            "before_dtype": dtypes_before[list(target_types)].astype(str),
+            "after_dtype": revised.dtypes()[list(target_types)].astype(str),
+            "before_bytes": profile["bytes"],
+            "after_bytes": after_bytes,
+            "kind": pd.Series({
+                column: "float" if dtype == "float64" else "int" for column, dtype in target_types.items()
+            }, dtype=object),
+        })
+        return revised, report
+
+    def groupby_agg(self, grouping_columns, aggregation_selections, workers=AGGREGATION_WORKERS,
+                    progress=None, cancel_event=None):
+        """Group-by aggregation from mergeable per-partition partial states.
+
+        Supports sum, count, min, max, mean, std and (sketch-based) median; see
+        streaming_groupby. Partitions are reduced across `workers` processes.
+        """
+        columns = list(grouping_columns) + list(aggregation_selections)
+        return streaming_groupby(
+            self.partitions, grouping_columns, aggregation_selections, workers,
+            progress=progress, cancel_event=cancel_event, dtypes=self._dtypes[columns].to_dict()
+        )
+
+    def describe(self, progress=None, cancel_event=None):
+        """Descriptive statistics for numeric columns from streaming moments.
+
+        Count, mean, std, min, max, skewness and kurtosis are exact; the quartiles come
+        from per-column quantile sketches and are approximate (see column_statistics).
+        """
+        return ColumnStatistics().table(
+            self, self.numeric_columns(),
+            lambda columns: self.iter_chunks(columns, progress, cancel_event, "Computing statistics")
+        )
+
+    # ------------------------------------------------------------------ output
+
+    def save(self, save_path, columns=None, progress=None, cancel_event=None):
+        """Writes the dataset atomically to save_path (format from its extension) one partition at a time.
+
+        Parquet and Feather need one schema for every partition. The widened dtypes fix it
+        for every column but text ones, whose Arrow type (e.g. string, or null where a
+        partition holds no values) is found by reading only those columns first.
+        """
+        wanted = list(self.columns) if columns is None else list(columns)
+
+        def schema_chunks():
+            yield self.head(0)[wanted]
+            text_columns = [column for column in wanted if ptypes.is_object_dtype(self._dtypes[column])]
+            if text_columns:
+                yield from self.iter_chunks(text_columns, cancel_event=cancel_event)
+
+        return write_dataset(
+            self.iter_chunks(columns), save_path, len(self), progress, cancel_event, schema_chunks
+        )
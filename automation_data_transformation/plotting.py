@@ -0,0 +1,136 @@
+"""
+Scalable Plotting
+-----------------
+Chart helpers whose drawing cost does not grow with the number of rows.
+
+* Bar charts are drawn from a group-by summary (mean, count and std per category), so
+  error bars are analytic rather than bootstrapped over every row.
+* Scatter plots draw every point only up to POINT_BUDGET points. Larger series whose x
+  values are sorted (time-series-like) are downsampled with Largest-Triangle-Three-Buckets,
+  which keeps the visual shape; anything else is binned into a 2D density grid, which is
+  accumulated chunk by chunk and works for out-of-core datasets as well.
+"""
+
+# Standard Libraries
+import os
+
+# Third-party Libraries
+import numpy as np
+from matplotlib.colors import LogNorm
+
+
+POINT_BUDGET = int(os.environ.get("DATA_TOOLKIT_POINT_BUDGET", 50_000))  # Most points drawn individually
+GRID_BINS = 200  # Bins per axis of the density grid
+MAX_BARS = 50  # Bar charts show at most this many categories (the most frequent ones)
+ERROR_BARS = {"95% Confidence Interval": "ci", "Standard Deviation": "sd", "None": None}
+_Z_95 = 1.959964  # Normal approximation of the 95% interval of a mean
+
+
+def draw_bars(ax, summary, x, y, error="ci"):
+    """Draws mean bars from a summary with columns x, y_mean, y_count and y_std.
+
+    :param error: "ci" (95% confidence interval of the mean), "sd" (standard deviation) or None
+    :return: note for the chart title when categories were left out, else ""
+    """
+    note = ""
+    if len(summary) > MAX_BARS:
+        note = f"{MAX_BARS} most frequent of {len(summary):,} categories"
+        summary = summary.nlargest(MAX_BARS, f"{y}_count").sort_values(x)
+
+    means = summary[f"{y}_mean"].to_numpy(dtype="float64")
+    spread = summary[f"{y}_std"].to_numpy(dtype="float64")
+    if error == "ci":
+        spread = _Z_95 * spread / np.sqrt(summary[f"{y}_count"].to_numpy(dtype="float64"))
+    positions = np.arange(len(summary))
+    ax.bar(positions, means, yerr=None if error is None else np.nan_to_num(spread), capsize=3)
+    labels = [str(value) for value in summary[x]]
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, rotation=45 if len(labels) > 8 else 0, ha="right" if len(labels) > 8 else "center")
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+    return note
+
+
+def lttb_downsample(x, y, points=POINT_BUDGET):
+    """Indexes of `points` rows chosen by Largest-Triangle-Three-Buckets (x must be sorted).
+
+    The first and last rows are always kept; every bucket in between keeps the row forming
+    the largest triangle with the averages of its neighbouring buckets, which lets every
+    bucket be decided at once instead of one after another.
+    """
+    rows = len(x)
+    if rows <= points or points < 3:
+        return np.arange(rows)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    bucket = np.empty(rows, dtype=np.int64)
+    bucket[0], bucket[-1] = 0, points - 1
+    bucket[1:-1] = 1 + (np.arange(rows - 2) * (points - 2)) // (rows - 2)
+    counts = np.bincount(bucket, minlength=points)
+    average_x = np.bincount(bucket, weights=x, minlength=points) / counts
+    average_y = np.bincount(bucket, weights=y, minlength=points) / counts
+
+    previous, following = bucket - 1, bucket + 1
+    previous[0], following[-1] = 0, points - 1
+    area = np.abs(
+        (average_x[previous] - average_x[following]) * (y - average_y[previous])
+        - (average_x[previous] - x) * (average_y[following] - average_y[previous])
+    )
+    area = np.nan_to_num(area, nan=-1.0)
+    order = np.lexsort((-area, bucket))  # Largest area first within each bucket
+    _, first = np.unique(bucket[order], return_index=True)
+    return np.sort(order[first])
+
+
+def density_extent(chunks, x, y):
+    """(x_min, x_max, y_min, y_max) of two numeric columns over a stream of chunks."""
+    extent = [np.inf, -np.inf, np.inf, -np.inf]
+    for chunk in chunks:
+        for offset, column in ((0, x), (2, y)):
+            values = chunk[column].to_numpy(dtype="float64", na_value=np.nan)
+            if len(values) and not np.isnan(values).all():
+                extent[offset] = min(extent[offset], np.nanmin(values))
+                extent[offset + 1] = max(extent[offset + 1], np.nanmax(values))
+    return extent
+
+
+def density_grid(chunks, x, y, extent, bins=GRID_BINS):
+    """Counts of (x, y) pairs on a bins x bins grid, accumulated chunk by chunk.
+
+    :return: (counts, x_edges, y_edges)
+    """
+    x_min, x_max, y_min, y_max = extent
+    if x_min == x_max:
+        x_min, x_max = x_min - 0.5, x_max + 0.5
+    if y_min == y_max:
+        y_min, y_max = y_min - 0.5, y_max + 0.5
+    counts = np.zeros((bins, bins))
+    x_edges = np.linspace(x_min, x_max, bins + 1)
+    y_edges = np.linspace(y_min, y_max, bins + 1)
+    for chunk in chunks:
+        x_values = chunk[x].to_numpy(dtype="float64", na_value=np.nan)
+        y_values = chunk[y].to_numpy(dtype="float64", na_value=np.nan)
+        present = ~(np.isnan(x_values) | np.isnan(y_values))
+        histogram, _, _ = np.histogram2d(x_values[present], y_values[present], bins=[x_edges, y_edges])
+        counts += histogram
+    return counts, x_edges, y_edges
+
+
+def histogram_counts(values, max_bins=GRID_BINS):
+    """Counts and bin edges of a numeric column ('auto' bin widths, at most max_bins bins)."""
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    edges = np.histogram_bin_edges(values, bins="auto")
+    if len(edges) > max_bins + 1:
+        edges = max_bins
+    return np.histogram(values, bins=edges)
+
+
+def draw_density(ax, counts, x_edges, y_edges, x, y):
+    """Draws a density grid with a logarithmic color scale (empty cells stay blank)."""
+    grid = np.ma.masked_equal(counts.T, 0)
+    mesh = ax.pcolormesh(x_edges, y_edges, grid, norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)), cmap="viridis")
+    ax.figure.colorbar(mesh, ax=ax, label="Rows per cell")
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
@@ -0,0 +1,326 @@
+"""
+Row Filters
+-----------
+Filters typed into the dataset preview, e.g.
+
+    make == 'bmw'
+    price > 30000 and `num-of-doors` in ['two', 'four']
+    not (10000 <= price < 20000) or fuel == 'diesel'
+
+Column names are written in backticks (plain names also work when they are valid Python
+identifiers); text values are quoted. A filter is parsed with ``ast`` into comparisons of
+one column against constants, combined with and / or / not. A comparison never matches a
+missing value, and neither does its negation: `not (...)` only matches rows where every
+column read inside the parentheses has a value.
+
+In memory, every comparison is answered from a per-column index that is built the first
+time the column is filtered and reused until the column changes:
+
+* numeric and date columns get a sorted index (row order sorted by value), so a range or
+  equality predicate is two binary searches plus marking the matching slice of rows;
+* other columns get an inverted index (rows grouped by value code), so equality and `in`
+  mark the rows of the requested values without comparing every cell.
+
+Each comparison yields a boolean row mask (a bitmap), and masks are combined with & | ~.
+Out-of-core datasets are filtered with one chunked scan instead.
+"""
+
+# Standard Libraries
+import ast
+import re
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from expressions import ExpressionError
+
+
+_COMPARE = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!=",
+            ast.In: "in", ast.NotIn: "not in"}
+_FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "==", "!=": "!="}
+_RANGE_OPERATORS = ("<", "<=", ">", ">=")
+_BACKTICK = re.compile(r"`([^`]+)`")
+
+
+class CompiledFilter:
+    """A validated filter: a tree of column comparisons combined with and / or / not."""
+
+    def __init__(self, text, columns):
+        self.text = text
+        self._columns = set(columns)
+        self._placeholders = {}  # Placeholder identifier -> column name
+        self.columns = []  # Columns the filter reads, in order of appearance
+
+        def quote(match):
+            placeholder = f"_c{len(self._placeholders)}"
+            self._placeholders[placeholder] = match.group(1)
+            return placeholder
+
+        substituted = _BACKTICK.sub(quote, text.strip())
+        try:
+            tree = ast.parse(substituted, mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid filter: {e.msg}") from None
+        self.tree = self._translate(tree.body)
+
+    def _translate(self, node):
+        if isinstance(node, ast.BoolOp):
+            return ("and" if isinstance(node.op, ast.And) else "or", [self._translate(value) for value in node.values])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ("not", self._translate(node.operand))
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            # Chained comparisons (10000 <= price < 20000) become one comparison per pair
+            operands = [node.left] + node.comparators
+            parts = [
+                self._comparison(left, _COMPARE[type(op)], right)
+                for left, op, right in zip(operands, node.ops, operands[1:])
+            ]
+            return parts[0] if len(parts) == 1 else ("and", parts)
+        raise ExpressionError(f"'{ast.unparse(node)}' is not a comparison. Use e.g. price > 30000 or make == 'bmw'.")
+
+    def _comparison(self, left, op, right):
+        if self._is_column(left):
+            column, value = self._column(left), self._constant(right, many=op in ("in", "not in"))
+        elif self._is_column(right) and op not in ("in", "not in"):
+            column, value, op = self._column(right), self._constant(left), _FLIPPED[op]
+        else:
+            raise ExpressionError(f"Each comparison needs exactly one column: '{ast.unparse(left)} {op} {ast.unparse(right)}'.")
+        if column not in self.columns:
+            self.columns.append(column)
+        return ("compare", column, op, value)
+
+    def _is_column(self, node):
+        return isinstance(node, ast.Name)
+
+    def _column(self, node):
+        column = self._placeholders.get(node.id, node.id)
+        if column not in self._columns:
+            raise ExpressionError(f"Unknown column '{column}'. Quote text values, e.g. make == 'bmw'.")
+        return column
+
+    def _constant(self, node, many=False):
+        if many:
+            if not isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+                raise ExpressionError("'in' needs a list of values, e.g. make in ['bmw', 'audi'].")
+            return [self._constant(element) for element in node.elts]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = self._constant(node.operand)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return -value
+        if isinstance(node, ast.Constant) and isinstance(node.value, (str, bool, int, float)):
+            return node.value
+        if isinstance(node, ast.Name):
+            raise ExpressionError(f"'{node.id}' is not a column. Quote text values, e.g. '{node.id}'.")
+        raise ExpressionError(f"'{ast.unparse(node)}' is not a constant value.")
+
+    def evaluate(self, compare, present):
+        """Boolean mask of matching rows.
+
+        :param compare: compare(column, op, value) answers one comparison
+        :param present: present(column) is the mask of the rows where a column has a value
+        """
+        def visit(node):
+            if node[0] == "compare":
+                return compare(*node[1:])
+            if node[0] == "not":
+                mask = ~visit(node[1])
+                for column in _columns_of(node[1]):
+                    mask &= present(column)
+                return mask
+            masks = [visit(child) for child in node[1]]
+            combined = masks[0].copy()
+            for mask in masks[1:]:
+                if node[0] == "and":
+                    combined &= mask
+                else:
+                    combined |= mask
+            return combined
+        return visit(self.tree)
+
+
+def _columns_of(node):
+    """Columns read by a filter subtree."""
+    if node[0] == "compare":
+        return {node[1]}
+    if node[0] == "not":
+        return _columns_of(node[1])
+    return set().union(*(_columns_of(child) for child in node[1]))
+
+
+def compile_filter(text, columns):
+    """Parses and validates a filter against the columns it may use."""
+    if not text or not text.strip():
+        raise ExpressionError("The filter is empty.")
+    return CompiledFilter(text, columns)
+
+
+def _is_ordered(series):
+    return (ptypes.is_numeric_dtype(series) and not ptypes.is_bool_dtype(series)) or ptypes.is_datetime64_any_dtype(series)
+
+
+def _coerce(series, value):
+    """Converts a filter constant to the type of an ordered (numeric or date) column."""
+    if ptypes.is_datetime64_any_dtype(series):
+        try:
+            return pd.Timestamp(value).to_datetime64().astype("datetime64[ns]").view("int64")
+        except (TypeError, ValueError):
+            raise ExpressionError(f"'{value}' is not a date.") from None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ExpressionError(f"'{value}' is not a number.") from None
+
+
+def _ordered_values(series):
+    """Values of an ordered column as a NumPy array, and the mask of missing cells."""
+    missing = series.isna().to_numpy()
+    if ptypes.is_datetime64_any_dtype(series):
+        values = series.dt.tz_localize(None) if getattr(series.dt, "tz", None) is not None else series
+        return values.to_numpy(dtype="datetime64[ns]").view("int64"), missing
+    return series.to_numpy(dtype="float64", na_value=np.nan), missing
+
+
+class SortedIndex:
+    """Row positions of a numeric or date column sorted by value (missing cells left out)."""
+
+    def __init__(self, series):
+        self.empty = series.iloc[:0]  # Keeps the dtype for converting filter constants
+        self.rows = len(series)
+        values, missing = _ordered_values(series)
+        present = np.flatnonzero(~missing)
+        self.order = present[np.argsort(values[present], kind="stable")]
+        self.sorted_values = values[self.order]
+        self.present = ~missing
+
+    def _bounds(self, value):
+        return (np.searchsorted(self.sorted_values, value, side="left"),
+                np.searchsorted(self.sorted_values, value, side="right"))
+
+    def mask(self, op, value):
+        mask = np.zeros(self.rows, dtype=bool)
+        if op in ("in", "not in"):
+            for item in value:
+                left, right = self._bounds(_coerce(self.empty, item))
+                mask[self.order[left:right]] = True
+            if op == "not in":
+                mask = self.present & ~mask
+            return mask
+        left, right = self._bounds(_coerce(self.empty, value))
+        start, stop = {
+            "==": (left, right), "<": (0, left), "<=": (0, right), ">": (right, len(self.order)),
+            ">=": (left, len(self.order)), "!=": (0, len(self.order)),
+        }[op]
+        mask[self.order[start:stop]] = True
+        if op == "!=":
+            mask[self.order[left:right]] = False
+        return mask
+
+
+class InvertedIndex:
+    """Row positions of a text, categorical or boolean column grouped by value."""
+
+    def __init__(self, series):
+        self.rows = len(series)
+        codes, uniques = pd.factorize(series)
+        self.codes = codes
+        self.values = pd.Index(uniques)
+        self.order = np.argsort(codes, kind="stable")
+        self.starts = np.searchsorted(codes[self.order], np.arange(len(uniques) + 1), side="left")
+        self.present = codes >= 0
+
+    def _rows_of(self, value):
+        code = self.values.get_indexer([value])[0] if value in self.values else -1
+        if code < 0:
+            return self.order[:0]
+        return self.order[self.starts[code]:self.starts[code + 1]]
+
+    def mask(self, op, value):
+        if op in _RANGE_OPERATORS:
+            raise ExpressionError("Range comparisons (<, <=, >, >=) need a numeric or date column.")
+        mask = np.zeros(self.rows, dtype=bool)
+        for item in (value if op in ("in", "not in") else [value]):
+            mask[self._rows_of(item)] = True
+        if op in ("!=", "not in"):
+            mask = ~mask & self.present
+        return mask
+
+
+class ColumnFilterIndex:
+    """Caches one SortedIndex or InvertedIndex per column of a DataFrame.
+
+    Indexes are built lazily the first time a column is filtered and reused until the column
+    is invalidated, so refining a filter only pays for the binary searches and mask combining.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._rows = None
+
+    def invalidate(self, columns=None):
+        """Drops cached indexes for the given columns, or for every column when columns is None."""
+        if columns is None:
+            self._indexes.clear()
+            self._rows = None
+        else:
+            for column in columns:
+                self._indexes.pop(column, None)
+
+    def column_index(self, data, column):
+        """Returns the cached index of one column, building it if needed."""
+        if self._rows != len(data):
+            self.invalidate()  # Row count changed; every cached index is stale
+            self._rows = len(data)
+        index = self._indexes.get(column)
+        if index is None:
+            series = data[column]
+            index = SortedIndex(series) if _is_ordered(series) else InvertedIndex(series)
+            self._indexes[column] = index
+        return index
+
+    def matching_rows(self, data, compiled):
+        """Positions of the rows of data that match a compiled filter."""
+        def compare(column, op, value):
+            return self.column_index(data, column).mask(op, value)
+
+        def present(column):
+            return self.column_index(data, column).present
+        return np.flatnonzero(compiled.evaluate(compare, present))
+
+
+def scan_mask(series, op, value):
+    """Answers one comparison by comparing every cell (used for out-of-core chunks)."""
+    present = series.notna().to_numpy()
+    if _is_ordered(series):
+        values, _ = _ordered_values(series)
+        if op in ("in", "not in"):
+            mask = np.isin(values, [_coerce(series, item) for item in value])
+            if op == "not in":
+                mask = ~mask
+        else:
+            mask = {
+                "==": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal,
+                ">": np.greater, ">=": np.greater_equal,
+            }[op](values, _coerce(series, value))
+    else:
+        if op in _RANGE_OPERATORS:
+            raise ExpressionError("Range comparisons (<, <=, >, >=) need a numeric or date column.")
+        mask = series.isin(value if op in ("in", "not in") else [value]).to_numpy()
+        if op in ("!=", "not in"):
+            mask = ~mask
+    return mask & present
+
+
+def scan_matching_rows(chunks, compiled):
+    """Positions of the matching rows over a stream of chunks, in dataset order."""
+    positions = []
+    offset = 0
+    for chunk in chunks:
+        mask = compiled.evaluate(
+            lambda column, op, value: scan_mask(chunk[column], op, value),
+            lambda column: chunk[column].notna().to_numpy()
+        )
+        positions.append(np.flatnonzero(mask) + offset)
+        offset += len(chunk)
+    return np.concatenate(positions) if positions else np.array([], dtype=np.int64)
@@ -0,0 +1,237 @@
+"""
+Streaming Group-By
+------------------
+Group-by aggregation over data that arrives in chunks (the partitions of an out-of-core
+dataset). Each chunk is reduced to a mergeable partial state per group, the partial
+states are merged, and the final metrics are computed once at the end:
+
+* count, sum, min and max merge directly;
+* mean and std come from Welford-style moments (count, mean and the sum of squared
+  deviations M2), merged with the parallel variance formula;
+* median comes from a KLL-style quantile sketch per group: values are kept with a weight,
+  and whenever one group holds more than SKETCH_CAPACITY values of the same weight they
+  are sorted and every other one is kept at double the weight. Groups that never exceed
+  the capacity keep every value and get exact medians; larger groups get a median within
+  about 1/SKETCH_CAPACITY of the true rank.
+
+Partial states of separate partitions are independent, so they can be computed across a
+process pool and combined as they finish.
+"""
+
+# Standard Libraries
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+from dtype_utils import conform_dtypes
+from cancellation import OperationCancelled
+from file_cache import read_frame
+
+
+MERGEABLE_METRICS = ['mean', 'sum', 'count', 'max', 'min', 'median', 'std']
+SKETCH_CAPACITY = 256  # Values kept per group and sketch level
+AGGREGATION_WORKERS = int(os.environ.get("DATA_TOOLKIT_AGGREGATION_WORKERS", min(4, os.cpu_count() or 1)))
+PARALLEL_MIN_PARTITIONS = 8  # Below this, starting worker processes costs more than it saves
+_VALUE = "__value__"
+_WEIGHT = "__weight__"
+
+
+# ---------------------------------------------------------------------- moments
+
+def partial_moments(chunk, grouping_columns, value_columns):
+    """Per-group count, sum, min, max, mean and M2 of one chunk."""
+    grouped = chunk.groupby(grouping_columns, observed=True, sort=False)[value_columns]
+    partial = grouped.agg(['count', 'sum', 'min', 'max', 'var'])
+    for column in value_columns:
+        count = partial[(column, "count")]
+        partial[(column, "m2")] = partial[(column, "var")].fillna(0.0) * (count - 1).clip(lower=0)
+        partial[(column, "mean")] = partial[(column, "sum")] / count.where(count > 0)
+    return partial.drop(columns=[(column, "var") for column in value_columns])
+
+
+def merge_moments(partials):
+    """Merges partial moment rows that share the same group key."""
+    levels = list(range(partials.index.nlevels))
+
+    def by_key(series, how):
+        return getattr(series.groupby(level=levels, observed=True, sort=False), how)()
+
+    merged = {}
+    for column in dict.fromkeys(column for column, _ in partials.columns):
+        count = partials[(column, "count")]
+        total_count = by_key(count, "sum")
+        total_sum = by_key(partials[(column, "sum")], "sum")
+        total_mean = total_sum / total_count.where(total_count > 0)
+        # M2 = sum(M2_i + n_i * (mean_i - mean)^2), the numerically stable parallel form
+        spread = count * (partials[(column, "mean")] - total_mean.reindex(partials.index).to_numpy()) ** 2
+        merged[(column, "count")] = total_count
+        merged[(column, "sum")] = total_sum
+        merged[(column, "min")] = by_key(partials[(column, "min")], "min")
+        merged[(column, "max")] = by_key(partials[(column, "max")], "max")
+        merged[(column, "mean")] = total_mean
+        merged[(column, "m2")] = by_key(partials[(column, "m2")] + spread.fillna(0.0), "sum")
+    return pd.DataFrame(merged)
+
+
+# ---------------------------------------------------------------------- median sketch
+
+def partial_sketch(chunk, grouping_columns, column, capacity=SKETCH_CAPACITY, seed=0):
+    """Quantile sketch of one value column per group: rows of (group keys, value, weight)."""
+    sketch = chunk[grouping_columns].copy()
+    sketch[_VALUE] = chunk[column].astype("float64")
+    sketch = sketch.dropna()  # Missing values and missing group keys are skipped, as in pandas
+    sketch[_WEIGHT] = np.int64(1)
+    return compact_sketch(sketch, grouping_columns, capacity, seed)
+
+
+def compact_sketch(sketch, grouping_columns, capacity=SKETCH_CAPACITY, seed=0):
+    """Halves every (group, weight) level holding more than `capacity` values.
+
+    A level is sorted and every other value is kept at twice the weight, starting from a
+    random offset; an odd value out stays at its weight, so group weights are preserved.
+    """
+    random_state = np.random.default_rng(seed)
+    level = list(grouping_columns) + [_WEIGHT]
+    while len(sketch):
+        sizes = sketch.groupby(level, observed=True, sort=False)[_VALUE].transform("size").to_numpy()
+        over = sizes > capacity
+        if not over.any():
+            break
+        full = sketch[over].sort_values(level + [_VALUE], kind="stable")
+        size = full.groupby(level, observed=True, sort=False)[_VALUE].transform("size").to_numpy()
+        rank = full.groupby(level, observed=True, sort=False).cumcount().to_numpy()
+        odd_out = (size % 2 == 1) & (rank == size - 1)
+        kept = (rank % 2 == random_state.integers(2)) & ~odd_out
+        promoted = full[kept].copy()
+        promoted[_WEIGHT] *= 2
+        sketch = pd.concat([sketch[~over], full[odd_out], promoted], ignore_index=True)
+    return sketch
+
+
+def sketch_median(sketch, grouping_columns):
+    """Weighted median per group; exact when no value was compacted away."""
+    ordered = sketch.sort_values(list(grouping_columns) + [_VALUE], kind="stable")
+    grouped = ordered.groupby(grouping_columns, observed=True, sort=False)[_WEIGHT]
+    cumulative = grouped.cumsum().to_numpy()
+    half = grouped.transform("sum").to_numpy() / 2
+
+    def first_value(mask):
+        return ordered[mask].groupby(grouping_columns, observed=True)[_VALUE].first()
+
+    # The midpoint of the values either side of half the weight (the mean of the two middle values)
+    return (first_value(cumulative >= half) + first_value(cumulative > half)) / 2
+
+
+# ---------------------------------------------------------------------- partial states
+
+def partial_state(chunk, grouping_columns, aggregation_selections, capacity=SKETCH_CAPACITY, seed=0):
+    """The mergeable state of one chunk: (moments, {column: median sketch})."""
+    value_columns = list(aggregation_selections)
+    moments = partial_moments(chunk, grouping_columns, value_columns)
+    sketches = {
+        column: partial_sketch(chunk, grouping_columns, column, capacity, seed)
+        for column, metrics in aggregation_selections.items() if 'median' in metrics
+    }
+    return moments, sketches
+
+
+def merge_states(first, second, grouping_columns, capacity=SKETCH_CAPACITY, seed=0):
+    """Combines two partial states into one."""
+    if first is None:
+        return second
+    moments = merge_moments(pd.concat([first[0], second[0]]))
+    sketches = {
+        column: compact_sketch(
+            pd.concat([sketch, second[1][column]], ignore_index=True), grouping_columns, capacity, seed
+        )
+        for column, sketch in first[1].items()
+    }
+    return moments, sketches
+
+
+def finalize(state, grouping_columns, aggregation_selections):
+    """Flattened `column_metric` output with the group keys as leading columns."""
+    if state is None:
+        return pd.DataFrame(columns=list(grouping_columns) + [
+            f"{column}_{metric}" for column, metrics in aggregation_selections.items() for metric in metrics
+        ])
+    moments, sketches = state
+    moments = moments.sort_index()
+
+    output = {}
+    for column, metrics in aggregation_selections.items():
+        count = moments[(column, "count")]
+        total = moments[(column, "sum")]
+        for metric in metrics:
+            if metric == 'mean':
+                values = total / count.where(count > 0)
+            elif metric == 'std':
+                values = np.sqrt(moments[(column, "m2")] / (count - 1).where(count > 1))
+            elif metric == 'median':
+                values = sketch_median(sketches[column], grouping_columns).reindex(moments.index)
+            else:
+                values = moments[(column, metric)]
+            output[f"{column}_{metric}"] = values
+    return pd.DataFrame(output, index=moments.index).reset_index()
+
+
+def _partition_state(path, grouping_columns, aggregation_selections, capacity, seed, dtypes=None):
+    """Worker entry point: reads one partition file, casts it to dtypes and reduces it to its partial state."""
+    chunk = conform_dtypes(read_frame(path)[list(grouping_columns) + list(aggregation_selections)], dtypes or {})
+    return partial_state(chunk, grouping_columns, aggregation_selections, capacity, seed)
+
+
+def streaming_groupby(partition_paths, grouping_columns, aggregation_selections, workers=1,
+                      capacity=SKETCH_CAPACITY, progress=None, cancel_event=None, dtypes=None):
+    """Group-by aggregation over partition files, one partition in memory per worker.
+
+    :param workers: processes that compute partial states in parallel (1 runs in this process;
+        fewer than PARALLEL_MIN_PARTITIONS partitions always run in this process)
+    :param dtypes: optional column -> dtype mapping every partition is cast to (the widened
+        schema of a dataset whose partitions were inferred separately)
+    :return: DataFrame with the group keys and one `column_metric` column per metric
+    """
+    unsupported = {metric for metrics in aggregation_selections.values() for metric in metrics} - set(MERGEABLE_METRICS)
+    if unsupported:
+        raise ValueError(
+            f"Metrics {sorted(unsupported)} cannot be computed out-of-core. "
+            f"Supported metrics: {', '.join(MERGEABLE_METRICS)}."
+        )
+
+    grouping_columns = list(grouping_columns)
+    total = len(partition_paths)
+    state = None
+
+    def report(done):
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelled("Operation canceled by the user.")
+        if progress is not None:
+            progress(done / total if total else 1.0, f"Aggregating: partition {done:,} of {total:,}")
+
+    if workers <= 1 or total < PARALLEL_MIN_PARTITIONS:
+        for number, path in enumerate(partition_paths, start=1):
+            partial = _partition_state(path, grouping_columns, aggregation_selections, capacity, number, dtypes)
+            state = merge_states(state, partial, grouping_columns, capacity, number)
+            report(number)
+        return finalize(state, grouping_columns, aggregation_selections)
+
+    # Spawned workers import only this module and its GUI-free dependencies (cancellation,
+    # dtype_utils, file_cache), never tkinter or the Tk application state of the parent
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, total), mp_context=context) as executor:
+        futures = [
+            executor.submit(_partition_state, path, grouping_columns, aggregation_selections, capacity, number, dtypes)
+            for number, path in enumerate(partition_paths, start=1)
+        ]
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                state = merge_states(state, future.result(), grouping_columns, capacity, done)
+                report(done)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    return finalize(state, grouping_columns, aggregation_selections)
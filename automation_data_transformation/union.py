@@ -0,0 +1,168 @@
+"""
+Streaming Union
+---------------
+Appends any number of CSV/XLSX files row-wise into one dataset, chunk by chunk.
+
+The schema is reconciled once up front from a small sample of every file: columns are
+aligned by name (in order of first appearance), and each column gets one target dtype that
+can hold the values of every file, widened to float when some files lack the column
+(nullable and categorical columns of the loaded data follow pandas' promotion rules). Each
+chunk is then reindexed to that schema and written straight into the output, either
+preallocated column buffers (in memory) or a partitioned ChunkedDataset (out-of-core), so
+no pairwise pd.concat copies are ever made.
+"""
+
+# Standard Libraries
+import os
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+from pandas.core.dtypes.cast import find_common_type
+
+from cancellation import OperationCancelled
+from ingest import DEFAULT_CHUNK_ROWS, _ColumnBuffers, count_data_rows
+from out_of_core import ChunkedDataset
+
+
+SCHEMA_SAMPLE_ROWS = 1000
+SOURCE_COLUMN = "source_file"
+
+
+def _read_sample(file_path, rows=SCHEMA_SAMPLE_ROWS):
+    if file_path.endswith('.csv'):
+        return pd.read_csv(file_path, nrows=rows)
+    if file_path.endswith('.xlsx'):
+        return pd.read_excel(file_path, nrows=rows)
+    raise ValueError(f"Unsupported file type: {os.path.basename(file_path)}")
+
+
+def count_rows(file_path):
+    """Data row count of a CSV file (newline scan) or XLSX sheet (from its dimension record)."""
+    if file_path.endswith('.csv'):
+        return count_data_rows(file_path)
+    try:
+        from openpyxl import load_workbook
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            return max((workbook.worksheets[0].max_row or 1) - 1, 0)
+        finally:
+            workbook.close()
+    except Exception:
+        return 0  # Unknown; the output buffers grow as needed
+
+
+def _reconcile(dtypes, present_everywhere):
+    """One dtype able to hold the values of every file's version of a column."""
+    if all(ptypes.is_bool_dtype(dtype) for dtype in dtypes) and present_everywhere:
+        return find_common_type(dtypes)
+    if all(ptypes.is_numeric_dtype(dtype) and not ptypes.is_bool_dtype(dtype) for dtype in dtypes):
+        target = find_common_type(dtypes)  # Handles nullable Int*/Float* as well as NumPy dtypes
+        if isinstance(target, np.dtype) and target.kind in "iu" and not present_everywhere:
+            target = np.dtype("float64")  # Files without the column contribute missing values
+        return target
+    if len(set(dtypes)) == 1 and (ptypes.is_datetime64_any_dtype(dtypes[0]) or isinstance(dtypes[0], pd.CategoricalDtype)):
+        return dtypes[0]
+    return np.dtype(object)
+
+
+class UnionSchema:
+    """Column order, target dtypes and size estimate for a union of files."""
+
+    def __init__(self, file_paths, base=None, source_column=None, sample_rows=SCHEMA_SAMPLE_ROWS):
+        # base may be a DataFrame or a ChunkedDataset; both provide head() and len()
+        samples = ([base.head(sample_rows)] if base is not None else []) + [
+            _read_sample(path, sample_rows) for path in file_paths
+        ]
+        self.columns = []
+        seen = {}
+        for sample in samples:
+            for column in sample.columns:
+                if column not in seen:
+                    seen[column] = []
+                    self.columns.append(column)
+                seen[column].append(sample[column].dtype)
+
+        self.dtypes = {
+            column: _reconcile(dtypes, len(dtypes) == len(samples)) for column, dtypes in seen.items()
+        }
+        self.source_column = source_column
+        if source_column is not None:
+            if source_column in seen:
+                raise ValueError(f"Column '{source_column}' already exists; choose another source column name.")
+            self.columns.append(source_column)
+
+        self.rows = (len(base) if base is not None else 0) + sum(count_rows(path) for path in file_paths)
+        sample_rows_read = sum(len(sample) for sample in samples)
+        sample_bytes = sum(sample.memory_usage(deep=True, index=False).sum() for sample in samples)
+        self.estimated_bytes = int(self.rows * sample_bytes / sample_rows_read) if sample_rows_read else 0
+
+    def align(self, chunk, source=None):
+        """Reindexes a chunk to the schema and casts it to the target dtypes."""
+        chunk = chunk.reindex(columns=[column for column in self.columns if column != self.source_column])
+        for position, column in enumerate(chunk.columns):
+            series = chunk.iloc[:, position]
+            target = self.dtypes[column]
+            if series.dtype != target:
+                try:
+                    converted = series.astype(target)
+                except (TypeError, ValueError):
+                    converted = series.astype(object)  # Values the sample did not show; the output widens
+                chunk.isetitem(position, converted)
+        if self.source_column is not None:
+            chunk[self.source_column] = source
+        return chunk
+
+
+def iter_file_chunks(file_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yields a file as DataFrame chunks; workbooks are parsed whole and then sliced."""
+    if file_path.endswith('.csv'):
+        with pd.read_csv(file_path, chunksize=chunk_rows) as reader:
+            yield from reader
+    else:
+        data = pd.read_excel(file_path)
+        for start in range(0, len(data), chunk_rows):
+            yield data.iloc[start:start + chunk_rows]
+
+
+def union_files(file_paths, schema, base=None, base_name="loaded", out_of_core=False,
+                chunk_rows=DEFAULT_CHUNK_ROWS, progress=None, cancel_event=None, on_appended=None):
+    """Streams base (a DataFrame or ChunkedDataset, optional) followed by every file into one dataset.
+
+    :param on_appended: optional callable receiving every aligned chunk read from the files
+        (not from base), e.g. to update running statistics without a second pass
+    :return: a DataFrame, or a ChunkedDataset when out_of_core is set
+    """
+    output = ChunkedDataset() if out_of_core else _ColumnBuffers(schema.rows)
+    sources = ([(base_name, base)] if base is not None else []) + [
+        (os.path.basename(path), path) for path in file_paths
+    ]
+    rows_written = 0
+
+    for position, (name, source) in enumerate(sources):
+        if isinstance(source, ChunkedDataset):
+            chunks = source.iter_chunks()
+        elif isinstance(source, pd.DataFrame):
+            chunks = (source.iloc[start:start + chunk_rows] for start in range(0, len(source), chunk_rows))
+        else:
+            chunks = iter_file_chunks(source, chunk_rows)
+
+        for chunk in chunks:
+            if cancel_event is not None and cancel_event.is_set():
+                raise OperationCancelled("Union canceled by the user.")
+            chunk = schema.align(chunk, name)
+            output.append(chunk)
+            if on_appended is not None and source is not base:
+                on_appended(chunk)
+            rows_written += len(chunk)
+            if progress is not None:
+                fraction = min(rows_written / schema.rows, 1.0) if schema.rows else None
+                progress(fraction, f"Appending {name} ({position + 1}/{len(sources)})   |   Rows: {rows_written:,}")
+
+    if out_of_core:
+        if not output.partitions:
+            output.append(pd.DataFrame(columns=schema.columns))
+        return output
+    frame = output.to_frame()
+    return frame if len(frame.columns) else pd.DataFrame(columns=schema.columns)
@@ -1,8 +1,15 @@
 import tkinter as tk
+import numpy as np
 from tkinter import Label, Toplevel, simpledialog
 from tkinter import ttk
 from tkinter import filedialog
 
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+from cancellation import OperationCancelled  # noqa: F401  (re-exported for the GUI modules)
+from jobs import job_scheduler
+
 def select_from_dropdown(title, message, options):
     """Helper to let the user select an option from a dropdown menu."""
     selected_value = None
@@ -76,18 +83,13 @@ def multi_select_from_dropdown( title, message, options):
     return dialog.selected_items
 
 
-def show_stats_table( stats):
-        """Displays combined descriptive statistics, skewness, and kurtosis in a table."""
-        # Create a new window
-        window = Toplevel()
-        window.title("Descriptive Statistics")
-
-        # Add a label for the window
-        Label(window, text="Descriptive Statistics", font=("Arial", 14, "bold")).pack(pady=10)
+def _add_stats_tree(window, stats, height):
+        """Adds a scrollable Treeview listing a statistics table (one row per statistic)."""
+        frame = ttk.Frame(window)
+        frame.pack(fill="both", expand=True)
 
         # Create a Treeview widget
-        tree = ttk.Treeview(window, columns=['Statistic'] + list(stats.columns), show="headings", height=15)
-        tree.pack(fill="both", expand=True)
+        tree = ttk.Treeview(frame, columns=['Statistic'] + list(stats.columns), show="headings", height=height)
 
         # Define headings for the Treeview
         tree.heading('Statistic', text='Statistic')
@@ -101,18 +103,339 @@ def show_stats_table( stats):
             tree.insert("", "end", values=[index] + list(row.values))
 
         # Add vertical and horizontal scrollbars
-        v_scrollbar = ttk.Scrollbar(window, orient="vertical", command=tree.yview)
-        h_scrollbar = ttk.Scrollbar(window, orient="horizontal", command=tree.xview)
+        v_scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        h_scrollbar = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
         tree.configure(yscroll=v_scrollbar.set, xscroll=h_scrollbar.set)
         v_scrollbar.pack(side="right", fill="y")
         h_scrollbar.pack(side="bottom", fill="x")
+        tree.pack(fill="both", expand=True)
+
+
+def show_stats_table( stats, categorical=None):
+        """Displays combined descriptive statistics, skewness, and kurtosis in a table.
+
+        categorical, when given, is a second table (distinct counts and top values of the
+        text columns) shown below the numeric one. The window is non-modal and returns at once,
+        so the operation that opened it finishes while the table stays open.
+        """
+        # Create a new window
+        window = Toplevel()
+        window.title("Descriptive Statistics")
+
+        # Add a label for the window
+        Label(window, text="Descriptive Statistics", font=("Arial", 14, "bold")).pack(pady=10)
+        _add_stats_tree(window, stats, 10)
+
+        if categorical is not None and not categorical.empty:
+            Label(window, text="Categorical Columns", font=("Arial", 14, "bold")).pack(pady=10)
+            _add_stats_tree(window, categorical, 9)
 
         # Allow the window to resize
-        window.geometry("800x400")
-        window.mainloop()
+        window.geometry("800x400" if categorical is None or categorical.empty else "900x700")
 
 #aggregation own save file
-def save_to_file_dialog( title, default_filename):
+def save_to_file_dialog( title, default_filename, filetypes=None):
     """Creates a save file dialog and returns the selected file path."""
-    return filedialog.asksaveasfilename(title=title, defaultextension=".csv", initialfile=default_filename)
+    return filedialog.asksaveasfilename(
+        title=title, defaultextension=".csv", initialfile=default_filename, filetypes=filetypes or [("CSV Files", "*.csv")]
+    )
+
+
+def run_with_progress(title, task, determinate=True, abandon_on_cancel=False):
+    """Runs task(report, cancel_event) as a background job and waits for it while Tk keeps running.
+
+    The job is listed in the Background Jobs window with its progress, elapsed time and a
+    Cancel button. The worker reports through report(fraction, status_text); fraction may be
+    None for indeterminate progress. Returns the task's result, or re-raises its exception.
+
+    Tasks that cannot poll cancel_event (e.g. a single read_excel call) can pass
+    abandon_on_cancel=True: Cancel then returns immediately by raising OperationCancelled
+    and the worker's eventual result is discarded. Such tasks must not touch the loaded
+    data, because they do not wait for the scheduler's data lock.
+    """
+    outcome = job_scheduler().run(title, task, determinate, abandon_on_cancel)
+    if "error" in outcome:
+        raise outcome["error"]
+    if "cancelled" in outcome:
+        raise OperationCancelled("Operation canceled by the user.")
+    return outcome.get("done")
+
+
+def show_paginated_table(title, message, total_rows, fetch_page, page_size=50, confirm_text=None):
+    """Shows rows page by page in a table; only the visible page is ever fetched.
+
+    fetch_page(start, stop) must return a DataFrame with the rows of that page. When
+    confirm_text is given, the window gets Proceed/Cancel buttons, waits for the user and
+    returns True if they chose to proceed.
+    """
+    top = tk.Toplevel()
+    top.title(title)
+    top.geometry("900x500")
+    confirmed = {"value": False}
+
+    tk.Label(top, text=message, font=("Arial", 11), justify="left", anchor="w").pack(fill="x", padx=10, pady=10)
+
+    frame = tk.Frame(top)
+    frame.pack(fill="both", expand=True, padx=10)
+    tree = ttk.Treeview(frame, show="headings", height=15)
+    v_scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    h_scrollbar = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
+    tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+    v_scrollbar.pack(side="right", fill="y")
+    h_scrollbar.pack(side="bottom", fill="x")
+    tree.pack(side="left", fill="both", expand=True)
+
+    page_count = max((total_rows + page_size - 1) // page_size, 1)
+    state = {"page": 0}
+
+    navigation = tk.Frame(top)
+    navigation.pack(pady=5)
+    page_label = tk.Label(navigation, width=30)
+
+    def show_page(page):
+        state["page"] = min(max(page, 0), page_count - 1)
+        start = state["page"] * page_size
+        rows = fetch_page(start, min(start + page_size, total_rows))
+        columns = [str(column) for column in rows.columns]
+        if tuple(tree["columns"]) != tuple(columns):
+            tree["columns"] = columns
+            for column in columns:
+                tree.heading(column, text=column)
+                tree.column(column, width=120, anchor="center")
+        tree.delete(*tree.get_children())
+        for values in rows.itertuples(index=False):
+            tree.insert("", "end", values=list(values))
+        page_label.config(text=f"Page {state['page'] + 1:,} of {page_count:,}  ({total_rows:,} rows)")
+
+    tk.Button(navigation, text="<< First", command=lambda: show_page(0)).pack(side="left", padx=2)
+    tk.Button(navigation, text="< Prev", command=lambda: show_page(state["page"] - 1)).pack(side="left", padx=2)
+    page_label.pack(side="left", padx=10)
+    tk.Button(navigation, text="Next >", command=lambda: show_page(state["page"] + 1)).pack(side="left", padx=2)
+    tk.Button(navigation, text="Last >>", command=lambda: show_page(page_count - 1)).pack(side="left", padx=2)
+
+    show_page(0)
+
+    if confirm_text is None:
+        return None
+
+    def choose(value):
+        confirmed["value"] = value
+        top.destroy()
+
+    buttons = tk.Frame(top)
+    buttons.pack(pady=10)
+    tk.Button(buttons, text=confirm_text, width=15, command=lambda: choose(True)).pack(side="left", padx=5)
+    tk.Button(buttons, text="Cancel", width=15, command=lambda: choose(False)).pack(side="left", padx=5)
+    top.protocol("WM_DELETE_WINDOW", lambda: choose(False))
+    top.wait_window()
+    return confirmed["value"]
+
+
+def show_virtual_table(title, columns, total_rows, fetch_rows, parent=None, buffer_rows=200, filter_rows=None):
+    """Shows a table of any length while only the visible rows exist as Treeview items.
+
+    fetch_rows(positions) must return a DataFrame with the rows at those (ascending) row
+    positions. It is called for the visible window plus buffer_rows on either side, so
+    scrolling within the buffer needs no fetch, and opening or scrolling the table costs the
+    same for any total_rows.
+
+    When filter_rows is given, the window gets a filter bar: filter_rows(text) returns the
+    positions of the matching rows (or None when nothing should be shown), and the table
+    then scrolls through those rows only.
+    """
+    top = tk.Toplevel(parent) if parent is not None else tk.Toplevel()
+    top.title(title)
+    top.geometry("850x500")
+    top.resizable(True, True)
+
+    columns = ["Row"] + [str(column) for column in columns]
+    row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+    # Page and jump-to-row controls
+    navigation = tk.Frame(top)
+    navigation.pack(side="bottom", pady=5)
+
+    if filter_rows is not None:
+        filter_bar = tk.Frame(top)
+        filter_bar.pack(side="top", fill="x", padx=5, pady=5)
+        tk.Label(filter_bar, text="Filter:").pack(side="left")
+        filter_entry = tk.Entry(filter_bar)
+        filter_entry.pack(side="left", fill="x", expand=True, padx=5)
+        filter_status = tk.Label(filter_bar, fg="#6C757D", width=28, anchor="w")
+
+    frame = tk.Frame(top)
+    frame.pack(fill="both", expand=True)
+    tree = ttk.Treeview(frame, columns=columns, show="headings", height=20)
+    for column in columns:
+        tree.heading(column, text=column)
+        tree.column(column, width=70 if column == "Row" else 100, anchor="center", stretch=False)
+
+    # The vertical scrollbar tracks the position in the whole table, not in the Treeview
+    v_scrollbar = ttk.Scrollbar(frame, orient="vertical")
+    v_scrollbar.pack(side="right", fill="y")
+    tree.pack(side="left", fill="both", expand=True)
+    h_scrollbar = ttk.Scrollbar(top, orient="horizontal", command=tree.xview)
+    h_scrollbar.pack(side="bottom", fill="x")
+    tree.configure(xscrollcommand=h_scrollbar.set)
+
+    # positions is None while every row is shown, else the positions of the filtered rows
+    state = {"first": 0, "visible": 20, "buffer_start": 0, "buffer": None, "positions": None, "rows": total_rows}
+    items = []
+    position_label = tk.Label(navigation, width=34)
+
+    def positions(start, stop):
+        if state["positions"] is None:
+            return np.arange(start, stop)
+        return state["positions"][start:stop]
+
+    def window(start, stop):
+        buffer = state["buffer"]
+        if buffer is None or start < state["buffer_start"] or stop > state["buffer_start"] + len(buffer):
+            state["buffer_start"] = max(start - buffer_rows, 0)
+            buffer = state["buffer"] = fetch_rows(positions(state["buffer_start"], min(stop + buffer_rows, state["rows"])))
+        offset = start - state["buffer_start"]
+        return buffer.iloc[offset:offset + stop - start]
+
+    def render(first):
+        visible = state["visible"]
+        total = state["rows"]
+        state["first"] = first = min(max(int(first), 0), max(total - visible, 0))
+        stop = min(first + visible, total)
+        rows = window(first, stop)
+        # Existing items are reused and only their values change; Row is the position in the whole table
+        for number, (position, values) in enumerate(zip(positions(first, stop), rows.itertuples(index=False))):
+            values = [f"{position + 1:,}"] + list(values)
+            if number < len(items):
+                tree.item(items[number], values=values)
+            else:
+                items.append(tree.insert("", "end", values=values))
+        for item in items[len(rows):]:
+            tree.delete(item)
+        del items[len(rows):]
+
+        if total:
+            v_scrollbar.set(first / total, (first + len(rows)) / total)
+            position_label.config(text=f"Rows {first + 1:,}-{first + len(rows):,} of {total:,}")
+        else:
+            v_scrollbar.set(0, 1)
+            position_label.config(text="No rows")
+
+    def scroll(action, amount, unit=None):
+        if action == "moveto":
+            render(float(amount) * state["rows"])
+        elif unit == "pages":
+            render(state["first"] + int(amount) * state["visible"])
+        else:
+            render(state["first"] + int(amount))
+
+    def mouse_wheel(event):
+        if event.num == 4 or event.delta > 0:
+            render(state["first"] - 3)
+        else:
+            render(state["first"] + 3)
+        return "break"
+
+    def resize(event):
+        # Fit the number of materialized rows to the height of the Treeview (minus its header)
+        visible = max((event.height - row_height - 4) // row_height, 1)
+        if visible != state["visible"]:
+            state["visible"] = visible
+            render(state["first"])
+
+    def jump(_event=None):
+        # Rows are numbered by their position in the whole table, also while filtered
+        try:
+            row = int(jump_entry.get().replace(",", "")) - 1
+        except ValueError:
+            return
+        if state["positions"] is not None:
+            row = int(np.searchsorted(state["positions"], row))
+        render(row)
+
+    def show_rows(matching):
+        state["positions"] = matching
+        state["rows"] = total_rows if matching is None else len(matching)
+        state["buffer"] = None
+        render(0)
+
+    def apply_filter(_event=None):
+        text = filter_entry.get().strip()
+        if not text:
+            clear_filter()
+            return
+        matching = filter_rows(text)
+        if matching is not None:
+            show_rows(np.asarray(matching, dtype=np.int64))
+            filter_status.config(text=f"{len(matching):,} of {total_rows:,} rows match")
+
+    def clear_filter():
+        filter_entry.delete(0, "end")
+        filter_status.config(text="")
+        show_rows(None)
+
+    v_scrollbar.configure(command=scroll)
+    for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+        tree.bind(sequence, mouse_wheel)
+    tree.bind("<Configure>", resize)
+    top.bind("<Prior>", lambda event: scroll("scroll", -1, "pages"))
+    top.bind("<Next>", lambda event: scroll("scroll", 1, "pages"))
+
+    tk.Button(navigation, text="<< First", command=lambda: render(0)).pack(side="left", padx=2)
+    tk.Button(navigation, text="< Page", command=lambda: scroll("scroll", -1, "pages")).pack(side="left", padx=2)
+    position_label.pack(side="left", padx=10)
+    tk.Button(navigation, text="Page >", command=lambda: scroll("scroll", 1, "pages")).pack(side="left", padx=2)
+    tk.Button(navigation, text="Last >>", command=lambda: render(state["rows"])).pack(side="left", padx=2)
+    tk.Label(navigation, text="Go to row:").pack(side="left", padx=(15, 2))
+    jump_entry = tk.Entry(navigation, width=12)
+    jump_entry.pack(side="left")
+    jump_entry.bind("<Return>", jump)
+    tk.Button(navigation, text="Go", command=jump).pack(side="left", padx=2)
+
+    if filter_rows is not None:
+        filter_entry.bind("<Return>", apply_filter)
+        tk.Button(filter_bar, text="Apply", command=apply_filter).pack(side="left", padx=2)
+        tk.Button(filter_bar, text="Clear", command=clear_filter).pack(side="left", padx=2)
+        filter_status.pack(side="left", padx=5)
+
+    render(0)
+    return top
+
+
+class PlotWindow:
+    """A chart window with an embedded Matplotlib canvas that is reused by every plot.
+
+    Each plot clears and redraws the same Figure instead of creating a pyplot figure, so
+    repeated plotting keeps constant memory and no second GUI event loop is started.
+    Closing the window only hides it; the next plot shows it again.
+    """
+
+    def __init__(self, figsize=(8, 6)):
+        self.figure = Figure(figsize=figsize)
+        self.window = None
+        self.canvas = None
+
+    def _ensure_window(self):
+        if self.window is not None and self.window.winfo_exists():
+            return
+        self.window = tk.Toplevel()
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
+        toolbar = NavigationToolbar2Tk(self.canvas, self.window, pack_toolbar=False)
+        toolbar.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+
+    def show(self, title, draw):
+        """Clears the figure and draws it with draw(ax) on the Tk thread.
 
+        draw may return a note, which is added below the title.
+        """
+        self._ensure_window()
+        self.figure.clear()
+        ax = self.figure.add_subplot()
+        note = draw(ax)
+        ax.set_title(title + (f"\n({note})" if note else ""))
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+        self.window.title(title)
+        self.window.deiconify()
+        self.window.lift()
@@ -0,0 +1,205 @@
+"""
+Virtual Columns
+---------------
+Derived columns kept as lazy definitions instead of stored data. A definition is either a
+row-wise computation (a formula or binary operation over input columns) or a scalar
+aggregate of an input column (sum / 2, mean, count) that is broadcast to every row.
+
+Values are only computed when a consumer (preview, save, statistics, aggregation,
+visualization or another derivation) asks for them, and are cached until one of the
+input columns changes. Scalar aggregates are cached as the single value and only broadcast
+to the rows a consumer asks for, so they cost no memory per row until they are
+materialized (e.g. for saving), and they always reflect the current data.
+"""
+
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+
+class VirtualColumn:
+    """One lazy column: compute(frame) returns a Series, or a scalar when scalar is True."""
+
+    def __init__(self, name, compute, inputs, scalar=False, description=""):
+        self.name = name
+        self.compute = compute
+        self.inputs = list(inputs)
+        self.scalar = scalar
+        self.description = description
+
+
+class VirtualColumnSet:
+    """Ordered lazy column definitions with a value cache invalidated by input changes."""
+
+    def __init__(self):
+        self._definitions = {}
+        self._cache = {}  # Name -> full Series of a row-wise column, or (row count, value) of a scalar one
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def __contains__(self, name):
+        return name in self._definitions
+
+    @property
+    def names(self):
+        return list(self._definitions)
+
+    def add(self, column):
+        self._definitions[column.name] = column
+        self._cache.pop(column.name, None)
+        self.invalidate([column.name])  # Anything built on an older definition of this name
+
+    def copy(self):
+        """Returns a set with the same definitions and cached values, unaffected by later changes to this one."""
+        copied = VirtualColumnSet()
+        copied._definitions = dict(self._definitions)
+        copied._cache = dict(self._cache)
+        return copied
+
+    def clear(self):
+        self._definitions.clear()
+        self._cache.clear()
+
+    def dependents(self, columns):
+        """Definitions that depend on any of `columns`, directly or through other virtual columns."""
+        changed = set(columns)
+        dependents = set()
+        grew = True
+        while grew:
+            grew = False
+            for name, column in self._definitions.items():
+                if name not in dependents and changed.intersection(column.inputs):
+                    dependents.add(name)
+                    changed.add(name)
+                    grew = True
+        return dependents
+
+    def invalidate(self, columns=None):
+        """Drops cached values that depend on `columns`, or every cached value when columns is None."""
+        if columns is None:
+            self._cache.clear()
+            return
+        for name in self.dependents(columns):
+            self._cache.pop(name, None)
+
+    def prune(self, stored_columns):
+        """Removes definitions whose inputs no longer exist or whose name is now a stored column.
+
+        :return: names of the removed definitions
+        """
+        stored = set(stored_columns)
+        removed = [name for name in self._definitions if name in stored]
+        for name in removed:
+            del self._definitions[name]
+        missing = True
+        while missing:
+            available = stored | set(self._definitions)
+            missing = [name for name, column in self._definitions.items() if not set(column.inputs) <= available]
+            for name in missing:
+                del self._definitions[name]
+            removed.extend(missing)
+        for name in removed:
+            self._cache.pop(name, None)
+        return removed
+
+    def partition_safe(self):
+        """Names of the row-wise columns that can be computed from any subset of the rows.
+
+        Scalar aggregates, and columns built on one, need every row at once.
+        """
+        scalars = {name for name, column in self._definitions.items() if column.scalar}
+        unsafe = scalars | self.dependents(scalars)
+        return [name for name in self._definitions if name not in unsafe]
+
+    def compute(self, data, columns):
+        """Returns data plus the given row-wise columns computed from data alone, bypassing the cache.
+
+        Used for one partition of an out-of-core dataset, whose rows the cache does not describe.
+        """
+        frame = data.copy(deep=False)
+
+        def add(name):
+            if name in frame:
+                return
+            column = self._definitions[name]
+            for item in column.inputs:
+                if item in self._definitions:
+                    add(item)
+            frame[name] = pd.Series(column.compute(frame), index=frame.index)
+
+        for name in columns:
+            add(name)
+        return frame
+
+    def scalar(self, data, name):
+        """Returns the (cached) value of one scalar virtual column over data."""
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != len(data):
+            column = self._definitions[name]
+            inputs = self.materialize(data, [item for item in column.inputs if item in self._definitions])
+            cached = (len(data), column.compute(inputs))
+            self._cache[name] = cached
+        return cached[1]
+
+    def values(self, data, name):
+        """Returns the values of one virtual column as a Series aligned to data.
+
+        Row-wise columns are cached; scalar columns are broadcast from their cached value on
+        every call, so their full column only exists while a consumer holds it.
+        """
+        if self._definitions[name].scalar:
+            return pd.Series(np.full(len(data), self.scalar(data, name)), index=data.index, name=name)
+        cached = self._cache.get(name)
+        if cached is None or len(cached) != len(data):
+            column = self._definitions[name]
+            inputs = self.materialize(data, [item for item in column.inputs if item in self._definitions])
+            cached = pd.Series(column.compute(inputs), index=data.index, name=name)
+            self._cache[name] = cached
+        return cached
+
+    def materialize(self, data, columns=None):
+        """Returns data plus the requested virtual columns (all of them when columns is None).
+
+        The result is a shallow copy, so stored columns are shared rather than copied.
+        """
+        wanted = self.names if columns is None else [name for name in columns if name in self._definitions]
+        if not wanted:
+            return data
+        frame = data.copy(deep=False)
+        for name in wanted:
+            frame[name] = self.values(data, name)
+        return frame
+
+    def window(self, data, positions):
+        """Returns the rows of data at positions plus every virtual column.
+
+        Row-wise columns that are not cached are computed on those rows only, cached ones are
+        taken from their full values, and scalar columns are broadcast to those rows only.
+        """
+        frame = data.iloc[positions].copy(deep=False)
+        for name in self.names:
+            self._window_values(data, name, positions, frame)
+        return frame
+
+    def _window_values(self, data, name, positions, frame):
+        if name in frame:
+            return
+        column = self._definitions[name]
+        if column.scalar:
+            frame[name] = pd.Series(np.full(len(frame), self.scalar(data, name)), index=frame.index)
+            return
+        cached = self._cache.get(name)
+        if cached is not None and len(cached) == len(data):
+            frame[name] = cached.iloc[positions]
+            return
+        for item in column.inputs:
+            if item in self._definitions:
+                self._window_values(data, item, positions, frame)
+        frame[name] = pd.Series(column.compute(frame), index=frame.index)
+
+    def describe(self):
+        return "\n".join(
+            f"{name}: {column.description or ('scalar' if column.scalar else 'row-wise')} (virtual)"
+            for name, column in self._definitions.items()
+        )
@@ -0,0 +1,6 @@
+# Standard Libraries
+import os
+import sys
+
+# The toolkit's modules import each other by their flat names
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "automation_data_transformation"))
@@ -0,0 +1,29 @@
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+from cleansing import CleansingPolicy, apply_policy, fill_missing, rule
+from dtype_utils import revise_formats
+from out_of_core import ChunkedDataset
+
+
+def _revised():
+    data = pd.DataFrame({"count": [1.0, 2.0, np.nan, 4.0], "code": [10.0, np.nan, 12.0, 14.0]})
+    revised, _ = revise_formats(data)
+    assert str(revised["count"].dtype) == "Int8"
+    return revised
+
+
+def test_policy_fills_revised_nullable_integers_with_fractional_mean_and_median():
+    policy = CleansingPolicy(column_rules={"code": rule("median")})
+    cleansed, missing = apply_policy(_revised(), policy)
+    assert str(cleansed["count"].dtype) == "Float64"
+    assert cleansed["count"].tolist() == [1.0, 2.0, 7 / 3, 4.0]
+    assert cleansed["code"].tolist() == [10, 12, 12, 14]  # A whole median keeps the integer dtype
+    assert missing.total == 0
+
+
+def test_out_of_core_fill_widens_revised_integer_partitions():
+    dataset = ChunkedDataset.from_frame(_revised(), partition_rows=2)
+    filled = dataset.map_chunks(lambda chunk: fill_missing(chunk, {"count": 7 / 3}))
+    assert filled.head()["count"].tolist() == [1.0, 2.0, 7 / 3, 4.0]
@@ -0,0 +1,39 @@
+# Third-party Libraries
+import pandas as pd
+import pytest
+
+from export import write_dataset
+from file_cache import PARQUET_AVAILABLE
+from out_of_core import ChunkedDataset
+
+
+def _read(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_feather(path)
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow is not installed")
+@pytest.mark.parametrize("extension", ["parquet", "feather"])
+def test_later_chunks_may_widen_the_schema(tmp_path, extension):
+    first = pd.DataFrame({"number": [1, 2], "text": [None, None]})
+    second = pd.DataFrame({"number": [1.5, 2.5], "text": ["a", "b"]})
+    path = str(tmp_path / f"out.{extension}")
+
+    write_dataset(iter([first, second]), path, schema_chunks=lambda: [first, second])
+
+    expected = pd.concat([first, second], ignore_index=True)
+    pd.testing.assert_frame_equal(_read(path), expected)
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow is not installed")
+@pytest.mark.parametrize("extension", ["parquet", "feather"])
+def test_out_of_core_partitions_with_different_dtypes(tmp_path, extension):
+    dataset = ChunkedDataset()
+    dataset.append(pd.DataFrame({"number": [1, 2], "text": [None, None]}))
+    dataset.append(pd.DataFrame({"number": [1.5, None], "text": ["a", "b"]}))
+    path = str(tmp_path / f"out.{extension}")
+
+    dataset.save(path)
+
+    result = _read(path)
+    assert result["number"].tolist()[:3] == [1.0, 2.0, 1.5]
+    assert result["text"].tolist() == [None, None, "a", "b"]
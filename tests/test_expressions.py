@@ -0,0 +1,19 @@
+# Third-party Libraries
+import pandas as pd
+import pytest
+
+from expressions import ExpressionError, compile_expression
+
+
+FRAME = pd.DataFrame({"price": [1.0, 0.0, 5.0], "horsepower": [1, 2, 3]})
+
+
+@pytest.mark.parametrize("formula", ["not price", "price and horsepower", "price if price else 0", "where(price, 1, 0)"])
+def test_boolean_logic_on_numbers_is_rejected_during_validation(formula):
+    with pytest.raises(ExpressionError, match="is not a condition"):
+        compile_expression(formula, ["price", "horsepower"])
+
+
+def test_boolean_logic_on_comparisons_evaluates():
+    expression = compile_expression("not (price > 0) or horsepower == 3 and price > 1", ["price", "horsepower"])
+    assert expression.evaluate(FRAME).tolist() == [False, True, True]
@@ -0,0 +1,44 @@
+# Standard Libraries
+import threading
+
+from jobs import DataLock
+
+
+def test_readers_share_the_lock_and_a_writer_waits_for_them():
+    lock = DataLock()
+    both_reading = threading.Barrier(2, timeout=5)
+    written = threading.Event()
+    order = []
+
+    def reader():
+        with lock.read():
+            both_reading.wait()  # Only returns when both readers hold the lock at once
+            order.append("read")
+
+    def writer():
+        with lock.write():
+            order.append("write")
+        written.set()
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    with lock.read():
+        for thread in readers:
+            thread.start()
+        writing = threading.Thread(target=writer)
+        writing.start()
+        for thread in readers:
+            thread.join(5)
+        assert not written.wait(0.2)  # Still held for reading here
+    assert written.wait(5)
+    writing.join(5)
+    assert order == ["read", "read", "write"]
+
+
+def test_the_writing_thread_may_write_and_read_again():
+    lock = DataLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+    with lock.write():  # Fully released above
+        pass
@@ -0,0 +1,27 @@
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+from joins import JoinEstimate, partitioned_merge
+
+
+def _sorted(data):
+    return data.sort_values(list(data.columns)).reset_index(drop=True)
+
+
+def test_partitioned_merge_matches_pd_merge_with_mixed_key_dtypes():
+    left = pd.DataFrame({"key": np.arange(100, dtype="int64"), "left_value": np.arange(100)})
+    right = pd.DataFrame({"key": np.arange(100, dtype="float64"), "right_value": np.arange(100) * 2})
+    for how in ("inner", "left", "right", "outer"):
+        expected = pd.merge(left, right, how=how, on=["key"])
+        result = pd.concat(partitioned_merge(left, right, ["key"], how, partitions=8).iter_chunks())
+        assert len(result) == len(expected)
+        pd.testing.assert_frame_equal(_sorted(result), _sorted(expected), check_dtype=False)
+
+
+def test_join_estimate_counts_matches_across_key_dtypes():
+    left = pd.DataFrame({"key": pd.array([1, 2, 3, 3], dtype="int8"), "a": range(4)})
+    right = pd.DataFrame({"key": [1.0, 3.0, 4.0], "b": range(3)})
+    estimate = JoinEstimate(left, right, ["key"], "inner")
+    assert estimate.output_rows == len(pd.merge(left, right, how="inner", on=["key"])) == 3
+    assert estimate.relationship == "many_to_one"
@@ -0,0 +1,33 @@
+# Third-party Libraries
+import pandas as pd
+
+from out_of_core import ChunkedDataset
+
+
+def _mixed_key_dataset():
+    dataset = ChunkedDataset()
+    dataset.append(pd.DataFrame({"key": [1, 2], "value": [1.0, 2.0]}))
+    dataset.append(pd.DataFrame({"key": ["1", "x"], "value": [3.0, 4.0]}))
+    return dataset
+
+
+def test_partitions_widened_to_object_compare_equal_keys_as_equal():
+    dataset = _mixed_key_dataset()
+    assert dataset.value_counts("key").to_dict() == {"1": 2, "2": 1, "x": 1}
+    deduplicated, removed = dataset.drop_duplicates(["key"])
+    assert removed == 1
+    assert deduplicated.head()["key"].tolist() == ["1", "2", "x"]
+
+
+def test_groupby_casts_partitions_to_the_widened_schema():
+    result = _mixed_key_dataset().groupby_agg(["key"], {"value": ["sum"]}, workers=1)
+    assert result.set_index("key")["value_sum"].to_dict() == {"1": 4.0, "2": 2.0, "x": 4.0}
+
+
+def test_revise_formats_parses_numbers_stored_as_text_and_reports_bytes():
+    data = pd.DataFrame({"count": [1.0, 2.0, None, 4.0], "code": ["1", "2", None, "300"], "name": ["a", "1", "2", "3"]})
+    revised, report = ChunkedDataset.from_frame(data, partition_rows=2).revise_formats()
+    assert revised.dtypes().astype(str).to_dict() == {"count": "Int8", "code": "Int16", "name": "object"}
+    assert revised.head()["code"].tolist() == [1, 2, pd.NA, 300]
+    assert list(report.index) == ["count", "code"]
+    assert (report["after_bytes"] < report["before_bytes"]).all()
@@ -0,0 +1,19 @@
+# Third-party Libraries
+import numpy as np
+import pandas as pd
+
+from virtual_columns import VirtualColumn, VirtualColumnSet
+
+
+def test_preview_window_broadcasts_scalar_columns_without_caching_a_full_column():
+    data = pd.DataFrame({"price": np.arange(10.0)})
+    columns = VirtualColumnSet()
+    columns.add(VirtualColumn("mean", lambda frame: frame["price"].mean(), ["price"], scalar=True))
+    columns.add(VirtualColumn("above", lambda frame: frame["price"] - frame["mean"], ["price", "mean"]))
+
+    window = columns.window(data, [2, 3])
+    assert window["mean"].tolist() == [4.5, 4.5]
+    assert window["above"].tolist() == [-2.5, -1.5]
+    assert all(not isinstance(cached, pd.Series) for cached in columns._cache.values())
+
+    assert columns.materialize(data)["mean"].tolist() == [4.5] * 10